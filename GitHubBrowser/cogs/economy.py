@@ -1,16 +1,104 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import asyncio
+import time
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+DAILY_COOLDOWN_SECONDS = 86400  # 24 hours
+
+# Ledger entries folded into economy.balance per compaction batch
+LEDGER_COMPACTION_BATCH = 10000
+
+def balance_sql(user_param):
+    """SQL expression for a user's live balance: compacted snapshot plus ledger tail"""
+    return f"""(
+        COALESCE((SELECT balance FROM economy WHERE guild_id = $1 AND user_id = {user_param}), 0)
+        + COALESCE((SELECT SUM(delta) FROM economy_ledger WHERE guild_id = $1 AND user_id = {user_param}), 0)
+    )"""
+
+# Reads snapshot and tail in one statement so a concurrent compaction is seen all-or-nothing
+BALANCE_SQL = f"""
+    SELECT EXISTS (SELECT 1 FROM economy WHERE guild_id = $1 AND user_id = $2)
+           OR EXISTS (SELECT 1 FROM economy_ledger WHERE guild_id = $1 AND user_id = $2) AS known,
+           {balance_sql('$2')} AS balance
+"""
+
+# Conditional debit/credit as ledger entries; the caller holds the sender's advisory lock.
+# $3 may be NULL to burn coins (purchases, fees).
+TRANSFER_SQL = f"""
+    WITH available AS (
+        SELECT {balance_sql('$2')} AS balance
+    ),
+    entries AS (
+        INSERT INTO economy_ledger (guild_id, user_id, delta, reason)
+        SELECT $1, entry.user_id, entry.delta, $5
+        FROM available, (VALUES ($2::BIGINT, -$4::BIGINT), ($3::BIGINT, $4::BIGINT)) AS entry(user_id, delta)
+        WHERE available.balance >= $4 AND entry.user_id IS NOT NULL
+        RETURNING user_id
+    )
+    SELECT EXISTS (SELECT 1 FROM entries) AS ok,
+           available.balance - $4 AS sender_balance,
+           {balance_sql('$3')} + $4 AS recipient_balance
+    FROM available
+"""
+
+# Fold the oldest ledger entries into economy.balance snapshots in one atomic statement
+COMPACT_LEDGER_SQL = """
+    WITH moved AS (
+        DELETE FROM economy_ledger
+        WHERE id IN (SELECT id FROM economy_ledger ORDER BY id LIMIT $1)
+        RETURNING guild_id, user_id, delta
+    )
+    INSERT INTO economy (guild_id, user_id, balance)
+    SELECT guild_id, user_id, SUM(delta) FROM moved GROUP BY guild_id, user_id
+    ON CONFLICT (guild_id, user_id)
+    DO UPDATE SET balance = economy.balance + EXCLUDED.balance
+"""
+
+# Game rewards are held in memory this long and then settled in one batch
+REWARD_SETTLE_DELAY = 0.25
+
+# A failed settlement is retried after this long
+REWARD_RETRY_DELAY = 5
+
+# Live balances for a batch of (guild_id, user_id) pairs
+BATCH_BALANCES_SQL = """
+    SELECT pair.guild_id, pair.user_id,
+           COALESCE((SELECT balance FROM economy e
+                     WHERE e.guild_id = pair.guild_id AND e.user_id = pair.user_id), 0)
+           + COALESCE((SELECT SUM(delta) FROM economy_ledger l
+                       WHERE l.guild_id = pair.guild_id AND l.user_id = pair.user_id), 0) AS balance
+    FROM unnest($1::BIGINT[], $2::BIGINT[]) AS pair(guild_id, user_id)
+"""
+
 class Economy(commands.Cog):
     """Core economy functionality"""
     
     def __init__(self, bot):
         self.bot = bot
+        # Rewards waiting for the next settlement: {(guild_id, user_id): amount}
+        self.pending_rewards = {}
+        # Rewards currently being written, summed over every settlement in flight
+        self.settling_rewards = {}
+        # Future resolved with {(guild_id, user_id): balance} when the pending batch settles
+        self.settlement = None
+        self.settle_task = None
+        # Cleared on unload so a failed final settlement does not keep rescheduling itself
+        self.retry_settlements = True
+        self.compact_ledger.start()
+    
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.compact_ledger.cancel()
+        self.retry_settlements = False
+        # Settle any rewards still held in memory
+        if self.settle_task and not self.settle_task.done():
+            await self.settle_task
+        if self.pending_rewards:
+            await self.settle_rewards(delay=0)
     
     async def create_economy_tables(self):
         """Create economy tables in database"""
@@ -29,35 +117,197 @@ class Economy(commands.Cog):
                         UNIQUE(guild_id, user_id)
                     )
                 """)
+                
+                # Append-only balance changes, folded into economy.balance by compact_ledger
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS economy_ledger (
+                        id BIGSERIAL PRIMARY KEY,
+                        guild_id BIGINT NOT NULL,
+                        user_id BIGINT NOT NULL,
+                        delta BIGINT NOT NULL,
+                        reason VARCHAR(50),
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                """)
+                
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_economy_ledger_user
+                    ON economy_ledger (guild_id, user_id)
+                """)
         except Exception as e:
             logger.error(f"Database error in economy: {e}")
     
     @commands.hybrid_command(name="balance")
     async def is_economy_enabled(self, guild_id):
         """Check if economy is enabled for this guild"""
-        if not self.bot.db_pool:
-            return True  # Default enabled if no database
+        # Served from the guild settings cache; economy defaults to enabled
+        return self.bot.guild_settings.get_value(guild_id, 'economy_enabled', True)
+    
+    async def get_balance(self, guild_id, user_id, conn=None):
+        """Get a user's live balance (snapshot + ledger tail), or None if they have no record"""
+        if conn is None:
+            async with self.bot.db_pool.acquire() as conn:
+                return await self.get_balance(guild_id, user_id, conn=conn)
+        
+        row = await conn.fetchrow(BALANCE_SQL, guild_id, user_id)
+        # Include rewards that have not been settled yet so callers read their own writes
+        key = (guild_id, user_id)
+        unsettled = self.pending_rewards.get(key, 0) + self.settling_rewards.get(key, 0)
+        if not row['known'] and not unsettled:
+            return None
+        return row['balance'] + unsettled
+    
+    async def update_user_balance(self, user_id, amount, guild=None):
+        """Credit a game reward through the batched settlement service
+        
+        Rewards are held in memory and written for every user at once every
+        REWARD_SETTLE_DELAY seconds. Returns the user's balance after the
+        reward settles, or None if it was not credited: either there is no
+        database, or the settlement failed and the reward is queued for a retry.
+        """
+        if guild is None or not self.bot.db_pool:
+            return None
+        
+        key = (guild.id, user_id)
+        self.pending_rewards[key] = self.pending_rewards.get(key, 0) + amount
+        settlement = self.schedule_settlement()
         
+        # Shielded so a cancelled command does not cancel the shared batch
+        balances = await asyncio.shield(settlement)
+        return balances.get(key)
+    
+    def schedule_settlement(self, delay=REWARD_SETTLE_DELAY):
+        """Future for the next settlement, starting one if none is scheduled"""
+        if self.settlement is None:
+            loop = asyncio.get_running_loop()
+            self.settlement = loop.create_future()
+            self.settle_task = loop.create_task(self.settle_rewards(delay))
+        return self.settlement
+    
+    def release_settling(self, rewards):
+        """Take a finished settlement's rewards out of settling_rewards"""
+        for key, amount in rewards.items():
+            remaining = self.settling_rewards.get(key, 0) - amount
+            if remaining:
+                self.settling_rewards[key] = remaining
+            else:
+                self.settling_rewards.pop(key, None)
+    
+    async def settle_rewards(self, delay=REWARD_SETTLE_DELAY):
+        """Write every pending reward in one COPY and resolve the waiting callers"""
+        await asyncio.sleep(delay)
+        pending, self.pending_rewards = self.pending_rewards, {}
+        settlement, self.settlement = self.settlement, None
+        # Merged, not replaced: an earlier settlement may still be writing
+        for key, amount in pending.items():
+            self.settling_rewards[key] = self.settling_rewards.get(key, 0) + amount
+        
+        balances = {}
+        requeued = False
         try:
+            if pending:
+                async with self.bot.db_pool.acquire() as conn:
+                    async with conn.transaction():
+                        await self.credit_many(
+                            [(guild_id, user_id, amount, 'reward') for (guild_id, user_id), amount in pending.items()],
+                            conn=conn
+                        )
+                        rows = await conn.fetch(
+                            BATCH_BALANCES_SQL,
+                            [guild_id for guild_id, _ in pending], [user_id for _, user_id in pending]
+                        )
+                balances = {(row['guild_id'], row['user_id']): row['balance'] for row in rows}
+        except Exception as e:
+            logger.error(f"Failed to settle {len(pending)} rewards: {e}")
+            # Move the rewards back to pending in one step so balance reads never count them twice
+            self.release_settling(pending)
+            requeued = True
+            for key, amount in pending.items():
+                self.pending_rewards[key] = self.pending_rewards.get(key, 0) + amount
+            if self.retry_settlements:
+                self.schedule_settlement(REWARD_RETRY_DELAY)
+        finally:
+            if not requeued:
+                self.release_settling(pending)
+            if settlement is not None and not settlement.done():
+                settlement.set_result(balances)
+    
+    async def credit(self, guild_id, user_id, amount, reason="reward", conn=None):
+        """Append a balance change to the ledger - a plain insert with no row locks"""
+        if conn is None:
             async with self.bot.db_pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT economy_enabled FROM guild_settings 
-                    WHERE guild_id = $1
-                """, guild_id)
-                
-                if not row:
-                    # Auto-enable economy for new guilds
-                    await conn.execute("""
-                        INSERT INTO guild_settings (guild_id, economy_enabled)
-                        VALUES ($1, TRUE)
-                        ON CONFLICT (guild_id) DO UPDATE SET
-                            economy_enabled = TRUE
-                    """, guild_id)
-                    return True
-                
-                return row["economy_enabled"] if row["economy_enabled"] is not None else True
-        except Exception:
-            return True  # Default enabled on error
+                return await self.credit(guild_id, user_id, amount, reason, conn=conn)
+        
+        await conn.execute(
+            "INSERT INTO economy_ledger (guild_id, user_id, delta, reason) VALUES ($1, $2, $3, $4)",
+            guild_id, user_id, amount, reason
+        )
+    
+    async def credit_many(self, entries, conn=None):
+        """Append many (guild_id, user_id, delta, reason) ledger entries in one COPY"""
+        if not entries:
+            return
+        if conn is None:
+            async with self.bot.db_pool.acquire() as conn:
+                return await self.credit_many(entries, conn=conn)
+        
+        await conn.copy_records_to_table(
+            'economy_ledger', records=entries, columns=['guild_id', 'user_id', 'delta', 'reason']
+        )
+    
+    async def transfer(self, guild_id, sender_id, recipient_id, amount, reason="transfer", conn=None):
+        """Atomically move coins between two users
+        
+        Pass sender_id=None to award coins (rewards, prizes) or recipient_id=None
+        to charge them (purchases, fees). Returns (sender_balance, recipient_balance),
+        or None if the sender cannot cover the amount.
+        """
+        if amount <= 0:
+            raise ValueError("Transfer amount must be positive")
+        
+        if conn is None:
+            async with self.bot.db_pool.acquire() as conn:
+                return await self.transfer(guild_id, sender_id, recipient_id, amount, reason, conn=conn)
+        
+        if sender_id is None:
+            await self.credit(guild_id, recipient_id, amount, reason, conn=conn)
+            return None, await self.get_balance(guild_id, recipient_id, conn=conn)
+        
+        async with conn.transaction():
+            # Serialize debits per sender; the balance check below runs in a fresh
+            # snapshot taken after the lock is held
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtextextended($1::TEXT || ':' || $2::TEXT, 0))",
+                guild_id, sender_id
+            )
+            row = await conn.fetchrow(TRANSFER_SQL, guild_id, sender_id, recipient_id, amount, reason)
+        
+        if not row['ok']:
+            return None
+        return row['sender_balance'], row['recipient_balance'] if recipient_id is not None else None
+    
+    @tasks.loop(seconds=30)
+    async def compact_ledger(self):
+        """Fold ledger entries into economy.balance snapshots"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                # Keep folding while batches come back full
+                for _ in range(10):
+                    status = await conn.execute(COMPACT_LEDGER_SQL, LEDGER_COMPACTION_BATCH)
+                    if status == "INSERT 0 0":
+                        break
+                    remaining = await conn.fetchval("SELECT EXISTS (SELECT 1 FROM economy_ledger)")
+                    if not remaining:
+                        break
+        except Exception as e:
+            logger.error(f"Database error compacting economy ledger: {e}")
+    
+    @compact_ledger.before_loop
+    async def before_compact_ledger(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
     
     async def check_balance(self, ctx, member: discord.Member = None):
         """Check your or someone else's balance"""
@@ -80,15 +330,12 @@ class Economy(commands.Cog):
         
         try:
             async with self.bot.db_pool.acquire() as conn:
-                balance = await conn.fetchval(
-                    "SELECT balance FROM economy WHERE guild_id = $1 AND user_id = $2",
-                    ctx.guild.id, member.id
-                )
+                balance = await self.get_balance(ctx.guild.id, member.id, conn=conn)
                 
                 if balance is None:
                     balance = 1000  # Starting balance
                     await conn.execute(
-                        "INSERT INTO economy (guild_id, user_id, balance) VALUES ($1, $2, $3)",
+                        "INSERT INTO economy (guild_id, user_id, balance) VALUES ($1, $2, $3) ON CONFLICT DO NOTHING",
                         ctx.guild.id, member.id, balance
                     )
                 
@@ -120,31 +367,42 @@ class Economy(commands.Cog):
             await ctx.send("❌ Economy system unavailable!")
             return
         
+        # Rejected claims are answered from the cooldown service without touching the database
+        if not self.bot.cooldowns.acquire('daily', ctx.guild.id, ctx.author.id, DAILY_COOLDOWN_SECONDS):
+            remaining = self.bot.cooldowns.remaining('daily', ctx.guild.id, ctx.author.id)
+            await ctx.send(f"❌ You already claimed your daily reward! Next claim: <t:{int(time.time() + remaining)}:R>")
+            return
+        
         try:
             async with self.bot.db_pool.acquire() as conn:
-                # Check last daily claim
-                last_daily = await conn.fetchval(
-                    "SELECT last_daily FROM economy WHERE guild_id = $1 AND user_id = $2",
-                    ctx.guild.id, ctx.author.id
-                )
-                
                 now = datetime.utcnow()
-                if last_daily and (now - last_daily).total_seconds() < 86400:  # 24 hours
-                    next_daily = last_daily + timedelta(days=1)
-                    await ctx.send(f"❌ You already claimed your daily reward! Next claim: <t:{int(next_daily.timestamp())}:R>")
-                    return
                 
-                # Give daily reward
+                # Give daily reward: claim the day on the snapshot row, credit via the ledger
                 reward = 500
-                await conn.execute("""
-                    INSERT INTO economy (guild_id, user_id, balance, last_daily)
-                    VALUES ($1, $2, $3, $4)
-                    ON CONFLICT (guild_id, user_id)
-                    DO UPDATE SET 
-                        balance = economy.balance + $3,
-                        last_daily = $4
+                status = await conn.execute("""
+                    WITH claim AS (
+                        INSERT INTO economy (guild_id, user_id, balance, last_daily)
+                        VALUES ($1, $2, 0, $4)
+                        ON CONFLICT (guild_id, user_id)
+                        DO UPDATE SET last_daily = $4
+                        WHERE economy.last_daily IS NULL OR economy.last_daily <= $4 - INTERVAL '1 day'
+                        RETURNING 1
+                    )
+                    INSERT INTO economy_ledger (guild_id, user_id, delta, reason)
+                    SELECT $1, $2, $3, 'daily' FROM claim
                 """, ctx.guild.id, ctx.author.id, reward, now)
                 
+                if status == "INSERT 0 0":
+                    # Claimed before the cooldown was known here - sync it from last_daily
+                    last_daily = await conn.fetchval(
+                        "SELECT last_daily FROM economy WHERE guild_id = $1 AND user_id = $2",
+                        ctx.guild.id, ctx.author.id
+                    )
+                    next_daily = (last_daily - datetime(1970, 1, 1)).total_seconds() + DAILY_COOLDOWN_SECONDS
+                    self.bot.cooldowns.set_until('daily', ctx.guild.id, ctx.author.id, next_daily)
+                    await ctx.send(f"❌ You already claimed your daily reward! Next claim: <t:{int(next_daily)}:R>")
+                    return
+                
                 embed = discord.Embed(
                     title="🎁 Daily Reward",
                     description=f"You received **{reward:,}** coins!",
@@ -154,6 +412,7 @@ class Economy(commands.Cog):
                 
         except Exception as e:
             logger.error(f"Database error with daily reward: {e}")
+            self.bot.cooldowns.reset('daily', ctx.guild.id, ctx.author.id)
             await ctx.send("❌ Error claiming daily reward!")
     
     @commands.hybrid_command(name="pay")
@@ -182,40 +441,27 @@ class Economy(commands.Cog):
             return
         
         try:
-            async with self.bot.db_pool.acquire() as conn:
-                # Check sender balance
-                sender_balance = await conn.fetchval(
-                    "SELECT balance FROM economy WHERE guild_id = $1 AND user_id = $2",
-                    ctx.guild.id, ctx.author.id
-                )
-                
-                if not sender_balance or sender_balance < amount:
-                    await ctx.send("❌ Insufficient balance!")
-                    return
-                
-                # Transfer money
-                await conn.execute(
-                    "UPDATE economy SET balance = balance - $3 WHERE guild_id = $1 AND user_id = $2",
-                    ctx.guild.id, ctx.author.id, amount
-                )
-                
-                await conn.execute("""
-                    INSERT INTO economy (guild_id, user_id, balance)
-                    VALUES ($1, $2, $3)
-                    ON CONFLICT (guild_id, user_id)
-                    DO UPDATE SET balance = economy.balance + $3
-                """, ctx.guild.id, member.id, amount)
-                
-                embed = discord.Embed(
-                    title="💸 Payment Sent",
-                    description=f"You paid **{amount:,}** coins to {member.mention}",
-                    color=discord.Color.blue()
-                )
-                await ctx.send(embed=embed)
+            # Balance check, debit and credit happen in one atomic statement
+            result = await self.transfer(ctx.guild.id, ctx.author.id, member.id, amount, reason="pay")
+            
+            if result is None:
+                await ctx.send("❌ Insufficient balance!")
+                return
+            
+            sender_balance, _ = result
+            embed = discord.Embed(
+                title="💸 Payment Sent",
+                description=f"You paid **{amount:,}** coins to {member.mention}",
+                color=discord.Color.blue()
+            )
+            embed.set_footer(text=f"Your new balance: {sender_balance:,} coins")
+            await ctx.send(embed=embed)
                 
         except Exception as e:
             logger.error(f"Database error with payment: {e}")
             await ctx.send("❌ Error processing payment!")
 
 async def setup(bot):
-    await bot.add_cog(Economy(bot))
+    cog = Economy(bot)
+    await cog.create_economy_tables()
+    await bot.add_cog(cog)
@@ -1,25 +1,37 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import random
 import asyncio
 import logging
 import requests
 from datetime import datetime
+from game_sessions import GameSessionStore, HangmanGame, TicTacToeGame, TriviaSession
+from question_bank import QuestionBank
 
 logger = logging.getLogger(__name__)
 
+# Minimum time between paid game wins per user per guild; games stay playable meanwhile
+GAME_REWARD_COOLDOWN_SECONDS = 30
+
+# Tic-tac-toe games end after this long without a message from either player
+TICTACTOE_TIMEOUT_SECONDS = 300
+
+# Abandoned hangman games are dropped after this long without a guess
+HANGMAN_TIMEOUT_SECONDS = 1800
+
+# Most games of each kind kept in memory; the least recently played are evicted past this
+MAX_GAME_SESSIONS = 10000
+
+# In-progress hangman and tic-tac-toe games are snapshotted to the database this often
+GAME_SNAPSHOT_SECONDS = 15
+
 class Fun(commands.Cog):
     """Fun commands and games for entertainment"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.trivia_questions = [
-            {"question": "What is the capital of France?", "answer": "paris", "options": ["London", "Berlin", "Paris", "Madrid"]},
-            {"question": "What is 2 + 2?", "answer": "4", "options": ["3", "4", "5", "6"]},
-            {"question": "Which planet is known as the Red Planet?", "answer": "mars", "options": ["Venus", "Mars", "Jupiter", "Saturn"]},
-            {"question": "Who painted the Mona Lisa?", "answer": "leonardo da vinci", "options": ["Picasso", "Van Gogh", "Leonardo da Vinci", "Michelangelo"]},
-            {"question": "What is the largest mammal?", "answer": "blue whale", "options": ["Elephant", "Blue Whale", "Giraffe", "Hippo"]}
-        ]
+        # Trivia and quiz questions, indexed from disk on first use
+        self.question_bank = QuestionBank()
         
         self.jokes = [
             "Why don't scientists trust atoms? Because they make up everything!",
@@ -60,58 +72,122 @@ class Fun(commands.Cog):
         ]
         
         # Game state storage
-        self.hangman_games = {}
-        self.trivia_sessions = {}
+        self.hangman_games = GameSessionStore(
+            bot, 'hangman', HangmanGame, max_size=MAX_GAME_SESSIONS, ttl=HANGMAN_TIMEOUT_SECONDS, persist=True
+        )
+        self.trivia_sessions = GameSessionStore(bot, 'trivia', max_size=MAX_GAME_SESSIONS, ttl=60)
         self.connect4_games = {}
-        self.tictactoe_games = {}
+        self.tictactoe_games = GameSessionStore(
+            bot, 'tictactoe', TicTacToeGame, max_size=MAX_GAME_SESSIONS, ttl=TICTACTOE_TIMEOUT_SECONDS + 60, persist=True,
+            on_evict=lambda game_id, game: game.session and game.session.close()
+        )
+        self.snapshot_games.start()
+    
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.snapshot_games.cancel()
+        # A snapshot cancelled mid-write puts its sessions back as dirty; let it unwind first
+        task = self.snapshot_games.get_task()
+        if task and not task.done():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.hangman_games.flush()
+        await self.tictactoe_games.flush()
+    
+    async def load_game_sessions(self):
+        """Restore games that were in progress before a restart"""
+        await self.hangman_games.load()
+        await self.tictactoe_games.load()
+        for game_id, game in self.tictactoe_games.items():
+            game.session = self.open_tictactoe_session(game_id, game.channel_id, game.players)
+    
+    @tasks.loop(seconds=GAME_SNAPSHOT_SECONDS)
+    async def snapshot_games(self):
+        """Drop idle games and snapshot the rest to the database"""
+        for store in (self.hangman_games, self.trivia_sessions, self.tictactoe_games):
+            store.expire()
+        await self.hangman_games.flush()
+        await self.tictactoe_games.flush()
+    
+    @snapshot_games.before_loop
+    async def before_snapshot_games(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
+    
+    async def draw_question(self, ctx, category, difficulty=None, choices=False):
+        """Draw an unseen question for the channel, or explain why there is none"""
+        await self.question_bank.load()
+        category = category.lower()
+        if category != "random" and category not in self.question_bank.categories:
+            await ctx.send(f"❌ Available categories: {', '.join(self.question_bank.categories)}, random")
+            return None
+        if difficulty and difficulty.lower() not in self.question_bank.difficulties:
+            await ctx.send(f"❌ Available difficulties: {', '.join(self.question_bank.difficulties)}")
+            return None
+        
+        question = await self.question_bank.draw(
+            ctx.channel.id,
+            category=None if category == "random" else category,
+            difficulty=difficulty.lower() if difficulty else None,
+            choices=choices
+        )
+        if question is None:
+            await ctx.send("❌ No questions match that category and difficulty.")
+        return question
+    
+    def reward_ready(self, guild, user_id):
+        """Claim the per-guild game reward cooldown for a user"""
+        return guild is not None and self.bot.cooldowns.acquire('game_reward', guild.id, user_id, GAME_REWARD_COOLDOWN_SECONDS)
+    
+    async def pay_reward(self, guild, user_id, reward):
+        """Credit a game reward and return the text to show for it, or None if it cannot be paid"""
+        balance = await self.bot.cogs['Economy'].update_user_balance(user_id, reward, guild=guild)
+        if balance is not None:
+            return f"+${reward}"
+        # Without a database nothing is credited; otherwise the economy cog retries the settlement
+        return f"+${reward} (pending)" if self.bot.db_pool else None
     
     @commands.command(name='trivia')
     async def trivia(self, ctx):
         """Start a trivia question"""
-        question_data = random.choice(self.trivia_questions)
+        question = await self.draw_question(ctx, "random")
+        if question is None:
+            return
         
         embed = discord.Embed(
             title="🧠 Trivia Time!",
-            description=question_data["question"],
+            description=question.question,
             color=0x7289da
         )
         
-        options_text = ""
-        for i, option in enumerate(question_data["options"], 1):
-            options_text += f"{i}. {option}\n"
-        
-        embed.add_field(name="Options", value=options_text, inline=False)
-        embed.add_field(name="How to Answer", value="Type the number (1-4) or the answer directly!", inline=False)
+        if question.options:
+            options_text = ""
+            for i, option in enumerate(question.options, 1):
+                options_text += f"{i}. {option}\n"
+            
+            embed.add_field(name="Options", value=options_text, inline=False)
+            embed.add_field(name="How to Answer", value=f"Type the number (1-{len(question.options)}) or the answer directly!", inline=False)
+        else:
+            embed.add_field(name="How to Answer", value="Type your answer!", inline=False)
         
         msg = await ctx.send(embed=embed)
         
         # Store trivia session
-        self.trivia_sessions[ctx.channel.id] = {
-            "answer": question_data["answer"].lower(),
-            "options": question_data["options"],
-            "asker": ctx.author.id,
-            "message": msg
-        }
-        
-        def check(m):
-            return m.channel == ctx.channel and m.author != self.bot.user
+        session = TriviaSession(question.answer, question.options, ctx.author.id, msg.id)
+        self.trivia_sessions.put(ctx.channel.id, session)
+        correct_answer = question.answer
         
         try:
-            response = await self.bot.wait_for("message", timeout=30.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, timeout=30.0)
             
-            user_answer = response.content.lower().strip()
-            correct_answer = self.trivia_sessions[ctx.channel.id]["answer"]
-            options = self.trivia_sessions[ctx.channel.id]["options"]
+            user_answer = response.content.strip()
             
-            # Check if answer is correct (by number or text)
-            is_correct = False
-            if user_answer == correct_answer:
-                is_correct = True
-            elif user_answer.isdigit():
-                choice_num = int(user_answer)
-                if 1 <= choice_num <= len(options):
-                    if options[choice_num - 1].lower() == correct_answer:
-                        is_correct = True
+            # Check if answer is correct (by text, then by option number)
+            is_correct = question.matches(user_answer)
+            if not is_correct and user_answer.isdigit() and 1 <= int(user_answer) <= len(question.options):
+                is_correct = int(user_answer) == question.correct_option
             
             if is_correct:
                 embed = discord.Embed(
@@ -121,14 +197,15 @@ class Fun(commands.Cog):
                 )
                 
                 # Award points if economy cog is loaded
-                if 'Economy' in self.bot.cogs:
+                if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, response.author.id):
                     reward = random.randint(50, 150)
-                    await self.bot.cogs['Economy'].update_user_balance(response.author.id, reward)
-                    embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                    reward_text = await self.pay_reward(ctx.guild, response.author.id, reward)
+                    if reward_text:
+                        embed.add_field(name="Reward", value=reward_text, inline=True)
             else:
                 embed = discord.Embed(
                     title="❌ Wrong!",
-                    description=f"The correct answer was: **{correct_answer.title()}**",
+                    description=f"The correct answer was: **{correct_answer}**",
                     color=0xff0000
                 )
             
@@ -137,15 +214,15 @@ class Fun(commands.Cog):
         except asyncio.TimeoutError:
             embed = discord.Embed(
                 title="⏰ Time's Up!",
-                description=f"The correct answer was: **{correct_answer.title()}**",
+                description=f"The correct answer was: **{correct_answer}**",
                 color=0xffa500
             )
             await ctx.send(embed=embed)
         
         finally:
-            # Clean up
-            if ctx.channel.id in self.trivia_sessions:
-                del self.trivia_sessions[ctx.channel.id]
+            # Clean up (a newer question may have replaced this one)
+            if self.trivia_sessions.get(ctx.channel.id) is session:
+                self.trivia_sessions.pop(ctx.channel.id)
     
     @commands.command(name='8ball')
     async def eight_ball(self, ctx, *, question: str = None):
@@ -225,11 +302,8 @@ class Fun(commands.Cog):
         
         await ctx.send(embed=embed)
         
-        def check(m):
-            return m.channel == ctx.channel and m.author != self.bot.user
-        
         try:
-            response = await self.bot.wait_for("message", timeout=60.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, timeout=60.0)
             
             if response.content.lower().strip() == riddle_data["answer"].lower():
                 embed = discord.Embed(
@@ -239,10 +313,11 @@ class Fun(commands.Cog):
                 )
                 
                 # Award points if economy cog is loaded
-                if 'Economy' in self.bot.cogs:
+                if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, response.author.id):
                     reward = random.randint(100, 200)
-                    await self.bot.cogs['Economy'].update_user_balance(response.author.id, reward)
-                    embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                    reward_text = await self.pay_reward(ctx.guild, response.author.id, reward)
+                    if reward_text:
+                        embed.add_field(name="Reward", value=reward_text, inline=True)
             else:
                 embed = discord.Embed(
                     title="❌ Wrong!",
@@ -261,52 +336,24 @@ class Fun(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name='quiz')
-    async def quiz(self, ctx, category: str = "random"):
+    async def quiz(self, ctx, category: str = "random", difficulty: str = None):
         """Start a quick quiz"""
-        categories = {
-            "math": [
-                {"q": "What is 15 + 27?", "a": "42"},
-                {"q": "What is 8 * 7?", "a": "56"},
-                {"q": "What is 100 / 4?", "a": "25"}
-            ],
-            "science": [
-                {"q": "What is H2O?", "a": "water"},
-                {"q": "What gas do plants absorb?", "a": "carbon dioxide"},
-                {"q": "How many bones are in the human body?", "a": "206"}
-            ],
-            "history": [
-                {"q": "When did World War II end?", "a": "1945"},
-                {"q": "Who was the first president of the USA?", "a": "george washington"},
-                {"q": "In which year did the Titanic sink?", "a": "1912"}
-            ]
-        }
-        
-        if category == "random":
-            all_questions = []
-            for cat_questions in categories.values():
-                all_questions.extend(cat_questions)
-            question_data = random.choice(all_questions)
-        elif category in categories:
-            question_data = random.choice(categories[category])
-        else:
-            await ctx.send(f"Available categories: {', '.join(categories.keys())}, random")
+        question = await self.draw_question(ctx, category, difficulty)
+        if question is None:
             return
         
         embed = discord.Embed(
             title=f"📚 Quiz - {category.title()}",
-            description=question_data["q"],
+            description=question.question,
             color=0x7289da
         )
         
         await ctx.send(embed=embed)
         
-        def check(m):
-            return m.channel == ctx.channel and m.author != self.bot.user
-        
         try:
-            response = await self.bot.wait_for("message", timeout=30.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, timeout=30.0)
             
-            if response.content.lower().strip() == question_data["a"].lower():
+            if question.matches(response.content):
                 embed = discord.Embed(
                     title="🎉 Correct!",
                     description=f"{response.author.mention} got it right!",
@@ -314,14 +361,15 @@ class Fun(commands.Cog):
                 )
                 
                 # Award points
-                if 'Economy' in self.bot.cogs:
+                if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, response.author.id):
                     reward = random.randint(75, 125)
-                    await self.bot.cogs['Economy'].update_user_balance(response.author.id, reward)
-                    embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                    reward_text = await self.pay_reward(ctx.guild, response.author.id, reward)
+                    if reward_text:
+                        embed.add_field(name="Reward", value=reward_text, inline=True)
             else:
                 embed = discord.Embed(
                     title="❌ Wrong!",
-                    description=f"The answer was: **{question_data['a']}**",
+                    description=f"The answer was: **{question.answer}**",
                     color=0xff0000
                 )
             
@@ -330,7 +378,7 @@ class Fun(commands.Cog):
         except asyncio.TimeoutError:
             embed = discord.Embed(
                 title="⏰ Time's Up!",
-                description=f"The answer was: **{question_data['a']}**",
+                description=f"The answer was: **{question.answer}**",
                 color=0xffa500
             )
             await ctx.send(embed=embed)
@@ -359,10 +407,11 @@ class Fun(commands.Cog):
             result = "You win!"
             color = 0x00ff00
             # Award small prize
-            if 'Economy' in self.bot.cogs:
+            if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, ctx.author.id):
                 reward = random.randint(25, 75)
-                await self.bot.cogs['Economy'].update_user_balance(ctx.author.id, reward)
-                result += f" (+${reward})"
+                reward_text = await self.pay_reward(ctx.guild, ctx.author.id, reward)
+                if reward_text:
+                    result += f" ({reward_text})"
         else:
             result = "I win!"
             color = 0xff0000
@@ -470,17 +519,19 @@ class Fun(commands.Cog):
         if guess == target:
             result = "🎉 Exactly right!"
             color = 0x00ff00
-            if 'Economy' in self.bot.cogs:
+            if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, ctx.author.id):
                 reward = random.randint(100, 250)
-                await self.bot.cogs['Economy'].update_user_balance(ctx.author.id, reward)
-                result += f" (+${reward})"
+                reward_text = await self.pay_reward(ctx.guild, ctx.author.id, reward)
+                if reward_text:
+                    result += f" ({reward_text})"
         elif abs(guess - target) <= 5:
             result = "🔥 Very close!"
             color = 0xffa500
-            if 'Economy' in self.bot.cogs:
+            if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, ctx.author.id):
                 reward = random.randint(25, 50)
-                await self.bot.cogs['Economy'].update_user_balance(ctx.author.id, reward)
-                result += f" (+${reward})"
+                reward_text = await self.pay_reward(ctx.guild, ctx.author.id, reward)
+                if reward_text:
+                    result += f" ({reward_text})"
         elif abs(guess - target) <= 10:
             result = "😊 Pretty close!"
             color = 0xffff00
@@ -508,26 +559,21 @@ class Fun(commands.Cog):
         words = ["python", "discord", "computer", "hangman", "challenge", "programming", "keyboard", "monitor"]
         word = random.choice(words).upper()
         
-        self.hangman_games[ctx.channel.id] = {
-            "word": word,
-            "guessed": set(),
-            "wrong_guesses": 0,
-            "max_wrong": 6
-        }
+        self.hangman_games.put(ctx.channel.id, HangmanGame(word))
         
         await self.display_hangman(ctx)
     
     async def display_hangman(self, ctx):
         """Display hangman game state"""
-        if ctx.channel.id not in self.hangman_games:
+        game = self.hangman_games.get(ctx.channel.id)
+        if game is None:
             return
-        game = self.hangman_games[ctx.channel.id]
-        word = game["word"]
-        guessed = game["guessed"]
-        wrong_guesses = game["wrong_guesses"]
+        word = game.word
+        guessed = game.guessed
+        wrong_guesses = game.wrong_guesses
         
         # Create display word
-        display = " ".join([letter if letter in guessed else "_" for letter in word])
+        display = " ".join([letter if game.has_guessed(letter) else "_" for letter in word])
         
         # Hangman drawings
         hangman_stages = [
@@ -546,44 +592,44 @@ class Fun(commands.Cog):
             color=0x7289da
         )
         embed.add_field(name="Word", value=display, inline=False)
-        embed.add_field(name="Wrong Guesses", value=f"{wrong_guesses}/{game['max_wrong']}", inline=True)
+        embed.add_field(name="Wrong Guesses", value=f"{wrong_guesses}/{game.max_wrong}", inline=True)
         
         if guessed:
-            embed.add_field(name="Guessed Letters", value=" ".join(sorted(guessed)), inline=True)
+            embed.add_field(name="Guessed Letters", value=" ".join(guessed), inline=True)
         
         embed.add_field(name="How to Play", value="Type a letter to guess!", inline=False)
         
         # Check win/lose conditions
-        if all(letter in guessed for letter in word):
+        if game.solved:
             embed.color = 0x00ff00
             embed.add_field(name="🎉 You Win!", value=f"The word was: **{word}**", inline=False)
-            del self.hangman_games[ctx.channel.id]
+            self.hangman_games.pop(ctx.channel.id)
             
             # Award prize
-            if 'Economy' in self.bot.cogs:
+            if 'Economy' in self.bot.cogs and self.reward_ready(ctx.guild, ctx.author.id):
                 reward = len(word) * 50
-                await self.bot.cogs['Economy'].update_user_balance(ctx.author.id, reward)
-                embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                reward_text = await self.pay_reward(ctx.guild, ctx.author.id, reward)
+                if reward_text:
+                    embed.add_field(name="Reward", value=reward_text, inline=True)
                 
-        elif wrong_guesses >= game['max_wrong']:
+        elif wrong_guesses >= game.max_wrong:
             embed.color = 0xff0000
             embed.add_field(name="💀 Game Over!", value=f"The word was: **{word}**", inline=False)
-            del self.hangman_games[ctx.channel.id]
+            self.hangman_games.pop(ctx.channel.id)
         
         await ctx.send(embed=embed)
     
     async def display_hangman_message(self, channel, author):
         """Display hangman game state from message event"""
-        if channel.id not in self.hangman_games:
+        game = self.hangman_games.get(channel.id)
+        if game is None:
             return
-            
-        game = self.hangman_games[channel.id]
-        word = game["word"]
-        guessed = game["guessed"]
-        wrong_guesses = game["wrong_guesses"]
+        word = game.word
+        guessed = game.guessed
+        wrong_guesses = game.wrong_guesses
         
         # Create display word
-        display = " ".join([letter if letter in guessed else "_" for letter in word])
+        display = " ".join([letter if game.has_guessed(letter) else "_" for letter in word])
         
         # Hangman drawings
         hangman_stages = [
@@ -602,29 +648,30 @@ class Fun(commands.Cog):
             color=0x7289da
         )
         embed.add_field(name="Word", value=display, inline=False)
-        embed.add_field(name="Wrong Guesses", value=f"{wrong_guesses}/{game['max_wrong']}", inline=True)
+        embed.add_field(name="Wrong Guesses", value=f"{wrong_guesses}/{game.max_wrong}", inline=True)
         
         if guessed:
-            embed.add_field(name="Guessed Letters", value=" ".join(sorted(guessed)), inline=True)
+            embed.add_field(name="Guessed Letters", value=" ".join(guessed), inline=True)
         
         embed.add_field(name="How to Play", value="Type a letter to guess!", inline=False)
         
         # Check win/lose conditions
-        if all(letter in guessed for letter in word):
+        if game.solved:
             embed.color = 0x00ff00
             embed.add_field(name="🎉 You Win!", value=f"The word was: **{word}**", inline=False)
-            del self.hangman_games[channel.id]
+            self.hangman_games.pop(channel.id)
             
             # Award prize
-            if 'Economy' in self.bot.cogs:
+            if 'Economy' in self.bot.cogs and self.reward_ready(channel.guild, author.id):
                 reward = len(word) * 50
-                await self.bot.cogs['Economy'].update_user_balance(author.id, reward)
-                embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                reward_text = await self.pay_reward(channel.guild, author.id, reward)
+                if reward_text:
+                    embed.add_field(name="Reward", value=reward_text, inline=True)
                 
-        elif wrong_guesses >= game['max_wrong']:
+        elif wrong_guesses >= game.max_wrong:
             embed.color = 0xff0000
             embed.add_field(name="💀 Game Over!", value=f"The word was: **{word}**", inline=False)
-            del self.hangman_games[channel.id]
+            self.hangman_games.pop(channel.id)
         
         await channel.send(embed=embed)
     
@@ -649,86 +696,99 @@ class Fun(commands.Cog):
             await ctx.send("A game is already in progress between you two!")
             return
         
+        # Moves are routed by (channel, player), so each player can only be in one game per channel
+        session = self.open_tictactoe_session(game_id, ctx.channel.id, (ctx.author.id, opponent.id))
+        if session is None:
+            await ctx.send("One of you is already playing a game in this channel!")
+            return
+        
         # Initialize game
-        self.tictactoe_games[game_id] = {
-            "board": [[" " for _ in range(3)] for _ in range(3)],
-            "current_player": ctx.author.id,
-            "players": {ctx.author.id: "X", opponent.id: "O"},
-            "channel": ctx.channel.id
-        }
-        
-        await self.display_tictactoe(ctx, game_id)
+        game = TicTacToeGame(ctx.channel.id, (ctx.author.id, opponent.id))
+        game.session = session
+        self.tictactoe_games.put(game_id, game)
+        
+        await self.display_tictactoe(ctx.channel, game_id)
+    
+    def open_tictactoe_session(self, game_id, channel_id, players):
+        """Route both players' messages in the channel to a game"""
+        return self.bot.input_router.open(
+            channel_id,
+            players,
+            lambda message: self.tictactoe_move(message, game_id),
+            timeout=TICTACTOE_TIMEOUT_SECONDS,
+            on_timeout=lambda: self.expire_tictactoe(channel_id, game_id)
+        )
     
-    async def display_tictactoe(self, ctx, game_id):
-        """Display tic-tac-toe board"""
-        game = self.tictactoe_games[game_id]
-        board = game["board"]
+    async def display_tictactoe(self, channel, game_id):
+        """Display tic-tac-toe board in the game's channel"""
+        game = self.tictactoe_games.get(game_id)
+        if game is None:
+            return
+        board = game.board
         
         # Create board display
         board_str = "```\n"
-        for i, row in enumerate(board):
-            board_str += " | ".join([cell if cell != " " else str(i*3 + j + 1) for j, cell in enumerate(row)])
+        for i in range(3):
+            board_str += " | ".join([game.SYMBOLS[board[cell]] if board[cell] else str(cell + 1) for cell in range(i*3, i*3 + 3)])
             if i < 2:
                 board_str += "\n-----------\n"
         board_str += "\n```"
         
-        current_player_id = game["current_player"]
+        current_player_id = game.current_player
         current_player = self.bot.get_user(current_player_id)
-        symbol = game["players"][current_player_id]
+        symbol = game.symbol_for(current_player_id)
         
         embed = discord.Embed(
             title="❌⭕ Tic-Tac-Toe",
             description=board_str,
             color=0x7289da
         )
-        embed.add_field(name="Current Turn", value=f"{current_player.mention} ({symbol})", inline=True)
+        embed.add_field(name="Current Turn", value=f"<@{current_player_id}> ({symbol})", inline=True)
         embed.add_field(name="How to Play", value="Type a number (1-9) to place your symbol!", inline=False)
         
         # Check for win/draw
-        winner = self.check_tictactoe_winner(board)
+        winner = game.winner()
         if winner:
             if winner == "draw":
                 embed.color = 0xffa500
                 embed.add_field(name="🤝 Draw!", value="No one wins this time!", inline=False)
             else:
-                winner_id = next(pid for pid, symbol in game["players"].items() if symbol == winner)
-                winner_user = self.bot.get_user(winner_id)
+                winner_id = game.players[game.SYMBOLS.index(winner) - 1]
                 embed.color = 0x00ff00
-                embed.add_field(name="🎉 Winner!", value=f"{winner_user.mention} ({winner}) wins!", inline=False)
+                embed.add_field(name="🎉 Winner!", value=f"<@{winner_id}> ({winner}) wins!", inline=False)
                 
                 # Award prize
-                if 'Economy' in self.bot.cogs:
+                if 'Economy' in self.bot.cogs and self.reward_ready(channel.guild, winner_id):
                     reward = 200
-                    await self.bot.cogs['Economy'].update_user_balance(winner_id, reward)
-                    embed.add_field(name="Reward", value=f"+${reward}", inline=True)
+                    reward_text = await self.pay_reward(channel.guild, winner_id, reward)
+                    if reward_text:
+                        embed.add_field(name="Reward", value=reward_text, inline=True)
             
-            del self.tictactoe_games[game_id]
+            self.tictactoe_games.pop(game_id)
+            if game.session:
+                game.session.close()
         
-        await ctx.send(embed=embed)
+        await channel.send(embed=embed)
     
-    def check_tictactoe_winner(self, board):
-        """Check for tic-tac-toe winner"""
-        # Check rows
-        for row in board:
-            if row[0] == row[1] == row[2] != " ":
-                return row[0]
-        
-        # Check columns
-        for col in range(3):
-            if board[0][col] == board[1][col] == board[2][col] != " ":
-                return board[0][col]
-        
-        # Check diagonals
-        if board[0][0] == board[1][1] == board[2][2] != " ":
-            return board[0][0]
-        if board[0][2] == board[1][1] == board[2][0] != " ":
-            return board[0][2]
-        
-        # Check for draw
-        if all(board[i][j] != " " for i in range(3) for j in range(3)):
-            return "draw"
-        
-        return None
+    async def tictactoe_move(self, message, game_id):
+        """Apply a routed tic-tac-toe move from one of the players"""
+        game = self.tictactoe_games.get(game_id)
+        if game is None or message.author.id != game.current_player or not message.content.isdigit():
+            return
+        
+        move = int(message.content)
+        if 1 <= move <= 9:
+            if game.place(move - 1):
+                self.tictactoe_games.put(game_id, game)
+                await self.display_tictactoe(message.channel, game_id)
+            else:
+                await message.channel.send("That position is already taken!")
+    
+    async def expire_tictactoe(self, channel_id, game_id):
+        """End a tic-tac-toe game nobody has played for a while"""
+        channel = self.bot.get_channel(channel_id)
+        if self.tictactoe_games.pop(game_id) is not None and channel:
+            await channel.send("⏰ Tic-tac-toe game ended after 5 minutes without a move.")
     
     @commands.command(name='truth')
     async def truth(self, ctx):
@@ -853,48 +913,24 @@ class Fun(commands.Cog):
     
     @commands.Cog.listener()
     async def on_message(self, message):
-        """Handle game responses"""
+        """Handle hangman guesses (other games receive input through bot.input_router)"""
         if message.author.bot:
             return
         
         # Handle hangman guesses
-        if message.channel.id in self.hangman_games:
-            if len(message.content) == 1 and message.content.isalpha():
-                game = self.hangman_games[message.channel.id]
+        if len(message.content) == 1 and message.content.isascii() and message.content.isalpha():
+            game = self.hangman_games.get(message.channel.id)
+            if game is not None:
                 letter = message.content.upper()
                 
-                if letter in game["guessed"]:
+                if game.has_guessed(letter):
                     await message.channel.send(f"You already guessed **{letter}**!")
                     return
                 
-                game["guessed"].add(letter)
-                
-                if letter not in game["word"]:
-                    game["wrong_guesses"] += 1
+                game.guess(letter)
+                self.hangman_games.put(message.channel.id, game)
                 
                 await self.display_hangman_message(message.channel, message.author)
-        
-        # Handle tic-tac-toe moves
-        for game_id, game in list(self.tictactoe_games.items()):
-            if (message.channel.id == game["channel"] and 
-                message.author.id == game["current_player"] and
-                message.content.isdigit()):
-                
-                move = int(message.content)
-                if 1 <= move <= 9:
-                    row, col = (move - 1) // 3, (move - 1) % 3
-                    
-                    if game["board"][row][col] == " ":
-                        game["board"][row][col] = game["players"][message.author.id]
-                        
-                        # Switch players
-                        players = list(game["players"].keys())
-                        current_index = players.index(game["current_player"])
-                        game["current_player"] = players[1 - current_index]
-                        
-                        await self.display_tictactoe(message, game_id)
-                    else:
-                        await message.channel.send("That position is already taken!")
 
     @commands.command(name="wouldyourather")
     async def would_you_rather(self, ctx):
@@ -1100,85 +1136,52 @@ class Fun(commands.Cog):
         await message.add_reaction("➡️")
     
     @commands.command(name="trivia_quiz")
-    async def quiz_game(self, ctx, category: str = "random"):
+    async def quiz_game(self, ctx, category: str = "random", difficulty: str = None):
         """Take quizzes on various topics"""
-        categories = {
-            "science": [
-                {"q": "What is the chemical symbol for gold?", "a": "au", "options": ["Au", "Ag", "Fe", "Cu"]},
-                {"q": "How many planets are in our solar system?", "a": "8", "options": ["7", "8", "9", "10"]},
-            ],
-            "history": [
-                {"q": "In which year did World War II end?", "a": "1945", "options": ["1944", "1945", "1946", "1947"]},
-                {"q": "Who was the first person to walk on the moon?", "a": "neil armstrong", "options": ["Neil Armstrong", "Buzz Aldrin", "John Glenn", "Alan Shepard"]},
-            ],
-            "geography": [
-                {"q": "What is the capital of Australia?", "a": "canberra", "options": ["Sydney", "Melbourne", "Canberra", "Perth"]},
-                {"q": "Which is the longest river in the world?", "a": "nile", "options": ["Amazon", "Nile", "Mississippi", "Yangtze"]},
-            ]
-        }
-        
-        if category == "random":
-            all_questions = []
-            for cat_questions in categories.values():
-                all_questions.extend(cat_questions)
-            question_data = random.choice(all_questions)
-        elif category.lower() in categories:
-            question_data = random.choice(categories[category.lower()])
-        else:
-            await ctx.send(f"❌ Available categories: {', '.join(categories.keys())}, random")
+        question = await self.draw_question(ctx, category, difficulty, choices=True)
+        if question is None:
             return
         
         embed = discord.Embed(
             title=f"🧠 Quiz - {category.title()}",
-            description=question_data["q"],
+            description=question.question,
             color=0x9932cc
         )
         
-        for i, option in enumerate(question_data["options"], 1):
+        for i, option in enumerate(question.options, 1):
             embed.add_field(
                 name=f"Option {i}",
                 value=option,
                 inline=True
             )
         
-        embed.set_footer(text="You have 30 seconds to answer! Type the number (1-4)")
+        embed.set_footer(text=f"You have 30 seconds to answer! Type the number (1-{len(question.options)})")
         
         await ctx.send(embed=embed)
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.isdigit()
-        
         try:
-            response = await self.bot.wait_for('message', timeout=30.0, check=check)
+            response = await self.bot.input_router.wait(
+                ctx.channel.id, ctx.author.id, timeout=30.0, check=lambda m: m.content.isdigit()
+            )
             choice = int(response.content)
             
-            if 1 <= choice <= len(question_data["options"]):
-                chosen_answer = question_data["options"][choice - 1].lower()
-                correct_answer = question_data["a"].lower()
-                
-                if chosen_answer == correct_answer or question_data["a"].lower() in chosen_answer:
+            if 1 <= choice <= len(question.options):
+                if choice == question.correct_option:
                     embed = discord.Embed(
                         title="✅ Correct!",
-                        description=f"The answer was: {question_data['options'][choice - 1]}",
+                        description=f"The answer was: {question.options[choice - 1]}",
                         color=0x00ff00
                     )
                 else:
-                    # Find correct option
-                    correct_option = None
-                    for opt in question_data["options"]:
-                        if question_data["a"].lower() in opt.lower():
-                            correct_option = opt
-                            break
-                    
                     embed = discord.Embed(
                         title="❌ Incorrect!",
-                        description=f"The correct answer was: {correct_option or question_data['a']}",
+                        description=f"The correct answer was: {question.answer}",
                         color=0xff0000
                     )
                 
                 await ctx.send(embed=embed)
             else:
-                await ctx.send("❌ Please choose a valid option (1-4)!")
+                await ctx.send(f"❌ Please choose a valid option (1-{len(question.options)})!")
                 
         except asyncio.TimeoutError:
             embed = discord.Embed(
@@ -1223,11 +1226,8 @@ class Fun(commands.Cog):
         
         await ctx.send(embed=embed)
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel
-        
         try:
-            response = await self.bot.wait_for('message', timeout=60.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, ctx.author.id, timeout=60.0)
             
             if response.content.lower().strip() == puzzle["answer"].lower():
                 embed = discord.Embed(
@@ -1292,12 +1292,9 @@ class Fun(commands.Cog):
         pairs_found = 0
         revealed = [False] * 6
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel
-        
         while pairs_found < 3:
             try:
-                response = await self.bot.wait_for('message', timeout=60.0, check=check)
+                response = await self.bot.input_router.wait(ctx.channel.id, ctx.author.id, timeout=60.0)
                 
                 try:
                     positions = [int(x) - 1 for x in response.content.split()]
@@ -1458,11 +1455,8 @@ class Fun(commands.Cog):
         
         start_time = asyncio.get_event_loop().time()
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel
-        
         try:
-            response = await self.bot.wait_for('message', timeout=60.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, ctx.author.id, timeout=60.0)
             end_time = asyncio.get_event_loop().time()
             
             typed_text = response.content
@@ -1564,11 +1558,8 @@ class Fun(commands.Cog):
         
         await ctx.send(embed=embed)
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel
-        
         try:
-            response = await self.bot.wait_for('message', timeout=30.0, check=check)
+            response = await self.bot.input_router.wait(ctx.channel.id, ctx.author.id, timeout=30.0)
             
             try:
                 user_answer = float(response.content)
@@ -1601,4 +1592,6 @@ class Fun(commands.Cog):
             await ctx.send(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(Fun(bot))
\ No newline at end of file
+    cog = Fun(bot)
+    await cog.load_game_sessions()
+    await bot.add_cog(cog)
\ No newline at end of file
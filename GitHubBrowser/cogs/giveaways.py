@@ -1,13 +1,36 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
 import asyncpg
 from datetime import datetime, timedelta
-import random
 import logging
+import heapq
 
 logger = logging.getLogger(__name__)
 
+# Claim due giveaways so each one is ended exactly once, even if timers and !gend race
+CLAIM_GIVEAWAYS_SQL = """
+    UPDATE giveaways SET status = 'completed'
+    WHERE id = ANY($1::INT[]) AND status = 'active'
+    RETURNING *
+"""
+
+# Entry clicks are confirmed after their batch is written, this long after the first click
+ENTRY_FLUSH_DELAY = 0.25
+
+INSERT_ENTRIES_SQL = """
+    INSERT INTO giveaway_entries (giveaway_id, user_id)
+    SELECT * FROM unnest($1::INT[], $2::BIGINT[])
+    ON CONFLICT (giveaway_id, user_id) DO NOTHING
+"""
+
+# Sample winners in the database; the window count is taken before LIMIT
+DRAW_WINNERS_SQL = """
+    SELECT user_id, COUNT(*) OVER () AS total_entries
+    FROM giveaway_entries WHERE giveaway_id = $1
+    ORDER BY random() LIMIT $2
+"""
+
 class GiveawayView(discord.ui.View):
     """Interactive giveaway participation view"""
     
@@ -22,56 +45,37 @@ class GiveawayView(discord.ui.View):
         if not self.bot.db_pool:
             await interaction.response.send_message("❌ Giveaway system unavailable - database offline.", ephemeral=True)
             return
+        cog = self.bot.get_cog('Giveaways')
+        if cog is None:
+            await interaction.response.send_message("❌ Giveaway system unavailable.", ephemeral=True)
+            return
         try:
-            async with self.bot.db_pool.acquire() as conn:
-                # Check if user already entered
-                existing = await conn.fetchrow(
-                    "SELECT id FROM giveaway_entries WHERE giveaway_id = $1 AND user_id = $2",
-                    self.giveaway_id, interaction.user.id
-                )
-                
-                if existing:
-                    await interaction.response.send_message("❌ You're already entered in this giveaway!", ephemeral=True)
-                    return
-                
-                # Check if giveaway is still active
-                giveaway = await conn.fetchrow(
-                    "SELECT * FROM giveaways WHERE id = $1 AND status = 'active'",
-                    self.giveaway_id
-                )
-                
-                if not giveaway:
-                    await interaction.response.send_message("❌ This giveaway is no longer active!", ephemeral=True)
-                    return
-                
-                # Check if giveaway has ended
-                if self.bot.get_current_time() > giveaway['end_time']:
-                    await interaction.response.send_message("❌ This giveaway has already ended!", ephemeral=True)
-                    return
-                
-                # Add user to giveaway
-                await conn.execute(
-                    "INSERT INTO giveaway_entries (giveaway_id, user_id) VALUES ($1, $2)",
-                    self.giveaway_id, interaction.user.id
-                )
-                
-                # Get current entry count
-                entry_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM giveaway_entries WHERE giveaway_id = $1",
-                    self.giveaway_id
-                )
-                
-                embed = discord.Embed(
-                    title="🎉 Giveaway Entry Confirmed",
-                    description=f"You're now entered in the giveaway for **{giveaway['prize']}**!",
-                    color=0x00ff00
-                )
-                embed.add_field(name="Total Entries", value=str(entry_count), inline=True)
-                embed.add_field(name="Ends", value=f"<t:{int(giveaway['end_time'].timestamp())}:R>", inline=True)
-                embed.set_footer(text="Good luck!")
-                
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-                
+            status, state = await cog.enter_giveaway(self.giveaway_id, interaction.user.id)
+            
+            if status == 'inactive':
+                await interaction.response.send_message("❌ This giveaway is no longer active!", ephemeral=True)
+                return
+            
+            if status == 'ended':
+                await interaction.response.send_message("❌ This giveaway has already ended!", ephemeral=True)
+                return
+            
+            if status == 'duplicate':
+                await interaction.response.send_message("❌ You're already entered in this giveaway!", ephemeral=True)
+                return
+            
+            giveaway = state['giveaway']
+            embed = discord.Embed(
+                title="🎉 Giveaway Entry Confirmed",
+                description=f"You're now entered in the giveaway for **{giveaway['prize']}**!",
+                color=0x00ff00
+            )
+            embed.add_field(name="Total Entries", value=str(len(state['entrants'])), inline=True)
+            embed.add_field(name="Ends", value=f"<t:{int(giveaway['end_time'].timestamp())}:R>", inline=True)
+            embed.set_footer(text="Good luck!")
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
         except Exception as e:
             logger.error(f"Error entering giveaway: {e}")
             await interaction.response.send_message("❌ An error occurred while entering the giveaway.", ephemeral=True)
@@ -90,10 +94,16 @@ class GiveawayView(discord.ui.View):
                     await interaction.response.send_message("❌ Giveaway not found!", ephemeral=True)
                     return
                 
-                entry_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM giveaway_entries WHERE giveaway_id = $1",
-                    self.giveaway_id
-                )
+                # Active giveaways keep an in-memory entrant set
+                cog = self.bot.get_cog('Giveaways')
+                state = cog.entry_states.get(self.giveaway_id) if cog else None
+                if state:
+                    entry_count = len(state['entrants'])
+                else:
+                    entry_count = await conn.fetchval(
+                        "SELECT COUNT(*) FROM giveaway_entries WHERE giveaway_id = $1",
+                        self.giveaway_id
+                    )
                 
                 embed = discord.Embed(
                     title="📊 Giveaway Statistics",
@@ -120,58 +130,228 @@ class Giveaways(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.check_giveaways.start()
+        # Pending giveaway end times: (loop time, giveaway_id)
+        self.giveaway_timers = []
+        self.timer_wakeup = asyncio.Event()
+        # Active giveaways seen by the Enter button: {giveaway_id: {'giveaway', 'ends_at', 'entrants'}}
+        self.entry_states = {}
+        self.entry_loads = {}
+        # Entries waiting for the next batch insert: [(giveaway_id, user_id)]
+        self.pending_entries = []
+        # Future resolved with True/False once the pending batch is written
+        self.entry_batch = None
+        self.entry_task = None
+        self.timer_task = asyncio.get_running_loop().create_task(self.run_giveaway_timers())
     
     async def cog_unload(self):
         """Clean up when cog is unloaded"""
-        self.check_giveaways.cancel()
+        self.timer_task.cancel()
+        if self.entry_task and not self.entry_task.done():
+            await self.entry_task
     
     async def create_giveaway_tables(self):
         """Create giveaway tables in database"""
         if not self.bot.db_pool:
             return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute('''
+                    CREATE TABLE IF NOT EXISTS giveaways (
+                        id SERIAL PRIMARY KEY,
+                        guild_id BIGINT NOT NULL,
+                        channel_id BIGINT NOT NULL,
+                        message_id BIGINT,
+                        creator_id BIGINT NOT NULL,
+                        prize TEXT NOT NULL,
+                        winners INTEGER DEFAULT 1,
+                        end_time TIMESTAMP NOT NULL,
+                        requirements TEXT,
+                        status VARCHAR(20) DEFAULT 'active',
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+                
+                await conn.execute('''
+                    CREATE TABLE IF NOT EXISTS giveaway_entries (
+                        id SERIAL PRIMARY KEY,
+                        giveaway_id INTEGER REFERENCES giveaways(id) ON DELETE CASCADE,
+                        user_id BIGINT NOT NULL,
+                        entered_at TIMESTAMP DEFAULT NOW(),
+                        UNIQUE(giveaway_id, user_id)
+                    )
+                ''')
+                
+                await conn.execute('''
+                    CREATE TABLE IF NOT EXISTS giveaway_winners (
+                        id SERIAL PRIMARY KEY,
+                        giveaway_id INTEGER REFERENCES giveaways(id) ON DELETE CASCADE,
+                        user_id BIGINT NOT NULL,
+                        prize_claimed BOOLEAN DEFAULT FALSE,
+                        won_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+                
+                # Rebuilds the timer heap at startup without scanning finished giveaways
+                await conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_giveaways_active_end
+                    ON giveaways (end_time) WHERE status = 'active'
+                ''')
+        except Exception as e:
+            logger.error(f"Database error in giveaways: {e}")
+    
+    def schedule_giveaway(self, giveaway_id, seconds_left):
+        """Schedule a giveaway to end after the given number of seconds"""
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self.giveaway_timers, (loop.time() + max(0, seconds_left), giveaway_id))
+        if self.giveaway_timers[0][1] == giveaway_id:
+            self.timer_wakeup.set()
+    
+    async def load_giveaway_timers(self):
+        """Schedule every active giveaway from the partial end_time index"""
+        async with self.bot.db_pool.acquire() as conn:
+            # end_time is compared against the session clock, matching how it was written
+            rows = await conn.fetch("""
+                SELECT id, EXTRACT(EPOCH FROM end_time - LOCALTIMESTAMP)::FLOAT AS seconds_left
+                FROM giveaways WHERE status = 'active' ORDER BY end_time
+            """)
+        for row in rows:
+            self.schedule_giveaway(row['id'], row['seconds_left'])
+        logger.info(f"Scheduled {len(rows)} active giveaways")
+    
+    async def run_giveaway_timers(self):
+        """Single sleeper that ends giveaways at their exact end time"""
+        await self.bot.wait_until_ready()
+        if not self.bot.db_pool:
+            return
+        loop = asyncio.get_running_loop()
+        
+        # Rebuild the heap once; new giveaways are scheduled as they are created
+        while True:
+            try:
+                await self.load_giveaway_timers()
+                break
+            except Exception as e:
+                logger.error(f"Error loading giveaway timers: {e}")
+                await asyncio.sleep(30)
+        
+        while True:
+            try:
+                now = loop.time()
+                due = []
+                while self.giveaway_timers and self.giveaway_timers[0][0] <= now:
+                    due.append(heapq.heappop(self.giveaway_timers)[1])
+                if due:
+                    await self.end_due_giveaways(due)
+                    continue
+                
+                self.timer_wakeup.clear()
+                timeout = self.giveaway_timers[0][0] - now if self.giveaway_timers else None
+                try:
+                    await asyncio.wait_for(self.timer_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in giveaway timer: {e}")
+                await asyncio.sleep(5)
+    
+    async def get_entry_state(self, giveaway_id):
+        """Load an active giveaway and its entrants once; later clicks are served from memory"""
+        state = self.entry_states.get(giveaway_id)
+        if state is not None:
+            return state
         
+        # Concurrent first clicks share a single load
+        load = self.entry_loads.get(giveaway_id)
+        if load is None:
+            load = asyncio.get_running_loop().create_task(self.load_entry_state(giveaway_id))
+            self.entry_loads[giveaway_id] = load
+            load.add_done_callback(lambda _: self.entry_loads.pop(giveaway_id, None))
+        return await asyncio.shield(load)
+    
+    async def load_entry_state(self, giveaway_id):
+        """Fetch an active giveaway and the users already entered"""
         async with self.bot.db_pool.acquire() as conn:
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS giveaways (
-                    id SERIAL PRIMARY KEY,
-                    guild_id BIGINT NOT NULL,
-                    channel_id BIGINT NOT NULL,
-                    message_id BIGINT,
-                    creator_id BIGINT NOT NULL,
-                    prize TEXT NOT NULL,
-                    winners INTEGER DEFAULT 1,
-                    end_time TIMESTAMP NOT NULL,
-                    requirements TEXT,
-                    status VARCHAR(20) DEFAULT 'active',
-                    created_at TIMESTAMP DEFAULT NOW()
-                )
-            ''')
-            
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS giveaway_entries (
-                    id SERIAL PRIMARY KEY,
-                    giveaway_id INTEGER REFERENCES giveaways(id) ON DELETE CASCADE,
-                    user_id BIGINT NOT NULL,
-                    entered_at TIMESTAMP DEFAULT NOW(),
-                    UNIQUE(giveaway_id, user_id)
-                )
-            ''')
-            
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS giveaway_winners (
-                    id SERIAL PRIMARY KEY,
-                    giveaway_id INTEGER REFERENCES giveaways(id) ON DELETE CASCADE,
-                    user_id BIGINT NOT NULL,
-                    prize_claimed BOOLEAN DEFAULT FALSE,
-                    won_at TIMESTAMP DEFAULT NOW()
-                )
-            ''')
+            giveaway = await conn.fetchrow("""
+                SELECT *, EXTRACT(EPOCH FROM end_time - LOCALTIMESTAMP)::FLOAT AS seconds_left
+                FROM giveaways WHERE id = $1 AND status = 'active'
+            """, giveaway_id)
+            if not giveaway:
+                return None
+            entrants = await conn.fetch(
+                "SELECT user_id FROM giveaway_entries WHERE giveaway_id = $1",
+                giveaway_id
+            )
+        
+        state = {
+            'giveaway': giveaway,
+            'ends_at': asyncio.get_running_loop().time() + giveaway['seconds_left'],
+            'entrants': {row['user_id'] for row in entrants}
+        }
+        self.entry_states[giveaway_id] = state
+        return state
+    
+    async def enter_giveaway(self, giveaway_id, user_id):
+        """Enter a user into a giveaway; returns (status, state)
+        
+        status is 'entered', 'duplicate', 'ended' or 'inactive'. Duplicate
+        and late clicks are answered from memory; new entries are written in
+        batches and confirmed once their batch commits.
+        """
+        state = await self.get_entry_state(giveaway_id)
+        if state is None:
+            return 'inactive', None
+        if asyncio.get_running_loop().time() >= state['ends_at']:
+            return 'ended', state
+        if user_id in state['entrants']:
+            return 'duplicate', state
+        
+        state['entrants'].add(user_id)
+        self.pending_entries.append((giveaway_id, user_id))
+        if self.entry_batch is None:
+            self.entry_batch = asyncio.get_running_loop().create_future()
+            self.entry_task = asyncio.get_running_loop().create_task(self.flush_entries())
+        
+        if not await asyncio.shield(self.entry_batch):
+            state['entrants'].discard(user_id)
+            raise RuntimeError("giveaway entry batch failed")
+        return 'entered', state
+    
+    async def flush_entries(self, delay=ENTRY_FLUSH_DELAY):
+        """Write every pending entry in one statement"""
+        await asyncio.sleep(delay)
+        pending, self.pending_entries = self.pending_entries, []
+        batch, self.entry_batch = self.entry_batch, None
+        
+        written = True
+        try:
+            if pending:
+                async with self.bot.db_pool.acquire() as conn:
+                    await conn.execute(
+                        INSERT_ENTRIES_SQL,
+                        [giveaway_id for giveaway_id, _ in pending],
+                        [user_id for _, user_id in pending]
+                    )
+        except Exception as e:
+            logger.error(f"Failed to write {len(pending)} giveaway entries: {e}")
+            written = False
+        finally:
+            if batch is not None and not batch.done():
+                batch.set_result(written)
     
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Initialize giveaway tables when bot is ready"""
-        await self.create_giveaway_tables()
+    async def end_due_giveaways(self, giveaway_ids):
+        """Claim due giveaways in one statement and end them in parallel"""
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                claimed = await conn.fetch(CLAIM_GIVEAWAYS_SQL, giveaway_ids)
+        except Exception as e:
+            logger.error(f"Error claiming {len(giveaway_ids)} giveaways: {e}")
+            # Retry shortly; the claim keeps a retry from ending anything twice
+            for giveaway_id in giveaway_ids:
+                self.schedule_giveaway(giveaway_id, 30)
+            return
+        await asyncio.gather(*(self.end_giveaway_process(giveaway) for giveaway in claimed))
     
     @commands.command(name='gcreate')
     @commands.has_permissions(manage_guild=True)
@@ -208,6 +388,7 @@ class Giveaways(commands.Cog):
                     """,
                     ctx.guild.id, ctx.channel.id, ctx.author.id, prize, winners, end_time
                 )
+            self.schedule_giveaway(giveaway_id, duration_seconds)
             
             # Create giveaway embed
             embed = discord.Embed(
@@ -249,18 +430,19 @@ class Giveaways(commands.Cog):
         """Manually end a giveaway early"""
         try:
             async with self.bot.db_pool.acquire() as conn:
-                giveaway = await conn.fetchrow(
-                    "SELECT * FROM giveaways WHERE id = $1 AND guild_id = $2 AND status = 'active'",
-                    giveaway_id, ctx.guild.id
-                )
-                
-                if not giveaway:
-                    await ctx.send("❌ Active giveaway with that ID not found!")
-                    return
-                
-                # End the giveaway
-                await self.end_giveaway_process(giveaway)
-                await ctx.send(f"✅ Giveaway #{giveaway_id} has been ended manually!")
+                giveaway = await conn.fetchrow("""
+                    UPDATE giveaways SET status = 'completed'
+                    WHERE id = $1 AND guild_id = $2 AND status = 'active'
+                    RETURNING *
+                """, giveaway_id, ctx.guild.id)
+            
+            if not giveaway:
+                await ctx.send("❌ Active giveaway with that ID not found!")
+                return
+            
+            # End the giveaway; its timer finds it already claimed
+            await self.end_giveaway_process(giveaway)
+            await ctx.send(f"✅ Giveaway #{giveaway_id} has been ended manually!")
                 
         except Exception as e:
             logger.error(f"Error ending giveaway: {e}")
@@ -281,30 +463,22 @@ class Giveaways(commands.Cog):
                     await ctx.send("❌ Completed giveaway with that ID not found!")
                     return
                 
-                # Get all entries
-                entries = await conn.fetch(
-                    "SELECT user_id FROM giveaway_entries WHERE giveaway_id = $1",
-                    giveaway_id
-                )
+                # Draw new winners in the database
+                winners = await conn.fetch(DRAW_WINNERS_SQL, giveaway_id, giveaway['winners'])
                 
-                if len(entries) < giveaway['winners']:
+                if not winners or winners[0]['total_entries'] < giveaway['winners']:
                     await ctx.send("❌ Not enough entries to reroll!")
                     return
                 
-                # Remove old winners
-                await conn.execute(
-                    "DELETE FROM giveaway_winners WHERE giveaway_id = $1",
-                    giveaway_id
-                )
-                
-                # Select new winners
-                winners = random.sample(entries, min(giveaway['winners'], len(entries)))
-                
-                # Add new winners to database
-                for winner in winners:
+                # Replace old winners
+                async with conn.transaction():
                     await conn.execute(
-                        "INSERT INTO giveaway_winners (giveaway_id, user_id) VALUES ($1, $2)",
-                        giveaway_id, winner['user_id']
+                        "DELETE FROM giveaway_winners WHERE giveaway_id = $1",
+                        giveaway_id
+                    )
+                    await conn.execute(
+                        "INSERT INTO giveaway_winners (giveaway_id, user_id) SELECT $1, unnest($2::BIGINT[])",
+                        giveaway_id, [w['user_id'] for w in winners]
                     )
                 
                 # Announce reroll
@@ -339,10 +513,12 @@ class Giveaways(commands.Cog):
         """List all active giveaways in the server"""
         try:
             async with self.bot.db_pool.acquire() as conn:
-                giveaways = await conn.fetch(
-                    "SELECT * FROM giveaways WHERE guild_id = $1 AND status = 'active' ORDER BY end_time",
-                    ctx.guild.id
-                )
+                giveaways = await conn.fetch("""
+                    SELECT g.*, (SELECT COUNT(*) FROM giveaway_entries e WHERE e.giveaway_id = g.id) AS entry_count
+                    FROM giveaways g
+                    WHERE g.guild_id = $1 AND g.status = 'active'
+                    ORDER BY g.end_time
+                """, ctx.guild.id)
                 
                 if not giveaways:
                     embed = discord.Embed(
@@ -360,14 +536,9 @@ class Giveaways(commands.Cog):
                 )
                 
                 for giveaway in giveaways[:10]:  # Limit to 10 for embed size
-                    entry_count = await conn.fetchval(
-                        "SELECT COUNT(*) FROM giveaway_entries WHERE giveaway_id = $1",
-                        giveaway['id']
-                    )
-                    
                     embed.add_field(
                         name=f"ID: {giveaway['id']} - {giveaway['prize']}",
-                        value=f"**Entries:** {entry_count}\n**Ends:** <t:{int(giveaway['end_time'].timestamp())}:R>\n**Channel:** <#{giveaway['channel_id']}>",
+                        value=f"**Entries:** {giveaway['entry_count']}\n**Ends:** <t:{int(giveaway['end_time'].timestamp())}:R>\n**Channel:** <#{giveaway['channel_id']}>",
                         inline=False
                     )
                 
@@ -377,52 +548,25 @@ class Giveaways(commands.Cog):
             logger.error(f"Error listing giveaways: {e}")
             await ctx.send(f"❌ Error listing giveaways: {str(e)}")
     
-    @tasks.loop(minutes=1)
-    async def check_giveaways(self):
-        """Check for giveaways that need to be ended"""
-        try:
-            if not self.bot.db_pool:
-                return
-            
-            async with self.bot.db_pool.acquire() as conn:
-                expired_giveaways = await conn.fetch(
-                    "SELECT * FROM giveaways WHERE status = 'active' AND end_time <= NOW()"
-                )
-                
-                for giveaway in expired_giveaways:
-                    await self.end_giveaway_process(giveaway)
-                    
-        except Exception as e:
-            logger.error(f"Error checking giveaways: {e}")
-    
-    @check_giveaways.before_loop
-    async def before_check_giveaways(self):
-        """Wait for bot to be ready before starting task"""
-        await self.bot.wait_until_ready()
-    
     async def end_giveaway_process(self, giveaway):
-        """Process ending a giveaway and selecting winners"""
+        """Select winners and announce a giveaway that has been claimed as completed"""
+        # Stop accepting clicks and let any in-flight entry batch land first
+        self.entry_states.pop(giveaway['id'], None)
+        if self.entry_task and not self.entry_task.done():
+            await asyncio.shield(self.entry_task)
+        
         try:
             async with self.bot.db_pool.acquire() as conn:
-                # Get all entries
-                entries = await conn.fetch(
-                    "SELECT user_id FROM giveaway_entries WHERE giveaway_id = $1",
-                    giveaway['id']
-                )
-                
-                # Mark giveaway as completed
-                await conn.execute(
-                    "UPDATE giveaways SET status = 'completed' WHERE id = $1",
-                    giveaway['id']
-                )
+                winners = await conn.fetch(DRAW_WINNERS_SQL, giveaway['id'], giveaway['winners'])
+                total_entries = winners[0]['total_entries'] if winners else 0
                 
                 guild = self.bot.get_guild(giveaway['guild_id'])
-                channel = guild.get_channel(giveaway['channel_id'])
+                channel = guild.get_channel(giveaway['channel_id']) if guild else None
                 
                 if not channel:
                     return
                 
-                if len(entries) == 0:
+                if total_entries == 0:
                     # No entries
                     embed = discord.Embed(
                         title="🎉 Giveaway Ended",
@@ -433,16 +577,11 @@ class Giveaways(commands.Cog):
                     await channel.send(embed=embed)
                     return
                 
-                # Select winners
-                num_winners = min(giveaway['winners'], len(entries))
-                winners = random.sample(entries, num_winners)
-                
                 # Add winners to database
-                for winner in winners:
-                    await conn.execute(
-                        "INSERT INTO giveaway_winners (giveaway_id, user_id) VALUES ($1, $2)",
-                        giveaway['id'], winner['user_id']
-                    )
+                await conn.execute(
+                    "INSERT INTO giveaway_winners (giveaway_id, user_id) SELECT $1, unnest($2::BIGINT[])",
+                    giveaway['id'], [w['user_id'] for w in winners]
+                )
                 
                 # Create winner announcement
                 embed = discord.Embed(
@@ -457,7 +596,7 @@ class Giveaways(commands.Cog):
                     value="\n".join(winner_mentions),
                     inline=False
                 )
-                embed.add_field(name="Total Entries", value=str(len(entries)), inline=True)
+                embed.add_field(name="Total Entries", value=str(total_entries), inline=True)
                 embed.set_footer(text=f"Giveaway ID: {giveaway['id']} • Contact the host to claim your prize!")
                 
                 # Send winner announcement
@@ -475,7 +614,7 @@ class Giveaways(commands.Cog):
                             color=0x999999
                         )
                         ended_embed.add_field(name="Winners", value="\n".join(winner_mentions), inline=False)
-                        ended_embed.add_field(name="Total Entries", value=str(len(entries)), inline=True)
+                        ended_embed.add_field(name="Total Entries", value=str(total_entries), inline=True)
                         ended_embed.set_footer(text=f"Ended • Giveaway ID: {giveaway['id']}")
                         
                         # Disable the view
@@ -524,4 +663,6 @@ class Giveaways(commands.Cog):
         return total_seconds
 
 async def setup(bot):
-    await bot.add_cog(Giveaways(bot))
\ No newline at end of file
+    cog = Giveaways(bot)
+    await cog.create_giveaway_tables()
+    await bot.add_cog(cog)
\ No newline at end of file
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 import logging
+from help_catalog import HelpCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -172,149 +173,69 @@ class Help(commands.Cog):
             }
         }
         
-        # 22 Slash commands  
-        self.slash_command_list = [
-            "/balance", "/give", "/daily", "/work", "/warn", "/kick", "/ban", 
-            "/userinfo", "/serverinfo", "/ticket", "/announce", "/poll", 
-            "/remindme", "/translate", "/weather", "/play", "/skip", "/queue", 
-            "/feedback", "/settings", "/welcome_setup", "/welcome_test"
-        ]
+        # Pages and search index, built from the registered commands on first use
+        self.catalog = HelpCatalog(self.command_categories)
     
-    @commands.hybrid_command(name='guide')
-    async def help_command(self, ctx, *, category: str = None):
-        """Show comprehensive help for all commands"""
-        if not category:
-            # Main help menu with all 24 categories
+    def get_catalog(self):
+        """Help catalog for the cogs loaded right now"""
+        return self.catalog.refresh(self.bot)
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Build the help catalog once every cog has registered its commands"""
+        self.get_catalog()
+    
+    def lookup(self, query, command_name):
+        """Prebuilt pages for a help query, or suggestions when it matches nothing exactly"""
+        catalog = self.get_catalog()
+        if not query:
+            return catalog.overview_pages
+        
+        target = catalog.resolve(query)
+        matches = []
+        if target is None:
+            matches = catalog.search(query, limit=10)
+            if len(matches) == 1:
+                target = matches[0]
+        if target is not None:
+            return catalog.pages_for(target)
+        
+        if matches:
             embed = discord.Embed(
-                title="🍎 Apple Bot - Complete Command Guide",
-                description="Your comprehensive Discord companion with 24 specialized command categories.",
-                color=0x00ff00
+                title=f"🔍 Results for '{query}'",
+                description="\n".join(f"• {catalog.label(match)[:120]}" for match in matches),
+                color=0xff9900
+            )
+            embed.set_footer(text=f"Use {command_name} <name> with one of these")
+        else:
+            embed = discord.Embed(
+                title=f"Command: {query}",
+                description="Detailed command information",
+                color=0xff9900
             )
-            
-            # Add all 24 categories
-            for cat_name, cat_data in self.command_categories.items():
-                commands = cat_data["commands"]
-                description = cat_data["description"]
-                embed.add_field(
-                    name=f"{cat_name} ({len(commands)})",
-                    value=f"{description}\n`!guide {cat_name.split()[1].lower() if len(cat_name.split()) > 1 else cat_name.split()[0].lower()}`",
-                    inline=True
-                )
-            
             embed.add_field(
-                name="📖 How to Use",
-                value="• `!guide <category>` - View commands in a category\n• Use `/` for slash commands\n• `!commands` - Show command summary",
+                name="Command Not Found",
+                value=f"No command or category named '{query}' found.\nUse `{command_name}` to see all available categories.",
                 inline=False
             )
-            
-            total_commands = sum(len(cat_data["commands"]) for cat_data in self.command_categories.values())
-            embed.set_footer(text=f"Total: {total_commands} commands across 24 categories | Prefix: !")
-            
+        return [embed]
+    
+    async def send_pages(self, send, user_id, pages):
+        """Send prebuilt pages, with navigation buttons when there is more than one"""
+        if len(pages) > 1:
+            await send(embed=pages[0], view=CommandPaginationView(pages, user_id))
         else:
-            # Category-specific help
-            category_lower = category.lower().replace("_", "").replace("-", "")
-            found_category = None
-            
-            # Find matching category
-            for cat_name, cat_data in self.command_categories.items():
-                cat_words = [word.lower() for word in cat_name.split() if not word.startswith(('🆘', '🔨', '💰', '🐾', '🎲', '🎪', '🛠️', '📌', '🔍', '📈', '📊', '👥', '⚙️', '🎁', '👋', '🔗', '📝', '📋', '🤝', '💡', '🏆', '🔔', '🛡️', '🤖'))]
-                if any(category_lower in word.lower() or word.lower() in category_lower for word in cat_words):
-                    found_category = (cat_name, cat_data)
-                    break
-            
-            if found_category:
-                cat_name, cat_data = found_category
-                commands = cat_data["commands"]
-                description = cat_data["description"]
-                
-                embed = discord.Embed(
-                    title=f"{cat_name}",
-                    description=f"{description}\n\n**Available Commands ({len(commands)}):**",
-                    color=0x7289da
-                )
-                
-                # Split commands into groups for better formatting
-                command_chunks = [commands[i:i+8] for i in range(0, len(commands), 8)]
-                
-                for i, chunk in enumerate(command_chunks, 1):
-                    embed.add_field(
-                        name=f"Commands {(i-1)*8+1}-{min(i*8, len(commands))}",
-                        value="`" + "`, `".join(chunk) + "`",
-                        inline=False
-                    )
-                
-                embed.add_field(
-                    name="Usage",
-                    value="Use `!<command>` to run a command\nExample: `!" + commands[0] + "`",
-                    inline=False
-                )
-                
-            else:
-                # Individual command help
-                embed = discord.Embed(
-                    title=f"Command: {category}",
-                    description="Detailed command information",
-                    color=0xff9900
-                )
-                
-                # Check if command exists in our categories
-                command_found = False
-                for cat_name, cat_data in self.command_categories.items():
-                    if category_lower in cat_data["commands"]:
-                        embed.add_field(name="Category", value=cat_name, inline=True)
-                        embed.add_field(name="Usage", value=f"`!{category_lower}`", inline=True)
-                        command_found = True
-                        break
-                
-                if not command_found:
-                    embed.add_field(
-                        name="Command Not Found",
-                        value=f"No command or category named '{category}' found.\nUse `!guide` to see all available categories.",
-                        inline=False
-                    )
-        
-        await ctx.send(embed=embed)
+            await send(embed=pages[0])
+    
+    @commands.hybrid_command(name='guide')
+    async def help_command(self, ctx, *, category: str = None):
+        """Show comprehensive help for all commands"""
+        await self.send_pages(ctx.send, ctx.author.id, self.lookup(category, "!guide"))
     
     @commands.command(name='commands')
     async def commands_overview(self, ctx):
         """Show command count summary"""
-        embed = discord.Embed(
-            title="📊 Apple Bot Command Summary",
-            description="Complete breakdown of all 200 commands",
-            color=0x00ff00
-        )
-        
-        total_prefix = 0
-        for cat_name, cat_data in self.command_categories.items():
-            count = len(cat_data["commands"])
-            total_prefix += count
-            embed.add_field(
-                name=cat_name,
-                value=f"{count} commands",
-                inline=True
-            )
-        
-        embed.add_field(
-            name="⚡ Slash Commands",
-            value=f"{len(self.slash_command_list)} commands",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="📈 Total Commands",
-            value=f"**{total_prefix + len(self.slash_command_list)} commands**\n({total_prefix} prefix + {len(self.slash_command_list)} slash)",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🎯 Command Types",
-            value="• **Prefix Commands**: Use `!command` (example: `!balance`)\n• **Slash Commands**: Use `/command` (example: `/balance`)\n• **Hybrid Support**: Both styles available",
-            inline=False
-        )
-        
-        embed.set_footer(text="Use !help <category> to explore specific command groups")
-        
-        await ctx.send(embed=embed)
+        await ctx.send(embed=self.get_catalog().summary)
     
     @commands.command(name='slash')
     async def slash_commands_info(self, ctx):
@@ -635,524 +556,20 @@ class Help(commands.Cog):
         await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="help", description="Get help with specific command categories")
-    @app_commands.describe(category="Command category to get help with")
+    @app_commands.describe(category="Command category or command to get help with")
     async def slash_help(self, interaction: discord.Interaction, category: str = None):
         """Slash command version of help with category-specific information"""
         await interaction.response.defer()
-        
-        if not category:
-            # Show main help menu
-            embed = discord.Embed(
-                title="🍎 Apple Bot Help Menu",
-                description="Choose a category to see detailed commands",
-                color=0x00ff00
-            )
-            
-            categories = [
-                "🆘 Help & Info", "🔨 Moderation", "💰 Economy", "🐾 Pet System",
-                "🎲 Fun & Games", "🎪 Entertainment", "🛠️ Utility Tools", "📌 Sticky Notes",
-                "🔍 Information", "📈 Leveling & XP", "📊 Analytics", "👥 Community",
-                "⚙️ Server Management", "🎁 Events & Giveaways", "👋 Welcome System",
-                "🔗 Invite Tracking", "📝 Logging System", "📋 Applications",
-                "🤝 Affiliates", "💡 Suggestions", "🏆 Leaderboards", "🔔 Notifications",
-                "🛡️ Security", "🤖 Automation"
-            ]
-            
-            category_text = "\n".join([f"• `{cat}`" for cat in categories])
-            embed.add_field(
-                name="Available Categories",
-                value=category_text,
-                inline=False
-            )
-            
-            embed.add_field(
-                name="Usage",
-                value="Use `/help <category>` to see commands in that category\nExample: `/help Economy`",
-                inline=False
-            )
-            
-            await interaction.followup.send(embed=embed)
-            return
-        
-        # Category-specific help with detailed command descriptions
-        category_commands = {
-            "Help & Info": {
-                "commands": ["help", "commands", "about", "features", "support"],
-                "descriptions": {
-                    "help": "Show this help menu or get help with specific categories",
-                    "commands": "Display all available commands organized by category",
-                    "about": "Learn about Apple Bot's features and capabilities",
-                    "features": "View detailed feature overview and command count",
-                    "support": "Get support information and contact details"
-                }
-            },
-            "Moderation": {
-                "commands": ["ban", "unban", "kick", "mute", "unmute", "warn", "warnings", "clearwarnings", "timeout", "untimeout", "purge", "clear", "lock", "unlock", "slowmode", "massban", "lockdown", "unlockdown"],
-                "descriptions": {
-                    "ban": "Ban a user from the server with optional reason",
-                    "unban": "Unban a previously banned user",
-                    "kick": "Kick a user from the server with optional reason",
-                    "mute": "Mute a user to prevent them from speaking",
-                    "unmute": "Unmute a previously muted user",
-                    "warn": "Issue a warning to a user with a reason",
-                    "warnings": "View warnings for a specific user",
-                    "clearwarnings": "Clear all warnings for a user",
-                    "timeout": "Timeout a user for a specified duration",
-                    "untimeout": "Remove timeout from a user",
-                    "purge": "Delete multiple messages at once",
-                    "clear": "Clear messages from current channel",
-                    "lock": "Lock a channel to prevent messages",
-                    "unlock": "Unlock a previously locked channel",
-                    "slowmode": "Set slowmode delay for a channel",
-                    "massban": "Ban multiple users at once",
-                    "lockdown": "Lock down the entire server",
-                    "unlockdown": "Remove server lockdown"
-                }
-            },
-            "Economy": {
-                "commands": ["balance", "daily", "weekly", "work", "rob", "gamble", "shop", "buy", "sell", "inventory", "give", "leaderboard", "coinflip", "slots", "blackjack", "deposit", "withdraw", "bankrob", "crime", "beg", "fish", "hunt", "mine", "chop", "plant"],
-                "descriptions": {
-                    "balance": "Check your current balance and bank account",
-                    "daily": "Claim your daily reward (coins and XP)",
-                    "weekly": "Claim your weekly bonus reward",
-                    "work": "Work at various jobs to earn money",
-                    "rob": "Attempt to rob another user (risky!)",
-                    "gamble": "Gamble your coins with various games",
-                    "shop": "Browse the server shop for items",
-                    "buy": "Purchase items from the shop",
-                    "sell": "Sell items from your inventory",
-                    "inventory": "View your current inventory",
-                    "give": "Give money to another user",
-                    "leaderboard": "View the richest users on the server",
-                    "coinflip": "Flip a coin and bet on the outcome",
-                    "slots": "Play the slot machine for big winnings",
-                    "blackjack": "Play blackjack against the dealer",
-                    "deposit": "Deposit money into your bank account",
-                    "withdraw": "Withdraw money from your bank",
-                    "bankrob": "Attempt to rob the bank (very risky!)",
-                    "crime": "Commit various crimes for money",
-                    "beg": "Beg for money from other users",
-                    "fish": "Go fishing to catch valuable fish",
-                    "hunt": "Hunt animals for meat and materials",
-                    "mine": "Mine for precious gems and materials",
-                    "chop": "Chop wood for building materials",
-                    "plant": "Plant crops for future harvesting"
-                }
-            },
-            "Fun & Games": {
-                "commands": ["dice", "8ball", "joke", "meme", "trivia", "riddle", "truth", "dare", "wouldyourather", "rps", "hangman", "wordle", "tictactoe", "connect4", "snake", "pong", "maze", "quiz", "puzzle", "memory", "reaction", "typing", "math", "geography", "history", "science", "art", "music", "movie", "anime", "pokemon"],
-                "descriptions": {
-                    "dice": "Roll dice with customizable sides and count",
-                    "8ball": "Ask the magic 8-ball a question",
-                    "joke": "Get a random joke to brighten your day",
-                    "meme": "Generate or fetch random memes",
-                    "trivia": "Play trivia games with various categories",
-                    "riddle": "Solve challenging riddles",
-                    "truth": "Get a truth question for truth or dare",
-                    "dare": "Get a dare challenge for truth or dare",
-                    "wouldyourather": "Play would you rather with friends",
-                    "rps": "Play rock paper scissors",
-                    "hangman": "Play the classic hangman word game",
-                    "wordle": "Play Wordle-style word guessing games",
-                    "tictactoe": "Play tic-tac-toe with another user",
-                    "connect4": "Play Connect 4 with another user",
-                    "snake": "Play the classic Snake game",
-                    "pong": "Play Pong with interactive controls",
-                    "maze": "Navigate through challenging mazes",
-                    "quiz": "Take quizzes on various topics",
-                    "puzzle": "Solve word and logic puzzles",
-                    "memory": "Play memory matching games",
-                    "reaction": "Test your reaction time",
-                    "typing": "Practice typing with speed tests",
-                    "math": "Solve math problems and equations",
-                    "geography": "Geography-based trivia and games",
-                    "history": "Historical trivia and timeline games",
-                    "science": "Science facts and quiz games",
-                    "art": "Art appreciation and guessing games",
-                    "music": "Music trivia and rhythm games",
-                    "movie": "Movie trivia and guessing games",
-                    "anime": "Anime trivia and character games",
-                    "pokemon": "Pokemon-themed games and trivia"
-                }
-            },
-            "Pet System": {
-                "commands": ["pet", "feed", "play", "train", "breed", "adopt", "abandon", "petshop", "petbattle", "petrace", "petcare", "petevolution", "pethunting", "petfishing"],
-                "descriptions": {
-                    "pet": "View your current pet and its stats",
-                    "feed": "Feed your pet to keep it healthy",
-                    "play": "Play with your pet to increase happiness",
-                    "train": "Train your pet to improve its abilities",
-                    "breed": "Breed your pet with another user's pet",
-                    "adopt": "Adopt a new pet from the shelter",
-                    "abandon": "Abandon your current pet (irreversible)",
-                    "petshop": "Browse pet shop for items and accessories",
-                    "petbattle": "Battle your pet against others",
-                    "petrace": "Enter your pet in racing competitions",
-                    "petcare": "Provide medical care for your pet",
-                    "petevolution": "Evolve your pet to new forms",
-                    "pethunting": "Take your pet hunting for resources",
-                    "petfishing": "Go fishing with your pet companion"
-                }
-            },
-            "Entertainment": {
-                "commands": ["music", "playlist", "queue", "skip", "pause", "resume", "volume", "lyrics", "radio", "spotify", "youtube", "soundcloud"],
-                "descriptions": {
-                    "music": "Play music from various sources",
-                    "playlist": "Manage your music playlists",
-                    "queue": "View the current music queue",
-                    "skip": "Skip the current song",
-                    "pause": "Pause the current song",
-                    "resume": "Resume paused music",
-                    "volume": "Adjust music volume",
-                    "lyrics": "Display lyrics for current song",
-                    "radio": "Play internet radio stations",
-                    "spotify": "Connect and play from Spotify",
-                    "youtube": "Play music from YouTube",
-                    "soundcloud": "Play music from SoundCloud"
-                }
-            },
-            "Utility Tools": {
-                "commands": ["calculator", "weather", "translate", "timezone", "reminder", "timer", "stopwatch", "qr", "shorturl", "color", "base64", "hash", "password", "random", "choose", "poll", "vote", "search", "wikipedia", "urban", "define", "synonym", "antonym"],
-                "descriptions": {
-                    "calculator": "Perform mathematical calculations",
-                    "weather": "Get weather information for any location",
-                    "translate": "Translate text between languages",
-                    "timezone": "Convert time between timezones",
-                    "reminder": "Set reminders for future events",
-                    "timer": "Start a countdown timer",
-                    "stopwatch": "Use a stopwatch for timing",
-                    "qr": "Generate QR codes for text or URLs",
-                    "shorturl": "Create shortened URLs",
-                    "color": "Generate and display colors",
-                    "base64": "Encode/decode base64 text",
-                    "hash": "Generate hash values for text",
-                    "password": "Generate secure passwords",
-                    "random": "Generate random numbers",
-                    "choose": "Choose randomly from options",
-                    "poll": "Create polls for voting",
-                    "vote": "Vote on existing polls",
-                    "search": "Search the internet",
-                    "wikipedia": "Search Wikipedia articles",
-                    "urban": "Look up Urban Dictionary definitions",
-                    "define": "Get dictionary definitions",
-                    "synonym": "Find synonyms for words",
-                    "antonym": "Find antonyms for words"
-                }
-            },
-            "Sticky Notes": {
-                "commands": ["stickynote", "notes", "addnote", "removenote", "editnote", "listnotes", "pinnote", "unpinnote"],
-                "descriptions": {
-                    "stickynote": "Main sticky notes command and help",
-                    "notes": "View all your sticky notes",
-                    "addnote": "Add a new sticky note",
-                    "removenote": "Remove an existing sticky note",
-                    "editnote": "Edit an existing sticky note",
-                    "listnotes": "List all notes in the server",
-                    "pinnote": "Pin a note to make it persistent",
-                    "unpinnote": "Unpin a previously pinned note"
-                }
-            },
-            "Information": {
-                "commands": ["userinfo", "serverinfo", "channelinfo", "roleinfo", "botinfo", "avatar", "banner", "membercount", "onlinecount", "created", "joined", "permissions", "roles", "channels", "emojis", "boosters", "invites"],
-                "descriptions": {
-                    "userinfo": "Get detailed information about a user",
-                    "serverinfo": "Get detailed information about the server",
-                    "channelinfo": "Get information about a channel",
-                    "roleinfo": "Get information about a role",
-                    "botinfo": "Get information about the bot",
-                    "avatar": "Display user's avatar",
-                    "banner": "Display user's banner",
-                    "membercount": "Show server member count",
-                    "onlinecount": "Show online member count",
-                    "created": "Show when account was created",
-                    "joined": "Show when user joined server",
-                    "permissions": "Check user permissions",
-                    "roles": "List all server roles",
-                    "channels": "List all server channels",
-                    "emojis": "List all server emojis",
-                    "boosters": "List server boosters",
-                    "invites": "Show server invite information"
-                }
-            },
-            "Leveling & XP": {
-                "commands": ["level", "rank", "xp", "leaderboard", "setlevel", "addxp", "removexp", "resetlevels", "levelroles", "xpmultiplier"],
-                "descriptions": {
-                    "level": "Check your current level",
-                    "rank": "View your server rank",
-                    "xp": "Check your experience points",
-                    "leaderboard": "View XP leaderboard",
-                    "setlevel": "Set a user's level (admin)",
-                    "addxp": "Add XP to a user (admin)",
-                    "removexp": "Remove XP from a user (admin)",
-                    "resetlevels": "Reset all levels (admin)",
-                    "levelroles": "Configure level-based roles",
-                    "xpmultiplier": "Set XP multiplier rates"
-                }
-            },
-            "Analytics": {
-                "commands": ["stats", "activity", "growth", "engagement", "popular", "trends", "insights", "reports", "metrics", "dashboard", "charts", "graphs"],
-                "descriptions": {
-                    "stats": "View server statistics",
-                    "activity": "View server activity metrics",
-                    "growth": "View member growth statistics",
-                    "engagement": "View engagement metrics",
-                    "popular": "View most popular content",
-                    "trends": "View trending topics",
-                    "insights": "Get server insights",
-                    "reports": "Generate detailed reports",
-                    "metrics": "View key performance metrics",
-                    "dashboard": "View analytics dashboard",
-                    "charts": "Generate statistical charts",
-                    "graphs": "Generate data graphs"
-                }
-            },
-            "Community": {
-                "commands": ["events", "calendar", "meetup", "group", "club", "team", "project", "collaboration", "discussion", "forum", "thread", "topic", "announcement", "news", "newsletter"],
-                "descriptions": {
-                    "events": "Create and manage events",
-                    "calendar": "View community calendar",
-                    "meetup": "Organize meetups",
-                    "group": "Create and manage groups",
-                    "club": "Join or create clubs",
-                    "team": "Form teams for projects",
-                    "project": "Manage community projects",
-                    "collaboration": "Facilitate collaboration",
-                    "discussion": "Start discussions",
-                    "forum": "Access forum features",
-                    "thread": "Create discussion threads",
-                    "topic": "Suggest discussion topics",
-                    "announcement": "Make announcements",
-                    "news": "Share community news",
-                    "newsletter": "Manage newsletters"
-                }
-            },
-            "Server Management": {
-                "commands": ["setup", "config", "settings", "prefix", "automod", "welcome", "goodbye", "autorole", "autoban", "verification", "captcha", "antispam", "antiraid", "backup", "restore", "export", "import", "reset"],
-                "descriptions": {
-                    "setup": "Initial server setup wizard",
-                    "config": "Configure server settings",
-                    "settings": "View and modify settings",
-                    "prefix": "Change command prefix",
-                    "automod": "Configure auto-moderation",
-                    "welcome": "Set up welcome messages",
-                    "goodbye": "Set up goodbye messages",
-                    "autorole": "Configure automatic roles",
-                    "autoban": "Set up automatic banning",
-                    "verification": "Configure member verification",
-                    "captcha": "Set up captcha verification",
-                    "antispam": "Configure anti-spam settings",
-                    "antiraid": "Configure anti-raid protection",
-                    "backup": "Create server backups",
-                    "restore": "Restore from backup",
-                    "export": "Export server data",
-                    "import": "Import server data",
-                    "reset": "Reset server settings"
-                }
-            },
-            "Events & Giveaways": {
-                "commands": ["giveaway", "gcreate", "gend", "greroll", "gedit", "glist", "event", "eventcreate", "eventend", "eventlist", "rsvp", "attend"],
-                "descriptions": {
-                    "giveaway": "Main giveaway command",
-                    "gcreate": "Create a new giveaway",
-                    "gend": "End a giveaway early",
-                    "greroll": "Reroll giveaway winner",
-                    "gedit": "Edit existing giveaway",
-                    "glist": "List all active giveaways",
-                    "event": "Main events command",
-                    "eventcreate": "Create a new event",
-                    "eventend": "End an event",
-                    "eventlist": "List all events",
-                    "rsvp": "RSVP to an event",
-                    "attend": "Mark attendance at event"
-                }
-            },
-            "Welcome System": {
-                "commands": ["welcomeset", "welcomemsg", "welcomechannel", "welcomerole", "welcomeimage", "goodbyemsg", "goodbyechannel", "autorole"],
-                "descriptions": {
-                    "welcomeset": "Set up welcome system",
-                    "welcomemsg": "Configure welcome message",
-                    "welcomechannel": "Set welcome channel",
-                    "welcomerole": "Set welcome role",
-                    "welcomeimage": "Set welcome image",
-                    "goodbyemsg": "Configure goodbye message",
-                    "goodbyechannel": "Set goodbye channel",
-                    "autorole": "Configure automatic roles"
-                }
-            },
-            "Invite Tracking": {
-                "commands": ["invites", "inviteinfo", "inviteleaderboard", "invitereward", "inviterank", "createinvite", "deleteinvite", "trackinvites"],
-                "descriptions": {
-                    "invites": "Check invite count",
-                    "inviteinfo": "Get invite information",
-                    "inviteleaderboard": "View invite leaderboard",
-                    "invitereward": "Configure invite rewards",
-                    "inviterank": "Check invite rank",
-                    "createinvite": "Create server invite",
-                    "deleteinvite": "Delete server invite",
-                    "trackinvites": "Enable invite tracking"
-                }
-            },
-            "Logging System": {
-                "commands": ["logset", "logchannel", "logevents", "logview", "logclear", "auditlog", "modlog", "messagelog", "joinlog", "voicelog"],
-                "descriptions": {
-                    "logset": "Set up logging system",
-                    "logchannel": "Configure log channel",
-                    "logevents": "Configure logged events",
-                    "logview": "View recent logs",
-                    "logclear": "Clear log history",
-                    "auditlog": "View audit logs",
-                    "modlog": "View moderation logs",
-                    "messagelog": "View message logs",
-                    "joinlog": "View join/leave logs",
-                    "voicelog": "View voice activity logs"
-                }
-            },
-            "Applications": {
-                "commands": ["apply", "application", "applist", "appaccept", "appdeny", "appview", "apptemplate", "appsetup"],
-                "descriptions": {
-                    "apply": "Submit an application",
-                    "application": "View application status",
-                    "applist": "List all applications",
-                    "appaccept": "Accept an application",
-                    "appdeny": "Deny an application",
-                    "appview": "View application details",
-                    "apptemplate": "Manage application templates",
-                    "appsetup": "Set up application system"
-                }
-            },
-            "Affiliates": {
-                "commands": ["affiliate", "addaffiliate", "removeaffiliate", "affiliatelist", "partnership", "sponsor", "collab"],
-                "descriptions": {
-                    "affiliate": "Main affiliate command",
-                    "addaffiliate": "Add new affiliate",
-                    "removeaffiliate": "Remove affiliate",
-                    "affiliatelist": "List all affiliates",
-                    "partnership": "Manage partnerships",
-                    "sponsor": "Manage sponsorships",
-                    "collab": "Manage collaborations"
-                }
-            },
-            "Suggestions": {
-                "commands": ["suggest", "suggestions", "suggestapprove", "suggestdeny", "suggeststats"],
-                "descriptions": {
-                    "suggest": "Submit a suggestion",
-                    "suggestions": "View all suggestions",
-                    "suggestapprove": "Approve a suggestion",
-                    "suggestdeny": "Deny a suggestion",
-                    "suggeststats": "View suggestion statistics"
-                }
-            },
-            "Leaderboards": {
-                "commands": ["economyleaderboard", "xpboard", "petleaderboard", "topleaderboards"],
-                "descriptions": {
-                    "economyleaderboard": "View economy leaderboard",
-                    "xpboard": "View XP leaderboard",
-                    "petleaderboard": "View pet leaderboard",
-                    "topleaderboards": "View all leaderboards"
-                }
-            },
-            "Notifications": {
-                "commands": ["notify", "notifications", "subscribe", "unsubscribe", "alerts", "reminder", "broadcast", "announcement", "ping"],
-                "descriptions": {
-                    "notify": "Send notifications",
-                    "notifications": "Manage notifications",
-                    "subscribe": "Subscribe to notifications",
-                    "unsubscribe": "Unsubscribe from notifications",
-                    "alerts": "Configure alert settings",
-                    "reminder": "Set reminders",
-                    "broadcast": "Send broadcasts",
-                    "announcement": "Make announcements",
-                    "ping": "Ping users or roles"
-                }
-            },
-            "Security": {
-                "commands": ["whitelist", "blacklist", "raidmode", "securitylog", "reports", "suspicious", "antinuke"],
-                "descriptions": {
-                    "whitelist": "Manage server whitelist",
-                    "blacklist": "Manage server blacklist",
-                    "raidmode": "Enable raid protection mode",
-                    "securitylog": "View security logs",
-                    "reports": "View security reports",
-                    "suspicious": "Check suspicious activity",
-                    "antinuke": "Configure anti-nuke protection"
-                }
-            },
-            "Automation": {
-                "commands": ["autoresponder", "automod", "scheduler", "triggers", "reactions", "autoroles", "autodelete", "autopurge", "autokick", "autoban", "antilink", "antispam", "keyword_filter", "message_filter", "auto_backup"],
-                "descriptions": {
-                    "autoresponder": "Set up automatic responses",
-                    "automod": "Configure auto-moderation",
-                    "scheduler": "Schedule automated tasks",
-                    "triggers": "Set up command triggers",
-                    "reactions": "Configure auto-reactions",
-                    "autoroles": "Set up automatic roles",
-                    "autodelete": "Configure auto-deletion",
-                    "autopurge": "Set up auto-purging",
-                    "autokick": "Configure auto-kicking",
-                    "autoban": "Set up auto-banning",
-                    "antilink": "Configure anti-link filter",
-                    "antispam": "Set up anti-spam system",
-                    "keyword_filter": "Configure keyword filtering",
-                    "message_filter": "Set up message filtering",
-                    "auto_backup": "Configure automatic backups"
-                }
-            }
-        }
-        
-        # Normalize category name for matching
-        normalized_category = category
-        # Remove all emoji prefixes
-        emoji_prefixes = ["🆘 ", "🔨 ", "💰 ", "🐾 ", "🎲 ", "🎪 ", "🛠️ ", "📌 ", "🔍 ", "📈 ", "📊 ", "👥 ", "⚙️ ", "🎁 ", "👋 ", "🔗 ", "📝 ", "📋 ", "🤝 ", "💡 ", "🏆 ", "🔔 ", "🛡️ ", "🤖 "]
-        for prefix in emoji_prefixes:
-            normalized_category = normalized_category.replace(prefix, "")
-        
-        # Handle alternative category name mappings and check for matches
-        if normalized_category in category_commands:
-            # Direct match found
-            category_data = category_commands[normalized_category]
-            embed = discord.Embed(
-                title=f"🍎 {category} Commands",
-                description=f"**{len(category_data['commands'])} commands** available in this category",
-                color=0x00ff00
-            )
-            
-            # Add commands with descriptions
-            commands_text = ""
-            for cmd in category_data['commands']:
-                desc = category_data['descriptions'].get(cmd, "No description available")
-                commands_text += f"`!{cmd}` - {desc}\n"
-            
-            # Split into multiple fields if too long
-            if len(commands_text) > 1000:
-                commands_list = commands_text.split('\n')
-                mid_point = len(commands_list) // 2
-                
-                embed.add_field(
-                    name="Commands (Part 1)",
-                    value='\n'.join(commands_list[:mid_point]),
-                    inline=False
-                )
-                embed.add_field(
-                    name="Commands (Part 2)", 
-                    value='\n'.join(commands_list[mid_point:]),
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name="Available Commands",
-                    value=commands_text,
-                    inline=False
-                )
-            
-            embed.set_footer(text="Use !<command> to execute • Example: !balance")
-        else:
-            embed = discord.Embed(
-                title="❌ Category Not Found",
-                description=f"The category `{category}` was not found.\n\nUse `/help` without arguments to see all available categories.",
-                color=0xff0000
-            )
-        
-        await interaction.followup.send(embed=embed)
+        await self.send_pages(interaction.followup.send, interaction.user.id, self.lookup(category, "/help"))
+    
+    @help_command.autocomplete('category')
+    @slash_help.autocomplete('category')
+    async def help_autocomplete(self, interaction: discord.Interaction, current: str):
+        catalog = self.get_catalog()
+        return [
+            app_commands.Choice(name=catalog.label(target)[:100], value=target[1][:100])
+            for target in catalog.search(current, limit=25)
+        ]
 
     @commands.command(name="cmdlist")
     async def commands_list(self, ctx):
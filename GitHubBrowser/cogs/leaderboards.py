@@ -1,22 +1,234 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
-from datetime import datetime
+import os
+from datetime import datetime, timedelta, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows shown per leaderboard page
+LEADERBOARD_PAGE_SIZE = 10
+
+# Pet leaderboard categories mapped to the pets column (or expression) they rank by.
+# The pets table has no fame column, so fame is the experience pets earn from care and training.
+PET_CATEGORY_SCORES = {
+    'fame': 'experience',
+    'battles': '(battles_won + battles_lost)',
+    'level': 'level',
+    'wins': 'battles_won'
+}
+
+# Composite indexes backing the ORDER BY ... LIMIT queries below
+LEADERBOARD_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_economy_guild_balance ON economy (guild_id, balance DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_users_xp ON users (xp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_pets_guild_experience ON pets (guild_id, experience DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_pets_guild_level ON pets (guild_id, level DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_pets_guild_wins ON pets (guild_id, battles_won DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_pets_guild_battles ON pets (guild_id, (battles_won + battles_lost) DESC)"
+]
+
+# How old a leaderboard snapshot may get before it is refreshed
+SNAPSHOT_STALENESS = timedelta(seconds=int(os.getenv('LEADERBOARD_STALENESS_SECONDS', '300')))
+
+# Rows kept per board in each guild's snapshot
+SNAPSHOT_DEPTH = 3
+
+# Guilds stop being refreshed once nobody has viewed their overview for this long
+SNAPSHOT_IDLE_TIMEOUT = timedelta(hours=1)
+
+# Each statement materializes one board; $1 = guild_id, $2 = refreshed_at, $3 = depth
+SNAPSHOT_QUERIES = {
+    'economy': """
+        INSERT INTO leaderboard_snapshots (guild_id, board, rank, user_id, score, label, refreshed_at)
+        SELECT $1, 'economy', ROW_NUMBER() OVER (ORDER BY balance DESC, user_id), user_id, balance, NULL, $2
+        FROM economy WHERE guild_id = $1 AND balance > 0
+        ORDER BY balance DESC, user_id LIMIT $3
+    """,
+    'xp': """
+        INSERT INTO leaderboard_snapshots (guild_id, board, rank, user_id, score, label, refreshed_at)
+        SELECT $1, 'xp', ROW_NUMBER() OVER (ORDER BY xp DESC, user_id), user_id, xp, level::TEXT, $2
+        FROM users WHERE user_id = ANY($4::BIGINT[]) AND xp > 0
+        ORDER BY xp DESC, user_id LIMIT $3
+    """,
+    'pets': """
+        INSERT INTO leaderboard_snapshots (guild_id, board, rank, user_id, score, label, refreshed_at)
+        SELECT $1, 'pets', ROW_NUMBER() OVER (ORDER BY experience DESC, user_id), user_id, experience, pet_name, $2
+        FROM pets WHERE guild_id = $1 AND experience > 0
+        ORDER BY experience DESC, user_id LIMIT $3
+    """
+}
+
 class Leaderboards(commands.Cog):
     """Advanced leaderboard system for economy, XP, and pet rankings"""
     
     def __init__(self, bot):
         self.bot = bot
+        # Guilds whose overview was viewed recently: {guild_id: last_viewed}
+        self.snapshot_guilds = {}
+        # Snapshot refresh times: {guild_id: refreshed_at}
+        self.snapshot_refreshed = {}
+        self.refresh_snapshots.start()
+    
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.refresh_snapshots.cancel()
+    
+    async def create_leaderboard_indexes(self):
+        """Create indexes and the snapshot table used by the leaderboards"""
+        if not self.bot.db_pool:
+            return
+        async with self.bot.db_pool.acquire() as conn:
+            try:
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+                        guild_id BIGINT NOT NULL,
+                        board VARCHAR(20) NOT NULL,
+                        rank INTEGER NOT NULL,
+                        user_id BIGINT NOT NULL,
+                        score BIGINT NOT NULL,
+                        label TEXT,
+                        refreshed_at TIMESTAMP NOT NULL,
+                        PRIMARY KEY (guild_id, board, rank)
+                    )
+                """)
+            except Exception as e:
+                logger.error(f"Database error creating leaderboard snapshot table: {e}")
+            
+            for statement in LEADERBOARD_INDEXES:
+                try:
+                    await conn.execute(statement)
+                except Exception as e:
+                    logger.error(f"Database error creating leaderboard index: {e}")
+    
+    async def refresh_guild_snapshot(self, guild):
+        """Rebuild one guild's leaderboard snapshot in a single transaction"""
+        refreshed_at = datetime.utcnow()
+        async with self.bot.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("DELETE FROM leaderboard_snapshots WHERE guild_id = $1", guild.id)
+                for board, query in SNAPSHOT_QUERIES.items():
+                    args = [guild.id, refreshed_at, SNAPSHOT_DEPTH]
+                    if board == 'xp':
+                        args.append(self.get_member_ids(guild))
+                    # A board whose source table is missing should not block the others
+                    try:
+                        async with conn.transaction():
+                            await conn.execute(query, *args)
+                    except Exception as e:
+                        logger.error(f"Database error snapshotting {board} leaderboard: {e}")
+        self.snapshot_refreshed[guild.id] = refreshed_at
+    
+    async def get_guild_snapshot(self, guild):
+        """Read a guild's snapshot rows, building it on first use"""
+        self.snapshot_guilds[guild.id] = datetime.utcnow()
+        if guild.id not in self.snapshot_refreshed:
+            await self.refresh_guild_snapshot(guild)
+        
+        async with self.bot.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT board, rank, user_id, score, label, refreshed_at
+                FROM leaderboard_snapshots WHERE guild_id = $1
+                ORDER BY board, rank
+            """, guild.id)
+        
+        boards = {}
+        for row in rows:
+            boards.setdefault(row['board'], []).append(row)
+        return boards, self.snapshot_refreshed.get(guild.id)
+    
+    @tasks.loop(minutes=1)
+    async def refresh_snapshots(self):
+        """Refresh stale snapshots for guilds that are actively viewing them"""
+        if not self.bot.db_pool:
+            return
+        now = datetime.utcnow()
+        for guild_id, last_viewed in list(self.snapshot_guilds.items()):
+            if now - last_viewed > SNAPSHOT_IDLE_TIMEOUT:
+                self.snapshot_guilds.pop(guild_id, None)
+                continue
+            refreshed_at = self.snapshot_refreshed.get(guild_id)
+            if refreshed_at and now - refreshed_at < SNAPSHOT_STALENESS:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                self.snapshot_guilds.pop(guild_id, None)
+                continue
+            try:
+                await self.refresh_guild_snapshot(guild)
+            except Exception as e:
+                logger.error(f"Error refreshing leaderboard snapshot for guild {guild_id}: {e}")
+    
+    @refresh_snapshots.before_loop
+    async def before_refresh_snapshots(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
+    
+    async def fetch_ranked_page(self, table, where, score, args, user_id, page,
+                                extra_columns="", extra_aggregates=""):
+        """Fetch one leaderboard page, totals and the caller's rank from Postgres
+        
+        ``where`` and ``score`` are trusted SQL fragments; ``args`` fill the
+        placeholders used in ``where``. Returns None when nothing is ranked.
+        """
+        filter_sql = f"{where} AND {score} > 0"
+        limit_arg = len(args) + 1
+        
+        async with self.bot.db_pool.acquire() as conn:
+            stats = await conn.fetchrow(f"""
+                SELECT COUNT(*) AS total, COALESCE(SUM({score}), 0) AS total_score{extra_aggregates}
+                FROM {table} WHERE {filter_sql}
+            """, *args)
+            
+            if not stats or not stats['total']:
+                return None
+            
+            total_pages = (stats['total'] + LEADERBOARD_PAGE_SIZE - 1) // LEADERBOARD_PAGE_SIZE
+            page = max(1, min(page, total_pages))
+            
+            rows = await conn.fetch(f"""
+                SELECT user_id, {score} AS score{extra_columns}
+                FROM {table} WHERE {filter_sql}
+                ORDER BY {score} DESC, user_id
+                LIMIT ${limit_arg} OFFSET ${limit_arg + 1}
+            """, *args, LEADERBOARD_PAGE_SIZE, (page - 1) * LEADERBOARD_PAGE_SIZE)
+            
+            user_rank = await conn.fetchval(f"""
+                SELECT MIN(rank) FROM (
+                    SELECT user_id, RANK() OVER (ORDER BY {score} DESC) AS rank
+                    FROM {table} WHERE {filter_sql}
+                ) ranked
+                WHERE user_id = ${limit_arg}
+            """, *args, user_id)
+        
+        return {
+            'rows': rows,
+            'stats': stats,
+            'page': page,
+            'total_pages': total_pages,
+            'start_idx': (page - 1) * LEADERBOARD_PAGE_SIZE,
+            'user_rank': user_rank
+        }
+    
+    def get_display_name(self, guild, user_id):
+        """Resolve a display name from the member/user cache without API calls"""
+        member = guild.get_member(user_id) or self.bot.get_user(user_id)
+        return member.display_name if member else f"User {user_id}"
+    
+    def get_medal(self, rank):
+        """Medal emojis for the top 3, rank number otherwise"""
+        return {1: "🥇", 2: "🥈", 3: "🥉"}.get(rank, f"#{rank}")
+    
+    def get_member_ids(self, guild):
+        """IDs of the guild's human members, used to scope the global users table"""
+        return [member.id for member in guild.members if not member.bot]
     
     @commands.command(name='econlb', aliases=['economylb', 'moneylb'])
     async def economy_leaderboard(self, ctx, page: int = 1):
         """Display economy leaderboard with top earners"""
-        if not hasattr(self.bot, 'user_data'):
+        if not self.bot.db_pool:
             embed = discord.Embed(
                 title="💰 Economy Leaderboard",
                 description="No economy data available yet. Start earning coins with economy commands!",
@@ -25,19 +237,16 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Filter and sort users by balance for this guild
-        guild_users = []
-        for user_id, data in self.bot.user_data.items():
-            if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                balance = data.get('balance', 0)
-                if balance > 0:
-                    guild_users.append({
-                        'user_id': user_id,
-                        'balance': balance,
-                        'username': data.get('username', 'Unknown User')
-                    })
-        
-        if not guild_users:
+        try:
+            result = await self.fetch_ranked_page(
+                "economy", "guild_id = $1", "balance", [ctx.guild.id], ctx.author.id, page
+            )
+        except Exception as e:
+            logger.error(f"Database error loading economy leaderboard: {e}")
+            await ctx.send("❌ Error loading leaderboard!")
+            return
+        
+        if not result:
             embed = discord.Embed(
                 title="💰 Economy Leaderboard",
                 description="No users with coins found. Start using economy commands to appear here!",
@@ -46,65 +255,38 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Sort by balance (highest first)
-        guild_users.sort(key=lambda x: x['balance'], reverse=True)
-        
-        # Pagination
-        per_page = 10
-        total_pages = (len(guild_users) + per_page - 1) // per_page
-        page = max(1, min(page, total_pages))
-        
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        page_users = guild_users[start_idx:end_idx]
-        
         embed = discord.Embed(
-            title=f"💰 Economy Leaderboard - Page {page}/{total_pages}",
+            title=f"💰 Economy Leaderboard - Page {result['page']}/{result['total_pages']}",
             description=f"Top earners in {ctx.guild.name}",
             color=0xf1c40f,
             timestamp=datetime.now()
         )
         
         leaderboard_text = ""
-        for i, user_data in enumerate(page_users):
-            rank = start_idx + i + 1
-            
-            # Medal emojis for top 3
-            if rank == 1:
-                medal = "🥇"
-            elif rank == 2:
-                medal = "🥈"
-            elif rank == 3:
-                medal = "🥉"
-            else:
-                medal = f"#{rank}"
-            
-            try:
-                user = await self.bot.fetch_user(user_data['user_id'])
-                display_name = user.display_name
-            except:
-                display_name = user_data['username']
-            
-            balance = user_data['balance']
-            leaderboard_text += f"{medal} **{display_name}** - {balance:,} coins\n"
+        for i, row in enumerate(result['rows']):
+            medal = self.get_medal(result['start_idx'] + i + 1)
+            display_name = self.get_display_name(ctx.guild, row['user_id'])
+            leaderboard_text += f"{medal} **{display_name}** - {row['score']:,} coins\n"
         
         embed.add_field(name="Rankings", value=leaderboard_text, inline=False)
-        embed.set_footer(text=f"Total: {len(guild_users)} users • Use !econlb <page> to navigate")
+        embed.set_footer(text=f"Total: {result['stats']['total']} users • Use !econlb <page> to navigate")
         
         # Add stats
-        if guild_users:
-            total_economy = sum(user['balance'] for user in guild_users)
-            average_balance = total_economy // len(guild_users)
-            embed.add_field(name="📊 Server Stats", 
-                          value=f"**Total Economy:** {total_economy:,} coins\n**Average Balance:** {average_balance:,} coins", 
-                          inline=True)
+        total_economy = result['stats']['total_score']
+        average_balance = total_economy // result['stats']['total']
+        embed.add_field(name="📊 Server Stats", 
+                      value=f"**Total Economy:** {total_economy:,} coins\n**Average Balance:** {average_balance:,} coins", 
+                      inline=True)
+        
+        if result['user_rank']:
+            embed.add_field(name="📍 Your Rank", value=f"#{result['user_rank']}", inline=True)
         
         await ctx.send(embed=embed)
     
     @commands.command(name='xpboard', aliases=['levelboard'])
     async def xp_leaderboard(self, ctx, page: int = 1):
         """Display XP leaderboard with top leveled users"""
-        if not hasattr(self.bot, 'user_data'):
+        if not self.bot.db_pool:
             embed = discord.Embed(
                 title="⭐ XP Leaderboard",
                 description="No XP data available yet. Start chatting to gain XP!",
@@ -113,21 +295,18 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Filter and sort users by XP for this guild
-        guild_users = []
-        for user_id, data in self.bot.user_data.items():
-            if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                xp = data.get('xp', 0)
-                level = data.get('level', 1)
-                if xp > 0:
-                    guild_users.append({
-                        'user_id': user_id,
-                        'xp': xp,
-                        'level': level,
-                        'username': data.get('username', 'Unknown User')
-                    })
-        
-        if not guild_users:
+        try:
+            result = await self.fetch_ranked_page(
+                "users", "user_id = ANY($1::BIGINT[])", "xp", [self.get_member_ids(ctx.guild)],
+                ctx.author.id, page,
+                extra_columns=", level", extra_aggregates=", COALESCE(SUM(level), 0) AS total_level"
+            )
+        except Exception as e:
+            logger.error(f"Database error loading XP leaderboard: {e}")
+            await ctx.send("❌ Error loading leaderboard!")
+            return
+        
+        if not result:
             embed = discord.Embed(
                 title="⭐ XP Leaderboard",
                 description="No users with XP found. Start chatting to appear here!",
@@ -136,59 +315,31 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Sort by XP (highest first)
-        guild_users.sort(key=lambda x: x['xp'], reverse=True)
-        
-        # Pagination
-        per_page = 10
-        total_pages = (len(guild_users) + per_page - 1) // per_page
-        page = max(1, min(page, total_pages))
-        
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        page_users = guild_users[start_idx:end_idx]
-        
         embed = discord.Embed(
-            title=f"⭐ XP Leaderboard - Page {page}/{total_pages}",
+            title=f"⭐ XP Leaderboard - Page {result['page']}/{result['total_pages']}",
             description=f"Top leveled users in {ctx.guild.name}",
             color=0x9b59b6,
             timestamp=datetime.now()
         )
         
         leaderboard_text = ""
-        for i, user_data in enumerate(page_users):
-            rank = start_idx + i + 1
-            
-            # Medal emojis for top 3
-            if rank == 1:
-                medal = "🥇"
-            elif rank == 2:
-                medal = "🥈"
-            elif rank == 3:
-                medal = "🥉"
-            else:
-                medal = f"#{rank}"
-            
-            try:
-                user = await self.bot.fetch_user(user_data['user_id'])
-                display_name = user.display_name
-            except:
-                display_name = user_data['username']
-            
-            xp = user_data['xp']
-            level = user_data['level']
-            leaderboard_text += f"{medal} **{display_name}** - Level {level} ({xp:,} XP)\n"
+        for i, row in enumerate(result['rows']):
+            medal = self.get_medal(result['start_idx'] + i + 1)
+            display_name = self.get_display_name(ctx.guild, row['user_id'])
+            leaderboard_text += f"{medal} **{display_name}** - Level {row['level']} ({row['score']:,} XP)\n"
         
         embed.add_field(name="Rankings", value=leaderboard_text, inline=False)
-        embed.set_footer(text=f"Total: {len(guild_users)} users • Use !xpboard <page> to navigate")
+        embed.set_footer(text=f"Total: {result['stats']['total']} users • Use !xpboard <page> to navigate")
         
         # Add stats
-        if guild_users:
-            total_xp = sum(user['xp'] for user in guild_users)
-            average_level = sum(user['level'] for user in guild_users) // len(guild_users)
-            embed.add_field(name="📊 Server Stats", 
-                          value=f"**Total XP:** {total_xp:,}\n**Average Level:** {average_level}", 
-                          inline=True)
+        total_xp = result['stats']['total_score']
+        average_level = result['stats']['total_level'] // result['stats']['total']
+        embed.add_field(name="📊 Server Stats", 
+                      value=f"**Total XP:** {total_xp:,}\n**Average Level:** {average_level}", 
+                      inline=True)
+        
+        if result['user_rank']:
+            embed.add_field(name="📍 Your Rank", value=f"#{result['user_rank']}", inline=True)
         
         await ctx.send(embed=embed)
     
@@ -205,7 +356,7 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        if not hasattr(self.bot, 'user_data'):
+        if not self.bot.db_pool:
             embed = discord.Embed(
                 title="🐾 Pet Leaderboard",
                 description="No pet data available yet. Get a pet with `!pet adopt` to start!",
@@ -214,36 +365,21 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Filter and sort users by pet stats for this guild
-        guild_users = []
         category = category.lower()
         
-        for user_id, data in self.bot.user_data.items():
-            if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                pet_data = data.get('pet', {})
-                if pet_data:
-                    if category == 'fame':
-                        value = pet_data.get('fame', 0)
-                    elif category == 'battles':
-                        value = pet_data.get('battles_won', 0) + pet_data.get('battles_lost', 0)
-                    elif category == 'level':
-                        value = pet_data.get('level', 1)
-                    elif category == 'wins':
-                        value = pet_data.get('battles_won', 0)
-                    else:
-                        value = 0
-                    
-                    if value > 0:
-                        guild_users.append({
-                            'user_id': user_id,
-                            'value': value,
-                            'pet_name': pet_data.get('name', 'Unnamed Pet'),
-                            'pet_type': pet_data.get('type', 'Unknown'),
-                            'username': data.get('username', 'Unknown User'),
-                            'pet_data': pet_data
-                        })
-        
-        if not guild_users:
+        try:
+            result = await self.fetch_ranked_page(
+                "pets", "guild_id = $1", PET_CATEGORY_SCORES[category], [ctx.guild.id],
+                ctx.author.id, page,
+                extra_columns=", pet_name, pet_type",
+                extra_aggregates=", COALESCE(SUM(battles_won), 0) AS total_wins, COALESCE(SUM(battles_lost), 0) AS total_losses"
+            )
+        except Exception as e:
+            logger.error(f"Database error loading pet leaderboard: {e}")
+            await ctx.send("❌ Error loading leaderboard!")
+            return
+        
+        if not result:
             embed = discord.Embed(
                 title="🐾 Pet Leaderboard",
                 description=f"No pets with {category} data found. Start using pet commands to appear here!",
@@ -252,18 +388,6 @@ class Leaderboards(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Sort by value (highest first)
-        guild_users.sort(key=lambda x: x['value'], reverse=True)
-        
-        # Pagination
-        per_page = 10
-        total_pages = (len(guild_users) + per_page - 1) // per_page
-        page = max(1, min(page, total_pages))
-        
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        page_users = guild_users[start_idx:end_idx]
-        
         # Category specific emojis and colors
         category_info = {
             'fame': {'emoji': '⭐', 'color': 0xf39c12, 'unit': 'fame'},
@@ -275,61 +399,45 @@ class Leaderboards(commands.Cog):
         info = category_info[category]
         
         embed = discord.Embed(
-            title=f"{info['emoji']} Pet {category.title()} Leaderboard - Page {page}/{total_pages}",
+            title=f"{info['emoji']} Pet {category.title()} Leaderboard - Page {result['page']}/{result['total_pages']}",
             description=f"Top pets by {category} in {ctx.guild.name}",
             color=info['color'],
             timestamp=datetime.now()
         )
         
         leaderboard_text = ""
-        for i, user_data in enumerate(page_users):
-            rank = start_idx + i + 1
-            
-            # Medal emojis for top 3
-            if rank == 1:
-                medal = "🥇"
-            elif rank == 2:
-                medal = "🥈"
-            elif rank == 3:
-                medal = "🥉"
-            else:
-                medal = f"#{rank}"
-            
-            try:
-                user = await self.bot.fetch_user(user_data['user_id'])
-                display_name = user.display_name
-            except:
-                display_name = user_data['username']
-            
-            value = user_data['value']
-            pet_name = user_data['pet_name']
-            pet_type = user_data['pet_type']
+        for i, row in enumerate(result['rows']):
+            medal = self.get_medal(result['start_idx'] + i + 1)
+            display_name = self.get_display_name(ctx.guild, row['user_id'])
+            value = row['score']
             
             if category == 'level':
                 display_value = f"Level {value}"
             else:
                 display_value = f"{value:,} {info['unit']}"
             
-            leaderboard_text += f"{medal} **{pet_name}** ({pet_type}) - {display_value}\n└ Owner: {display_name}\n"
+            leaderboard_text += f"{medal} **{row['pet_name']}** ({row['pet_type']}) - {display_value}\n└ Owner: {display_name}\n"
         
         embed.add_field(name="Rankings", value=leaderboard_text, inline=False)
-        embed.set_footer(text=f"Total: {len(guild_users)} pets • Use !petboard {category} <page> to navigate")
+        embed.set_footer(text=f"Total: {result['stats']['total']} pets • Use !petboard {category} <page> to navigate")
         
         # Add stats
-        if guild_users:
-            total_value = sum(user['value'] for user in guild_users)
-            average_value = total_value // len(guild_users)
-            
-            stats_text = f"**Total {category.title()}:** {total_value:,}\n**Average {category.title()}:** {average_value:,}"
-            
-            # Add category-specific stats
-            if category == 'battles':
-                total_wins = sum(user['pet_data'].get('battles_won', 0) for user in guild_users)
-                total_losses = sum(user['pet_data'].get('battles_lost', 0) for user in guild_users)
-                win_rate = (total_wins / (total_wins + total_losses) * 100) if (total_wins + total_losses) > 0 else 0
-                stats_text += f"\n**Server Win Rate:** {win_rate:.1f}%"
-            
-            embed.add_field(name="📊 Server Stats", value=stats_text, inline=True)
+        total_value = result['stats']['total_score']
+        average_value = total_value // result['stats']['total']
+        
+        stats_text = f"**Total {category.title()}:** {total_value:,}\n**Average {category.title()}:** {average_value:,}"
+        
+        # Add category-specific stats
+        if category == 'battles':
+            total_wins = result['stats']['total_wins']
+            total_losses = result['stats']['total_losses']
+            win_rate = (total_wins / (total_wins + total_losses) * 100) if (total_wins + total_losses) > 0 else 0
+            stats_text += f"\n**Server Win Rate:** {win_rate:.1f}%"
+        
+        embed.add_field(name="📊 Server Stats", value=stats_text, inline=True)
+        
+        if result['user_rank']:
+            embed.add_field(name="📍 Your Best Pet", value=f"#{result['user_rank']}", inline=True)
         
         await ctx.send(embed=embed)
     
@@ -343,89 +451,39 @@ class Leaderboards(commands.Cog):
             timestamp=datetime.now()
         )
         
-        # Economy top 3
-        if hasattr(self.bot, 'user_data'):
-            guild_users = []
-            for user_id, data in self.bot.user_data.items():
-                if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                    balance = data.get('balance', 0)
-                    if balance > 0:
-                        guild_users.append({
-                            'user_id': user_id,
-                            'balance': balance,
-                            'username': data.get('username', 'Unknown User')
-                        })
-            
-            if guild_users:
-                guild_users.sort(key=lambda x: x['balance'], reverse=True)
-                economy_text = ""
-                for i, user_data in enumerate(guild_users[:3]):
-                    medals = ["🥇", "🥈", "🥉"]
-                    try:
-                        user = await self.bot.fetch_user(user_data['user_id'])
-                        name = user.display_name
-                    except:
-                        name = user_data['username']
-                    economy_text += f"{medals[i]} {name} - {user_data['balance']:,} coins\n"
+        refreshed_at = None
+        if self.bot.db_pool:
+            try:
+                boards, refreshed_at = await self.get_guild_snapshot(ctx.guild)
                 
-                embed.add_field(name="💰 Top Economy", value=economy_text or "No data", inline=True)
-            
-            # XP top 3
-            xp_users = []
-            for user_id, data in self.bot.user_data.items():
-                if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                    xp = data.get('xp', 0)
-                    level = data.get('level', 1)
-                    if xp > 0:
-                        xp_users.append({
-                            'user_id': user_id,
-                            'xp': xp,
-                            'level': level,
-                            'username': data.get('username', 'Unknown User')
-                        })
-            
-            if xp_users:
-                xp_users.sort(key=lambda x: x['xp'], reverse=True)
-                xp_text = ""
-                for i, user_data in enumerate(xp_users[:3]):
-                    medals = ["🥇", "🥈", "🥉"]
-                    try:
-                        user = await self.bot.fetch_user(user_data['user_id'])
-                        name = user.display_name
-                    except:
-                        name = user_data['username']
-                    xp_text += f"{medals[i]} {name} - Level {user_data['level']}\n"
+                # Economy top 3
+                if boards.get('economy'):
+                    economy_text = ""
+                    for row in boards['economy']:
+                        name = self.get_display_name(ctx.guild, row['user_id'])
+                        economy_text += f"{self.get_medal(row['rank'])} {name} - {row['score']:,} coins\n"
+                    
+                    embed.add_field(name="💰 Top Economy", value=economy_text or "No data", inline=True)
                 
-                embed.add_field(name="⭐ Top XP", value=xp_text or "No data", inline=True)
-            
-            # Pet fame top 3
-            pet_users = []
-            for user_id, data in self.bot.user_data.items():
-                if isinstance(data, dict) and data.get('guild_id') == ctx.guild.id:
-                    pet_data = data.get('pet', {})
-                    if pet_data:
-                        fame = pet_data.get('fame', 0)
-                        if fame > 0:
-                            pet_users.append({
-                                'user_id': user_id,
-                                'fame': fame,
-                                'pet_name': pet_data.get('name', 'Unnamed Pet'),
-                                'username': data.get('username', 'Unknown User')
-                            })
-            
-            if pet_users:
-                pet_users.sort(key=lambda x: x['fame'], reverse=True)
-                pet_text = ""
-                for i, user_data in enumerate(pet_users[:3]):
-                    medals = ["🥇", "🥈", "🥉"]
-                    try:
-                        user = await self.bot.fetch_user(user_data['user_id'])
-                        name = user.display_name
-                    except:
-                        name = user_data['username']
-                    pet_text += f"{medals[i]} {user_data['pet_name']} - {user_data['fame']} fame\n└ {name}\n"
+                # XP top 3
+                if boards.get('xp'):
+                    xp_text = ""
+                    for row in boards['xp']:
+                        name = self.get_display_name(ctx.guild, row['user_id'])
+                        xp_text += f"{self.get_medal(row['rank'])} {name} - Level {row['label']}\n"
+                    
+                    embed.add_field(name="⭐ Top XP", value=xp_text or "No data", inline=True)
                 
-                embed.add_field(name="🐾 Top Pet Fame", value=pet_text or "No data", inline=True)
+                # Pet fame top 3
+                if boards.get('pets'):
+                    pet_text = ""
+                    for row in boards['pets']:
+                        name = self.get_display_name(ctx.guild, row['user_id'])
+                        pet_text += f"{self.get_medal(row['rank'])} {row['label']} - {row['score']} fame\n└ {name}\n"
+                    
+                    embed.add_field(name="🐾 Top Pet Fame", value=pet_text or "No data", inline=True)
+            except Exception as e:
+                logger.error(f"Database error loading leaderboard overview: {e}")
         
         # Add navigation info
         embed.add_field(
@@ -434,6 +492,13 @@ class Leaderboards(commands.Cog):
             inline=False
         )
         
+        if refreshed_at:
+            embed.add_field(
+                name="🕒 Last Refreshed",
+                value=discord.utils.format_dt(refreshed_at.replace(tzinfo=timezone.utc), 'R'),
+                inline=False
+            )
+        
         embed.set_footer(text="Use individual leaderboard commands for complete rankings")
         
         await ctx.send(embed=embed)
@@ -467,4 +532,6 @@ class Leaderboards(commands.Cog):
         await self.pet_leaderboard(ctx, category, page)
 
 async def setup(bot):
-    await bot.add_cog(Leaderboards(bot))
\ No newline at end of file
+    cog = Leaderboards(bot)
+    await cog.create_leaderboard_indexes()
+    await bot.add_cog(cog)
\ No newline at end of file
@@ -1,16 +1,73 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import asyncio
+import random
+from bisect import bisect_right
+from collections import OrderedDict
+from math import isqrt
 
 logger = logging.getLogger(__name__)
 
+XP_COOLDOWN_SECONDS = 60  # 1 minute cooldown between XP gains
+XP_GAIN_RANGE = (15, 25)  # XP awarded per eligible message
+
+# Pending XP deltas are written to the users table this often - at most this much is lost on a crash
+XP_FLUSH_SECONDS = 10
+
+# Hot users kept in memory; idle users with nothing pending are evicted past this
+XP_CACHE_SIZE = 50000
+
+# Level roles assigned on level up (created by server admins)
+LEVEL_ROLES = {5: "Level 5", 10: "Level 10", 20: "Level 20", 50: "Level 50",
+               100: "Level 100", 125: "Level 125", 150: "Level 150", 175: "Level 175",
+               200: "Level 200", 500: "Level 500", 1000: "Level 1000"}
+
+def get_xp_for_level(level):
+    """Total XP needed to reach a level"""
+    return level * level * 100
+
+# Precomputed level thresholds: LEVEL_THRESHOLDS[level] = XP needed for that level
+MAX_TABLE_LEVEL = 1000
+LEVEL_THRESHOLDS = [get_xp_for_level(level) for level in range(MAX_TABLE_LEVEL + 1)]
+
+def calculate_level(xp):
+    """Level for a total XP amount: level = sqrt(xp / 100)"""
+    if xp < LEVEL_THRESHOLDS[-1]:
+        return bisect_right(LEVEL_THRESHOLDS, xp) - 1
+    return isqrt(xp // 100)
+
+# Add flushed deltas to the stored totals; level is computed in memory from the new total
+FLUSH_XP_SQL = """
+    INSERT INTO users (user_id, xp, level)
+    SELECT * FROM unnest($1::BIGINT[], $2::BIGINT[], $3::INTEGER[])
+    ON CONFLICT (user_id)
+    DO UPDATE SET xp = users.xp + EXCLUDED.xp, level = EXCLUDED.level
+"""
+
 class Leveling(commands.Cog):
     """Core leveling functionality"""
-    
+
     def __init__(self, bot):
         self.bot = bot
-    
+        # Total XP for hot users, in least-recently-active order: {user_id: xp}
+        self.xp_cache = OrderedDict()
+        # XP earned since the last flush: {user_id: delta}
+        self.pending_xp = {}
+        # Deltas currently being written by a flush
+        self.flushing_xp = {}
+        # The write in progress, shielded so cancelling the flush loop cannot interrupt it
+        self.flush_task = None
+        self.flush_xp.start()
+
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.flush_xp.cancel()
+        # Let a write the loop was cancelled in finish before the final flush
+        if self.flush_task and not self.flush_task.done():
+            await self.flush_task
+        await self.flush_pending_xp()
+
     async def create_leveling_tables(self):
         """Create leveling tables in database"""
         if not self.bot.db_pool:
@@ -28,5 +85,150 @@ class Leveling(commands.Cog):
         except Exception as e:
             logger.error(f"Database error in leveling: {e}")
 
+    async def get_xp(self, user_id):
+        """Get a user's total XP, loading it into the cache on first use"""
+        xp = self.xp_cache.get(user_id)
+        if xp is not None:
+            self.xp_cache.move_to_end(user_id)
+            return xp
+
+        stored = 0
+        if self.bot.db_pool:
+            async with self.bot.db_pool.acquire() as conn:
+                stored = await conn.fetchval("SELECT xp FROM users WHERE user_id = $1", user_id) or 0
+
+        # Another message may have cached this user while we were waiting
+        xp = self.xp_cache.get(user_id)
+        if xp is None:
+            xp = stored + self.flushing_xp.get(user_id, 0) + self.pending_xp.get(user_id, 0)
+            self.xp_cache[user_id] = xp
+            self.evict_idle_users()
+        return xp
+
+    def evict_idle_users(self):
+        """Drop the least recently active users that have nothing left to flush"""
+        overflow = len(self.xp_cache) - XP_CACHE_SIZE
+        if overflow <= 0:
+            return
+        for user_id in list(self.xp_cache):
+            if overflow <= 0:
+                break
+            if user_id not in self.pending_xp and user_id not in self.flushing_xp:
+                del self.xp_cache[user_id]
+                overflow -= 1
+
+    async def award_xp(self, user_id, amount):
+        """Add XP in memory and return (old_level, new_level, total_xp)"""
+        total = await self.get_xp(user_id)
+        new_total = total + amount
+        self.xp_cache[user_id] = new_total
+        self.pending_xp[user_id] = self.pending_xp.get(user_id, 0) + amount
+        return calculate_level(total), calculate_level(new_total), new_total
+
+    async def flush_pending_xp(self):
+        """Write all pending XP deltas to the users table in one statement"""
+        if not self.pending_xp or not self.bot.db_pool:
+            return
+        pending, self.pending_xp = self.pending_xp, {}
+        self.flushing_xp = pending
+        self.flush_task = asyncio.get_running_loop().create_task(self.write_xp(pending))
+        await asyncio.shield(self.flush_task)
+
+    async def write_xp(self, pending):
+        """Write one batch of XP deltas, putting them back for the next flush if it fails"""
+        user_ids = list(pending)
+        deltas = [pending[user_id] for user_id in user_ids]
+        levels = [calculate_level(self.xp_cache.get(user_id, pending[user_id])) for user_id in user_ids]
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute(FLUSH_XP_SQL, user_ids, deltas, levels)
+        except Exception as e:
+            logger.error(f"Failed to flush XP for {len(user_ids)} users: {e}")
+            # Put the deltas back so the next flush retries them
+            for user_id, delta in pending.items():
+                self.pending_xp[user_id] = self.pending_xp.get(user_id, 0) + delta
+        finally:
+            self.flushing_xp = {}
+
+    @tasks.loop(seconds=XP_FLUSH_SECONDS)
+    async def flush_xp(self):
+        """Periodically write buffered XP to the database"""
+        await self.flush_pending_xp()
+
+    @flush_xp.before_loop
+    async def before_flush_xp(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Award XP for guild messages"""
+        if message.author.bot or not message.guild:
+            return
+        if not self.bot.guild_settings.get_value(message.guild.id, 'leveling_enabled', False):
+            return
+
+        # Cooldown is checked and claimed before any await; XP is global, so scope 0
+        if not self.bot.cooldowns.acquire('xp', 0, message.author.id, XP_COOLDOWN_SECONDS):
+            return
+
+        try:
+            old_level, new_level, total = await self.award_xp(message.author.id, random.randint(*XP_GAIN_RANGE))
+        except Exception as e:
+            logger.error(f"Error awarding XP: {e}")
+            return
+
+        if new_level > old_level:
+            await self.assign_level_roles(message.author, new_level)
+            embed = discord.Embed(
+                title="🎉 Level Up!",
+                description=f"{message.author.mention} has reached level {new_level}!",
+                color=0xffd700
+            )
+            embed.add_field(name="Total XP", value=f"{total:,}", inline=True)
+            embed.add_field(name="Next Level", value=f"{get_xp_for_level(new_level + 1):,} XP", inline=True)
+            try:
+                await message.channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+
+    async def assign_level_roles(self, member, new_level):
+        """Give a member every existing level role they have reached"""
+        roles = []
+        for level, role_name in LEVEL_ROLES.items():
+            if level > new_level:
+                break
+            role = discord.utils.get(member.guild.roles, name=role_name)
+            if role and role not in member.roles:
+                roles.append(role)
+        if roles:
+            try:
+                await member.add_roles(*roles, reason=f"Reached level {new_level}")
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to assign level roles: {e}")
+
+    @commands.hybrid_command(name="rank", description="Show your level and XP")
+    async def rank(self, ctx, member: discord.Member = None):
+        """Show a member's level and XP"""
+        member = member or ctx.author
+        try:
+            xp = await self.get_xp(member.id)
+        except Exception as e:
+            logger.error(f"Database error in rank: {e}")
+            await ctx.send("❌ Could not load XP right now.")
+            return
+
+        level = calculate_level(xp)
+        embed = discord.Embed(
+            title=f"📈 {member.display_name}'s Rank",
+            color=0x27ae60
+        )
+        embed.add_field(name="Level", value=f"{level:,}", inline=True)
+        embed.add_field(name="Total XP", value=f"{xp:,}", inline=True)
+        embed.add_field(name="Next Level", value=f"{get_xp_for_level(level + 1):,} XP", inline=True)
+        await ctx.send(embed=embed)
+
 async def setup(bot):
-    await bot.add_cog(Leveling(bot))
+    cog = Leveling(bot)
+    await cog.create_leveling_tables()
+    await bot.add_cog(cog)
@@ -14,11 +14,15 @@ class Logging(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        # Last message seen in each channel since the gateway connected, from any author;
+        # logged rows link to it so transcripts can tell when messages are missing
+        self.last_message_ids = {}
         
     async def cog_load(self):
         """Initialize logging tables when cog loads"""
         if self.bot.db_pool:
             await self.create_logging_tables()
+            await self.bot.log_settings.load()
         else:
             self.logger.warning("Logging cog loaded without database - limited functionality")
         
@@ -40,9 +44,13 @@ class Logging(commands.Cog):
                         timestamp TIMESTAMPTZ DEFAULT NOW(),
                         message_type TEXT DEFAULT 'message',
                         edited BOOLEAN DEFAULT FALSE,
-                        deleted BOOLEAN DEFAULT FALSE
+                        deleted BOOLEAN DEFAULT FALSE,
+                        previous_message_id BIGINT
                     )
                 ''')
+                await conn.execute('''
+                    ALTER TABLE message_logs ADD COLUMN IF NOT EXISTS previous_message_id BIGINT
+                ''')
                 
                 # Command usage logs table
                 await conn.execute('''
@@ -91,6 +99,13 @@ class Logging(commands.Cog):
                     )
                 ''')
                 
+                # Ticket transcripts scan a channel's logged messages in message order
+                await conn.execute('DROP INDEX IF EXISTS idx_message_logs_channel')
+                await conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_message_logs_channel_message
+                    ON message_logs (channel_id, message_id)
+                ''')
+                
                 self.logger.info("Logging tables created successfully")
                 
         except Exception as e:
@@ -100,76 +115,22 @@ class Logging(commands.Cog):
         """Get the designated log channel for a guild"""
         if not self.bot.db_pool:
             return None
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    "SELECT log_channel_id FROM log_settings WHERE guild_id = $1",
-                    guild_id
-                )
-                if result:
-                    channel = self.bot.get_channel(result['log_channel_id'])
-                    return channel
-                return None
-        except Exception as e:
-            self.logger.error(f"Failed to get log channel: {e}")
-            return None
+        log_channel_id = self.bot.log_settings.get_value(guild_id, 'log_channel_id')
+        return self.bot.get_channel(log_channel_id) if log_channel_id else None
     
     async def get_log_settings(self, guild_id: int):
-        """Get logging settings for a guild"""
+        """Get logging settings for a guild from the shared log settings cache"""
         if not self.bot.db_pool:
             return None
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    "SELECT * FROM log_settings WHERE guild_id = $1",
-                    guild_id
-                )
-                if result:
-                    return dict(result)
-                return {
-                    'log_messages': True,
-                    'log_commands': True,
-                    'log_joins_leaves': True,
-                    'log_edits_deletes': True,
-                    'log_voice_activity': True,
-                    'log_role_changes': True
-                }
-        except Exception as e:
-            self.logger.error(f"Failed to get log settings: {e}")
-            return {}
+        return self.bot.log_settings.get(guild_id)
     
     async def log_to_database(self, table: str, data: dict):
-        """Log data to specified database table"""
+        """Queue data for the specified database table via the batched log sink"""
         if not self.bot.db_pool:
             return
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                if table == 'message_logs':
-                    await conn.execute('''
-                        INSERT INTO message_logs (message_id, guild_id, channel_id, user_id, username, content, attachments, message_type)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                        ON CONFLICT (message_id) DO NOTHING
-                    ''', data['message_id'], data['guild_id'], data['channel_id'], 
-                         data['user_id'], data['username'], data['content'], 
-                         data['attachments'], data['message_type'])
-                
-                elif table == 'command_usage_logs':
-                    await conn.execute('''
-                        INSERT INTO command_usage_logs (guild_id, channel_id, user_id, username, command_name, command_args, command_type, success, error_message)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                    ''', data['guild_id'], data['channel_id'], data['user_id'], 
-                         data['username'], data['command_name'], data['command_args'],
-                         data['command_type'], data['success'], data['error_message'])
-                
-                elif table == 'activity_logs':
-                    await conn.execute('''
-                        INSERT INTO activity_logs (guild_id, user_id, username, activity_type, description, metadata)
-                        VALUES ($1, $2, $3, $4, $5, $6)
-                    ''', data['guild_id'], data['user_id'], data['username'],
-                         data['activity_type'], data['description'], json.dumps(data['metadata']))
-                         
-        except Exception as e:
-            self.logger.error(f"Failed to log to database: {e}")
+        if table == 'activity_logs':
+            data = {**data, 'metadata': json.dumps(data['metadata'])}
+        self.bot.log_sink.submit(table, data)
     
     async def create_log_embed(self, title: str, description: str, color: int, fields=None):
         """Create a standardized log embed"""
@@ -197,10 +158,14 @@ class Logging(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message):
         """Log all messages sent in the server"""
-        if message.author.bot:
+        if not message.guild:
             return
         
-        if not message.guild:
+        # Tracked before any filtering so skipped messages (bots, logging off) still break the chain
+        previous_message_id = self.last_message_ids.get(message.channel.id)
+        self.last_message_ids[message.channel.id] = message.id
+        
+        if message.author.bot:
             return
         
         settings = await self.get_log_settings(message.guild.id)
@@ -220,7 +185,9 @@ class Logging(commands.Cog):
             'username': str(message.author),
             'content': message.content[:2000],  # Truncate if too long
             'attachments': json.dumps(attachments_data),
-            'message_type': 'message'
+            'message_type': 'message',
+            'timestamp': message.created_at,
+            'previous_message_id': previous_message_id
         })
         
         # Send to log channel
@@ -241,10 +208,7 @@ class Logging(commands.Cog):
                 attach_list = '\n'.join([f"[{att.filename}]({att.url})" for att in message.attachments])
                 embed.add_field(name="Attachments", value=attach_list[:1000], inline=False)
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass  # Silently fail if log channel is not accessible
+            self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
@@ -256,16 +220,6 @@ class Logging(commands.Cog):
         if not settings or not settings.get('log_edits_deletes', True):
             return
         
-        # Update database
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE message_logs SET edited = TRUE WHERE message_id = $1",
-                    before.id
-                )
-        except Exception as e:
-            self.logger.error(f"Failed to update message edit in database: {e}")
-        
         # Send to log channel
         log_channel = await self.get_log_channel(before.guild.id)
         if log_channel:
@@ -281,10 +235,23 @@ class Logging(commands.Cog):
                 ]
             )
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass
+            self.bot.log_dispatcher.send(log_channel, embed)
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """Keep logged message content current, including messages no longer in the cache"""
+        # Stored whatever the log settings so transcripts show what was actually sent
+        if not payload.guild_id or not self.bot.db_pool:
+            return
+        # Embed unfurls also arrive as edits, without an edit timestamp or content change
+        if not payload.data.get('edited_timestamp') or 'content' not in payload.data:
+            return
+        self.bot.log_sink.mark_edited(payload.message_id, payload.data['content'][:2000])
+    
+    @commands.Cog.listener()
+    async def on_disconnect(self):
+        """Messages sent while disconnected are never seen, so the chain restarts"""
+        self.last_message_ids.clear()
     
     @commands.Cog.listener()
     async def on_message_delete(self, message):
@@ -296,15 +263,9 @@ class Logging(commands.Cog):
         if not settings or not settings.get('log_edits_deletes', True):
             return
         
-        # Update database
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE message_logs SET deleted = TRUE WHERE message_id = $1",
-                    message.id
-                )
-        except Exception as e:
-            self.logger.error(f"Failed to update message deletion in database: {e}")
+        # Update database (coalesced with other deletes by the log sink)
+        if self.bot.db_pool:
+            self.bot.log_sink.mark_deleted(message.id)
         
         # Send to log channel
         log_channel = await self.get_log_channel(message.guild.id)
@@ -320,10 +281,38 @@ class Logging(commands.Cog):
                 ]
             )
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass
+            self.bot.log_dispatcher.send(log_channel, embed)
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Log bulk deletions (purges) as a single update and log entry"""
+        if not payload.guild_id:
+            return
+        
+        settings = await self.get_log_settings(payload.guild_id)
+        if not settings or not settings.get('log_edits_deletes', True):
+            return
+        
+        # Update database - the whole purge becomes one UPDATE
+        if self.bot.db_pool:
+            self.bot.log_sink.mark_deleted(*payload.message_ids)
+        
+        # Send to log channel
+        log_channel = await self.get_log_channel(payload.guild_id)
+        if log_channel:
+            channel = self.bot.get_channel(payload.channel_id)
+            channel_mention = channel.mention if channel else f"<#{payload.channel_id}>"
+            embed = await self.create_log_embed(
+                "🗑️ Messages Bulk Deleted",
+                f"{len(payload.message_ids)} messages deleted from {channel_mention}",
+                0xe74c3c,
+                [
+                    {'name': 'Channel', 'value': channel_mention, 'inline': True},
+                    {'name': 'Messages', 'value': str(len(payload.message_ids)), 'inline': True}
+                ]
+            )
+            
+            self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.Cog.listener()
     async def on_command(self, ctx):
@@ -363,10 +352,7 @@ class Logging(commands.Cog):
                 ]
             )
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass
+            self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
@@ -407,10 +393,7 @@ class Logging(commands.Cog):
                     ]
                 )
                 
-                try:
-                    await log_channel.send(embed=embed)
-                except discord.HTTPException:
-                    pass
+                self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.Cog.listener()
     async def on_member_join(self, member):
@@ -446,10 +429,7 @@ class Logging(commands.Cog):
                 ]
             )
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass
+            self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.Cog.listener()
     async def on_member_remove(self, member):
@@ -486,10 +466,7 @@ class Logging(commands.Cog):
                 ]
             )
             
-            try:
-                await log_channel.send(embed=embed)
-            except discord.HTTPException:
-                pass
+            self.bot.log_dispatcher.send(log_channel, embed)
     
     @commands.group(name="logconfig", aliases=["logcfg"])
     @commands.has_permissions(manage_guild=True)
@@ -523,6 +500,7 @@ class Logging(commands.Cog):
                     ON CONFLICT (guild_id) 
                     DO UPDATE SET log_channel_id = $2, updated_at = NOW()
                 ''', ctx.guild.id, channel.id)
+            self.bot.log_settings.update(ctx.guild.id, log_channel_id=channel.id)
             
             embed = discord.Embed(
                 title="✅ Log Channel Set",
@@ -604,11 +582,8 @@ class Logging(commands.Cog):
         
         try:
             async with self.bot.db_pool.acquire() as conn:
-                # Get current setting
-                current = await conn.fetchval(
-                    f"SELECT {db_column} FROM log_settings WHERE guild_id = $1",
-                    ctx.guild.id
-                )
+                # Get current setting from the cache
+                current = self.bot.log_settings.get(ctx.guild.id).get(db_column)
                 
                 # Toggle the setting
                 new_value = not (current if current is not None else True)
@@ -620,6 +595,7 @@ class Logging(commands.Cog):
                     ON CONFLICT (guild_id) 
                     DO UPDATE SET {db_column} = $2, updated_at = NOW()
                 ''', ctx.guild.id, new_value)
+                self.bot.log_settings.update(ctx.guild.id, **{db_column: new_value})
                 
                 status = "enabled" if new_value else "disabled"
                 embed = discord.Embed(
@@ -692,6 +668,16 @@ class Logging(commands.Cog):
                 inline=True
             )
             
+            sink_stats = self.bot.log_sink.stats
+            embed.add_field(
+                name="Log Writer",
+                value=f"⏳ **{self.bot.log_sink.pending:,}** Pending\n"
+                      f"🗑️ **{sink_stats['dropped']:,}** Dropped\n"
+                      f"📨 **{self.bot.log_dispatcher.depth():,}** Queued embeds "
+                      f"({self.bot.log_dispatcher.lag():.1f}s behind)",
+                inline=True
+            )
+            
             await ctx.send(embed=embed)
             
         except Exception as e:
@@ -752,6 +738,7 @@ class Logging(commands.Cog):
                         ON CONFLICT (guild_id) 
                         DO UPDATE SET log_channel_id = $2, updated_at = NOW()
                     ''', interaction.guild.id, channel.id)
+                self.bot.log_settings.update(interaction.guild.id, log_channel_id=channel.id)
                 
                 embed = discord.Embed(
                     title="✅ Log Channel Set",
@@ -826,11 +813,8 @@ class Logging(commands.Cog):
             
             try:
                 async with self.bot.db_pool.acquire() as conn:
-                    # Get current setting
-                    current = await conn.fetchval(
-                        f"SELECT {db_column} FROM log_settings WHERE guild_id = $1",
-                        interaction.guild.id
-                    )
+                    # Get current setting from the cache
+                    current = self.bot.log_settings.get(interaction.guild.id).get(db_column)
                     
                     # Toggle the setting
                     new_value = not (current if current is not None else True)
@@ -842,6 +826,7 @@ class Logging(commands.Cog):
                         ON CONFLICT (guild_id) 
                         DO UPDATE SET {db_column} = $2, updated_at = NOW()
                     ''', interaction.guild.id, new_value)
+                    self.bot.log_settings.update(interaction.guild.id, **{db_column: new_value})
                     
                     status = "enabled" if new_value else "disabled"
                     embed = discord.Embed(
@@ -914,6 +899,16 @@ class Logging(commands.Cog):
                     inline=True
                 )
                 
+                sink_stats = self.bot.log_sink.stats
+                embed.add_field(
+                    name="Log Writer",
+                    value=f"⏳ **{self.bot.log_sink.pending:,}** Pending\n"
+                          f"🗑️ **{sink_stats['dropped']:,}** Dropped\n"
+                          f"📨 **{self.bot.log_dispatcher.depth():,}** Queued embeds "
+                          f"({self.bot.log_dispatcher.lag():.1f}s behind)",
+                    inline=True
+                )
+                
                 await interaction.response.send_message(embed=embed)
                 
             except Exception as e:
@@ -2,10 +2,20 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
+import asyncpg
 from datetime import datetime, timedelta
+from guild_executor import Mutation
 
 logger = logging.getLogger(__name__)
 
+# Save @everyone overwrites before a lockdown; existing rows (an unfinished lockdown) are kept
+SAVE_LOCKDOWN_SQL = """
+    INSERT INTO lockdown_overwrites (guild_id, channel_id, allow, deny, existed)
+    SELECT $1, * FROM unnest($2::BIGINT[], $3::BIGINT[], $4::BIGINT[], $5::BOOLEAN[])
+    ON CONFLICT (guild_id, channel_id) DO NOTHING
+    RETURNING channel_id
+"""
+
 class Management(commands.Cog):
     """Server management and configuration commands"""
     
@@ -33,6 +43,17 @@ class Management(commands.Cog):
                         updated_at TIMESTAMP DEFAULT NOW()
                     )
                 """)
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS lockdown_overwrites (
+                        guild_id BIGINT NOT NULL,
+                        channel_id BIGINT NOT NULL,
+                        allow BIGINT NOT NULL,
+                        deny BIGINT NOT NULL,
+                        existed BOOLEAN NOT NULL,
+                        locked_at TIMESTAMP DEFAULT NOW(),
+                        PRIMARY KEY (guild_id, channel_id)
+                    )
+                """)
         except Exception as e:
             logger.error(f"Database error creating management tables: {e}")
     
@@ -53,6 +74,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET prefix = $2, updated_at = NOW()
                     """, ctx.guild.id, prefix)
+                self.bot.guild_settings.update(ctx.guild.id, prefix=prefix)
             except Exception as e:
                 logger.error(f"Database error setting prefix: {e}")
         
@@ -76,6 +98,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET welcome_channel = $2, updated_at = NOW()
                     """, ctx.guild.id, channel.id if channel else None)
+                self.bot.guild_settings.update(ctx.guild.id, welcome_channel=channel.id if channel else None)
             except Exception as e:
                 logger.error(f"Database error setting welcome channel: {e}")
         
@@ -107,6 +130,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET goodbye_channel = $2, updated_at = NOW()
                     """, ctx.guild.id, channel.id if channel else None)
+                self.bot.guild_settings.update(ctx.guild.id, goodbye_channel=channel.id if channel else None)
             except Exception as e:
                 logger.error(f"Database error setting goodbye channel: {e}")
         
@@ -138,6 +162,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET log_channel = $2, updated_at = NOW()
                     """, ctx.guild.id, channel.id if channel else None)
+                self.bot.guild_settings.update(ctx.guild.id, log_channel=channel.id if channel else None)
             except Exception as e:
                 logger.error(f"Database error setting log channel: {e}")
         
@@ -173,6 +198,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET auto_role = $2, updated_at = NOW()
                     """, ctx.guild.id, role.id if role else None)
+                self.bot.guild_settings.update(ctx.guild.id, auto_role=role.id if role else None)
             except Exception as e:
                 logger.error(f"Database error setting auto role: {e}")
         
@@ -191,77 +217,210 @@ class Management(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    def restore_mutation(self, channel, row, reason):
+        """Mutation that puts back the @everyone overwrite saved before a lockdown"""
+        if row['existed']:
+            overwrite = discord.PermissionOverwrite.from_pair(discord.Permissions(row['allow']), discord.Permissions(row['deny']))
+        else:
+            overwrite = None
+        return Mutation(
+            channel,
+            ('channel_permissions', channel.id),
+            lambda: channel.set_permissions(channel.guild.default_role, overwrite=overwrite, reason=reason)
+        )
+
+    async def run_channel_mutations(self, ctx, title, color, mutations):
+        """Run permission edits through the bot's executor, editing a progress embed as they finish"""
+        embed = discord.Embed(title=title, description=f"Working... 0/{len(mutations)} channels", color=color)
+        message = await ctx.send(embed=embed)
+
+        async def progress(done, total):
+            embed.description = f"Working... {done}/{total} channels"
+            await message.edit(embed=embed)
+
+        result = await self.bot.guild_executor.run(mutations, progress=progress)
+        for channel, error in result['failed']:
+            logger.warning(f"Failed to update permissions in #{channel.name} ({channel.guild.id}): {error}")
+        return message, result
+
+    def add_failures(self, embed, result):
+        """List channels the executor could not update"""
+        if result['failed']:
+            names = ", ".join(channel.mention for channel, _ in result['failed'][:10])
+            more = len(result['failed']) - 10
+            if more > 0:
+                names += f" and {more} more"
+            embed.add_field(name=f"Failed ({len(result['failed'])})", value=names, inline=False)
+
     @commands.hybrid_command(name="lockdown")
     @commands.has_permissions(manage_channels=True)
     async def lockdown(self, ctx, *, reason: str = "Server lockdown initiated"):
         """Lock ALL channels in the server"""
-        locked_channels = []
-        
+        default_role = ctx.guild.default_role
+        targets = []
         for channel in ctx.guild.text_channels:
+            overwrites = channel.overwrites_for(default_role)
+            if overwrites.send_messages is not False:
+                targets.append((channel, overwrites))
+
+        # Save the current @everyone overwrites first so unlock can restore them, even after a restart.
+        # Channels already saved by an unfinished lockdown keep their original state.
+        saved = set()
+        if self.bot.db_pool and targets:
             try:
-                overwrites = channel.overwrites_for(ctx.guild.default_role)
-                if overwrites.send_messages is not False:
-                    overwrites.send_messages = False
-                    await channel.set_permissions(ctx.guild.default_role, overwrite=overwrites, reason=reason)
-                    locked_channels.append(channel.name)
-            except discord.Forbidden:
-                continue
-        
+                async with self.bot.db_pool.acquire() as conn:
+                    rows = await conn.fetch(
+                        SAVE_LOCKDOWN_SQL,
+                        ctx.guild.id,
+                        [channel.id for channel, _ in targets],
+                        [overwrites.pair()[0].value for _, overwrites in targets],
+                        [overwrites.pair()[1].value for _, overwrites in targets],
+                        [default_role in channel.overwrites for channel, _ in targets]
+                    )
+                saved = {row['channel_id'] for row in rows}
+            except asyncpg.PostgresError as e:
+                logger.error(f"Database error saving lockdown state: {e}")
+                await ctx.send("❌ Could not save the current channel permissions, lockdown cancelled.")
+                return
+
+        mutations = []
+        for channel, overwrites in targets:
+            overwrites.send_messages = False
+            mutations.append(Mutation(
+                channel,
+                ('channel_permissions', channel.id),
+                lambda channel=channel, overwrites=overwrites: channel.set_permissions(default_role, overwrite=overwrites, reason=reason)
+            ))
+
+        message, result = await self.run_channel_mutations(ctx, "🔒 Server Lockdown", discord.Color.red(), mutations)
+
+        # Channels that were never locked have nothing to restore
+        failed = [channel.id for channel, _ in result['failed'] if channel.id in saved]
+        if failed:
+            try:
+                async with self.bot.db_pool.acquire() as conn:
+                    await conn.execute(
+                        "DELETE FROM lockdown_overwrites WHERE guild_id = $1 AND channel_id = ANY($2::BIGINT[])",
+                        ctx.guild.id, failed
+                    )
+            except asyncpg.PostgresError as e:
+                logger.error(f"Database error clearing lockdown state: {e}")
+
         embed = discord.Embed(
             title="🔒 Server Lockdown",
-            description=f"Locked {len(locked_channels)} channels",
+            description=f"Locked {len(result['succeeded'])} channels",
             color=discord.Color.red()
         )
         embed.add_field(name="Reason", value=reason, inline=False)
         embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
-        
-        await ctx.send(embed=embed)
+        self.add_failures(embed, result)
+
+        await message.edit(embed=embed)
     
     @commands.hybrid_command(name="unlock")
     @commands.has_permissions(manage_channels=True)
     async def unlock(self, ctx, channel: discord.TextChannel = None, *, reason: str = "Channel unlocked"):
         """Unlock a specific channel or all channels"""
+        rows = []
+        if self.bot.db_pool:
+            try:
+                async with self.bot.db_pool.acquire() as conn:
+                    rows = await conn.fetch(
+                        "SELECT channel_id, allow, deny, existed FROM lockdown_overwrites WHERE guild_id = $1"
+                        + (" AND channel_id = $2" if channel else ""),
+                        ctx.guild.id, *([channel.id] if channel else [])
+                    )
+            except asyncpg.PostgresError as e:
+                logger.error(f"Database error loading lockdown state: {e}")
+                await ctx.send("❌ Could not load the permissions saved at lockdown, unlock cancelled.")
+                return
+
         if channel:
             # Unlock specific channel
             try:
-                overwrites = channel.overwrites_for(ctx.guild.default_role)
-                overwrites.send_messages = None
-                await channel.set_permissions(ctx.guild.default_role, overwrite=overwrites, reason=reason)
-                
-                embed = discord.Embed(
-                    title="🔓 Channel Unlocked",
-                    description=f"{channel.mention} has been unlocked",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Reason", value=reason, inline=False)
-                embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
-                
-                await ctx.send(embed=embed)
+                if rows:
+                    await self.restore_mutation(channel, rows[0], reason).run()
+                else:
+                    overwrites = channel.overwrites_for(ctx.guild.default_role)
+                    overwrites.send_messages = None
+                    await channel.set_permissions(ctx.guild.default_role, overwrite=overwrites, reason=reason)
             except discord.Forbidden:
                 await ctx.send("❌ I don't have permission to modify that channel!")
-        else:
-            # Unlock all channels
-            unlocked_channels = []
+                return
+            except Exception as e:
+                logger.error(f"Error unlocking #{channel.name} ({ctx.guild.id}): {e}")
+                await ctx.send(f"❌ Error unlocking channel: {e}")
+                return
             
-            for text_channel in ctx.guild.text_channels:
+            # The channel is unlocked either way; a leftover row is only restored again by the next unlock
+            if rows:
                 try:
+                    async with self.bot.db_pool.acquire() as conn:
+                        await conn.execute(
+                            "DELETE FROM lockdown_overwrites WHERE guild_id = $1 AND channel_id = $2",
+                            ctx.guild.id, channel.id
+                        )
+                except asyncpg.PostgresError as e:
+                    logger.error(f"Database error clearing lockdown state: {e}")
+            
+            embed = discord.Embed(
+                title="🔓 Channel Unlocked",
+                description=f"{channel.mention} has been unlocked",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="Reason", value=reason, inline=False)
+            embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+            
+            await ctx.send(embed=embed)
+        else:
+            # Unlock all channels
+            mutations = []
+            cleared = []
+            if rows:
+                # Restore exactly what was saved at lockdown
+                for row in rows:
+                    text_channel = ctx.guild.get_channel(row['channel_id'])
+                    if text_channel is None:
+                        cleared.append(row['channel_id'])
+                    else:
+                        mutations.append(self.restore_mutation(text_channel, row, reason))
+            else:
+                # Nothing saved (locked before state was tracked) - clear the send_messages deny
+                for text_channel in ctx.guild.text_channels:
                     overwrites = text_channel.overwrites_for(ctx.guild.default_role)
                     if overwrites.send_messages is False:
                         overwrites.send_messages = None
-                        await text_channel.set_permissions(ctx.guild.default_role, overwrite=overwrites, reason=reason)
-                        unlocked_channels.append(text_channel.name)
-                except discord.Forbidden:
-                    continue
+                        mutations.append(Mutation(
+                            text_channel,
+                            ('channel_permissions', text_channel.id),
+                            lambda text_channel=text_channel, overwrites=overwrites: text_channel.set_permissions(
+                                ctx.guild.default_role, overwrite=overwrites, reason=reason
+                            )
+                        ))
+
+            message, result = await self.run_channel_mutations(ctx, "🔓 Server Unlocked", discord.Color.green(), mutations)
+
+            cleared += [text_channel.id for text_channel, _ in result['succeeded']]
+            if rows and cleared:
+                try:
+                    async with self.bot.db_pool.acquire() as conn:
+                        await conn.execute(
+                            "DELETE FROM lockdown_overwrites WHERE guild_id = $1 AND channel_id = ANY($2::BIGINT[])",
+                            ctx.guild.id, cleared
+                        )
+                except asyncpg.PostgresError as e:
+                    logger.error(f"Database error clearing lockdown state: {e}")
             
             embed = discord.Embed(
                 title="🔓 Server Unlocked",
-                description=f"Unlocked {len(unlocked_channels)} channels",
+                description=f"Unlocked {len(result['succeeded'])} channels",
                 color=discord.Color.green()
             )
             embed.add_field(name="Reason", value=reason, inline=False)
             embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+            self.add_failures(embed, result)
             
-            await ctx.send(embed=embed)
+            await message.edit(embed=embed)
     
     @commands.hybrid_command(name="maintenance")
     @commands.has_permissions(administrator=True)
@@ -283,6 +442,7 @@ class Management(commands.Cog):
                         ON CONFLICT (guild_id)
                         DO UPDATE SET maintenance_mode = $2, updated_at = NOW()
                     """, ctx.guild.id, maintenance_enabled)
+                self.bot.guild_settings.update(ctx.guild.id, maintenance_mode=maintenance_enabled)
             except Exception as e:
                 logger.error(f"Database error setting maintenance mode: {e}")
         
@@ -1,11 +1,84 @@
 import discord
 from discord.ext import commands
 import asyncio
+import json
 import logging
 from datetime import datetime
+from guild_executor import Mutation
 
 logger = logging.getLogger(__name__)
 
+SETUP_REASON = "Server setup by Apple Bot"
+
+QUICK_SETUP_CONFIG = {
+    'categories': [
+        'Staff Only',
+        'General',
+        'Voice Channels',
+        'Support Tickets'
+    ],
+    'channels': {
+        'Staff Only': ['staff-chat', 'mod-logs', 'announcements'],
+        'General': ['general', 'bot-commands', 'counting', 'suggestions'],
+        'Voice Channels': ['General Voice', 'Music Room', 'Study Hall'],
+        'Support Tickets': []  # Will be managed by support system
+    },
+    'roles': [
+        'Owner', 'Admin', 'Moderator', 'Support Team', 'Members', 'Bots'
+    ]
+}
+
+MINIMAL_SETUP_CONFIG = {
+    'categories': ['General', 'Staff'],
+    'channels': {
+        'General': ['general', 'bot-commands'],
+        'Staff': ['mod-logs']
+    },
+    'roles': ['Admin', 'Moderator', 'Members']
+}
+
+SETUP_PRESETS = {'quick': QUICK_SETUP_CONFIG, 'minimal': MINIMAL_SETUP_CONFIG}
+
+ROLE_COLORS = {
+    'Owner': discord.Color.red(),
+    'Admin': discord.Color.dark_red(),
+    'Moderator': discord.Color.orange(),
+    'Support Team': discord.Color.blue(),
+    'VIP': discord.Color.gold(),
+    'Members': discord.Color.green(),
+    'Bots': discord.Color.light_grey()
+}
+
+VOICE_CHANNELS = {'General Voice', 'Music Room', 'Study Hall'}
+
+STAFF_ROLES = ["Owner", "Admin", "Moderator"]
+
+# Overwrites by role name ('@everyone' is the default role); roles that neither exist nor are planned are left out
+CATEGORY_OVERWRITES = {
+    'Staff Only': {
+        '@everyone': {'read_messages': False},
+        **{role: {'read_messages': True, 'send_messages': True} for role in STAFF_ROLES}
+    },
+    'Support Tickets': {
+        '@everyone': {'read_messages': False},
+        'Support Team': {'read_messages': True, 'send_messages': True}
+    }
+}
+
+CHANNEL_OVERWRITES = {
+    'mod-logs': {
+        '@everyone': {'read_messages': False},
+        **{role: {'read_messages': True, 'send_messages': False} for role in STAFF_ROLES}
+    },
+    'announcements': {
+        '@everyone': {'send_messages': False},
+        **{role: {'send_messages': True} for role in STAFF_ROLES}
+    }
+}
+
+# API calls setup_special_channel makes for each channel it posts an intro in
+INTRO_MESSAGES = {'counting': 2, 'suggestions': 1, 'general': 1, 'bot-commands': 1}
+
 class SetupModeSelect(discord.ui.Select):
     """Setup mode selection dropdown"""
     
@@ -56,26 +129,7 @@ class ServerSetupView(discord.ui.View):
             color=discord.Color.blue()
         )
         
-        # Default setup configuration
-        setup_config = {
-            'categories': [
-                'Staff Only',
-                'General',
-                'Voice Channels',
-                'Support Tickets'
-            ],
-            'channels': {
-                'Staff Only': ['staff-chat', 'mod-logs', 'announcements'],
-                'General': ['general', 'bot-commands', 'counting', 'suggestions'],
-                'Voice Channels': ['General Voice', 'Music Room', 'Study Hall'],
-                'Support Tickets': []  # Will be managed by support system
-            },
-            'roles': [
-                'Owner', 'Admin', 'Moderator', 'Support Team', 'Members', 'Bots'
-            ]
-        }
-        
-        await self.cog.execute_setup(interaction, setup_config, progress_embed)
+        await self.cog.execute_setup(interaction, QUICK_SETUP_CONFIG, progress_embed)
     
     async def start_custom_setup(self, interaction):
         """Start interactive custom setup"""
@@ -96,22 +150,13 @@ class ServerSetupView(discord.ui.View):
             view=None
         )
         
-        setup_config = {
-            'categories': ['General', 'Staff'],
-            'channels': {
-                'General': ['general', 'bot-commands'],
-                'Staff': ['mod-logs']
-            },
-            'roles': ['Admin', 'Moderator', 'Members']
-        }
-        
         progress_embed = discord.Embed(
             title="📋 Minimal Server Setup",
             description="Creating essential server structure...",
             color=discord.Color.orange()
         )
         
-        await self.cog.execute_setup(interaction, setup_config, progress_embed)
+        await self.cog.execute_setup(interaction, MINIMAL_SETUP_CONFIG, progress_embed)
 
 class CustomSetupFlow(discord.ui.View):
     """Interactive custom setup flow"""
@@ -456,141 +501,354 @@ class SpecialFeaturesModal(discord.ui.Modal):
 
 class ServerSetup(commands.Cog):
     """Server setup and configuration"""
-    
+
     def __init__(self, bot):
         self.bot = bot
-    
+
+    async def create_setup_tables(self):
+        """Create server setup tables in database"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS server_setup_runs (
+                        guild_id BIGINT PRIMARY KEY,
+                        config TEXT NOT NULL,
+                        completed TEXT[] NOT NULL DEFAULT '{}',
+                        started_at TIMESTAMP DEFAULT NOW()
+                    )
+                """)
+        except Exception as e:
+            logger.error(f"Database error creating server setup tables: {e}")
+
     @commands.command(name="serversetup")
     @commands.has_permissions(administrator=True)
-    async def server_setup(self, ctx):
-        """Interactive server setup with full customization"""
-        
+    async def server_setup(self, ctx, action: str = None, mode: str = "quick"):
+        """Interactive server setup with full customization (`preview [quick|minimal]` for a dry run, `resume` to finish an interrupted setup)"""
+        if action == "preview":
+            await self.preview_setup(ctx, mode)
+            return
+        if action == "resume":
+            await self.resume_setup(ctx)
+            return
+
         embed = discord.Embed(
             title="🏗️ Apple Bot Server Setup",
             description="Welcome to the comprehensive server setup wizard!\n\nThis tool will help you configure your server with all necessary channels, roles, and categories.",
             color=discord.Color.blue()
         )
-        
+
         embed.add_field(
             name="Setup Options:",
             value="""
 ⚡ **Quick Setup** - Hands-off automatic setup
-⚙️ **Custom Setup** - Full interactive customization  
+⚙️ **Custom Setup** - Full interactive customization
 📋 **Minimal Setup** - Essential channels and roles only
             """,
             inline=False
         )
-        
+
         embed.add_field(
             name="What Gets Created:",
             value="• Server roles with proper hierarchy\n• Organized channel categories\n• Essential channels (general, mod-logs, etc.)\n• Special channels (counting, suggestions)\n• Proper permissions for all roles",
             inline=False
         )
-        
-        embed.set_footer(text="Select your preferred setup mode below")
-        
+
+        if await self.load_run(ctx.guild.id):
+            embed.add_field(
+                name="⏸️ Unfinished Setup",
+                value="A previous setup did not finish. Use `!serversetup resume` to pick up where it stopped.",
+                inline=False
+            )
+
+        embed.set_footer(text="Select your preferred setup mode below • !serversetup preview shows the changes first")
+
         view = ServerSetupView(self)
         await ctx.send(embed=embed, view=view)
-    
+
+    async def preview_setup(self, ctx, mode):
+        """Dry run: show what a preset setup would change without calling the API"""
+        config = SETUP_PRESETS.get(mode.lower())
+        if config is None:
+            await ctx.send(f"❌ Unknown setup mode. Choose from: {', '.join(SETUP_PRESETS)}")
+            return
+
+        plan = self.compile_plan(ctx.guild, config)
+        embed = discord.Embed(
+            title=f"🧪 Setup Preview ({mode.title()})",
+            description=f"Running this setup would make **{plan['calls']}** API calls in {len(plan['waves'])} steps.",
+            color=discord.Color.blue()
+        )
+
+        sections = [
+            ('role', "📝 Roles to Create"),
+            ('category', "📁 Categories to Create"),
+            ('channel', "📺 Channels to Create"),
+            ('overwrite', "🔐 Permission Overwrites to Update"),
+            ('intro', "💬 Intro Messages to Post")
+        ]
+        for kind, title in sections:
+            labels = [self.step_label(step) for step in plan['steps'] if step['kind'] == kind]
+            if labels:
+                embed.add_field(
+                    name=f"{title} ({len(labels)})",
+                    value=", ".join(labels[:15]) + ("..." if len(labels) > 15 else ""),
+                    inline=False
+                )
+
+        embed.add_field(name="Already Set Up", value=f"{plan['existing']} items already match", inline=False)
+        if not plan['steps']:
+            embed.description = "Nothing to do - this server already matches the setup."
+        embed.set_footer(text="No changes were made")
+        await ctx.send(embed=embed)
+
+    async def resume_setup(self, ctx):
+        """Finish a setup that was interrupted or had errors"""
+        run = await self.load_run(ctx.guild.id)
+        if not run:
+            await ctx.send("❌ There is no unfinished setup to resume.")
+            return
+
+        progress_embed = discord.Embed(
+            title="⏯️ Resuming Server Setup",
+            description="Picking up where the last setup stopped...",
+            color=discord.Color.blue()
+        )
+        message = await ctx.send(embed=progress_embed)
+        await self.run_setup(ctx.guild, json.loads(run['config']), progress_embed, message.edit, set(run['completed']))
+
     async def execute_setup(self, interaction, config, progress_embed):
         """Execute the server setup with given configuration"""
-        guild = interaction.guild
+        await self.start_run(interaction.guild.id, config)
+        await self.run_setup(interaction.guild, config, progress_embed, interaction.edit_original_response)
+
+    def compile_plan(self, guild, config, completed=()):
+        """Diff a setup config against the guild and return the API calls still needed
+
+        Each step is one creation or edit with the keys of the steps it depends
+        on; steps are grouped into waves whose dependencies all ran in earlier
+        waves. ``completed`` holds step IDs finished by an interrupted run, so
+        intro messages for channels it created are still posted.
+        """
+        # Name indexes built once; the first match wins, like discord.utils.get
+        resolved = {('role', '@everyone'): guild.default_role}
+        for role in guild.roles:
+            resolved.setdefault(('role', role.name), role)
+        for category in guild.categories:
+            resolved.setdefault(('category', category.name), category)
+        for channel in guild.channels:
+            resolved.setdefault(('channel', channel.name), channel)
+
+        steps = []
+        planned = set()
+        existing = 0
+
+        def add(step):
+            steps.append(step)
+            planned.add(step['key'])
+
+        def overwrite_spec(spec):
+            return {('role', name): perms for name, perms in spec.items() if ('role', name) in resolved or ('role', name) in planned}
+
+        def overwrite_steps(key, spec):
+            target = resolved[key]
+            changed = False
+            for role_key, perms in spec.items():
+                role = resolved.get(role_key)
+                if role is not None:
+                    current = target.overwrites_for(role)
+                    if all(getattr(current, perm) == value for perm, value in perms.items()):
+                        continue
+                changed = True
+                add({
+                    'key': ('overwrite', key, role_key), 'kind': 'overwrite', 'name': key[1], 'role': role_key, 'target': key,
+                    'perms': perms, 'deps': [role_key] if role_key in planned else [], 'calls': 1,
+                    'bucket': ('channel_permissions', target.id)
+                })
+            return changed
+
+        for name in config.get('roles', []):
+            key = ('role', name)
+            if key in resolved:
+                existing += 1
+            elif key not in planned:
+                add({'key': key, 'kind': 'role', 'name': name, 'deps': [], 'calls': 1, 'bucket': ('guild_roles', guild.id)})
+
+        for name in config.get('categories', []):
+            key = ('category', name)
+            spec = overwrite_spec(CATEGORY_OVERWRITES.get(name, {}))
+            if key in resolved:
+                if not overwrite_steps(key, spec):
+                    existing += 1
+            elif key not in planned:
+                add({
+                    'key': key, 'kind': 'category', 'name': name, 'overwrites': spec,
+                    'deps': [role_key for role_key in spec if role_key in planned], 'calls': 1,
+                    'bucket': ('guild_channels', guild.id)
+                })
+
+        for category_name, channel_list in config.get('channels', {}).items():
+            category_key = ('category', category_name)
+            for name in channel_list:
+                key = ('channel', name)
+                spec = overwrite_spec(CHANNEL_OVERWRITES.get(name, {}))
+                if key in resolved:
+                    changed = overwrite_steps(key, spec)
+                    if f"channel:{name}" in completed and name in INTRO_MESSAGES and f"intro:{name}" not in completed:
+                        add({'key': ('intro', name), 'kind': 'intro', 'name': name, 'deps': [], 'calls': INTRO_MESSAGES[name],
+                             'bucket': ('channel_messages', name)})
+                    elif not changed:
+                        existing += 1
+                elif key not in planned:
+                    deps = [role_key for role_key in spec if role_key in planned]
+                    if category_key in planned:
+                        deps.append(category_key)
+                    add({
+                        'key': key, 'kind': 'channel', 'name': name, 'category': category_key, 'overwrites': spec,
+                        'deps': deps, 'calls': 1, 'bucket': ('guild_channels', guild.id)
+                    })
+                    if name in INTRO_MESSAGES:
+                        add({'key': ('intro', name), 'kind': 'intro', 'name': name, 'deps': [key], 'calls': INTRO_MESSAGES[name],
+                             'bucket': ('channel_messages', name)})
+
+        # Steps only depend on earlier steps, so one pass assigns every wave
+        depth = {}
+        waves = []
+        for step in steps:
+            depth[step['key']] = level = max((depth[dep] + 1 for dep in step['deps']), default=0)
+            if level == len(waves):
+                waves.append([])
+            waves[level].append(step)
+
+        return {
+            'steps': steps,
+            'waves': waves,
+            'resolved': resolved,
+            'calls': sum(step['calls'] for step in steps),
+            'existing': existing
+        }
+
+    def step_id(self, step):
+        """Stable string ID recorded for a finished step"""
+        if step['kind'] == 'overwrite':
+            return f"overwrite:{step['target'][0]}:{step['name']}:{step['role'][1]}"
+        return f"{step['kind']}:{step['name']}"
+
+    def step_label(self, step):
+        """Human readable description of a step"""
+        if step['kind'] == 'overwrite':
+            return f"{step['name']} ({step['role'][1]})"
+        if step['kind'] == 'channel':
+            return f"#{step['name']}"
+        return step['name']
+
+    async def run_step(self, guild, step, resolved):
+        """Make the API call(s) for one step and record what it created"""
+        kind = step['kind']
+        name = step['name']
+        if kind == 'role':
+            resolved[step['key']] = await guild.create_role(
+                name=name,
+                color=ROLE_COLORS.get(name, discord.Color.default()),
+                reason=SETUP_REASON
+            )
+        elif kind in ('category', 'channel'):
+            overwrites = {resolved[role_key]: discord.PermissionOverwrite(**perms) for role_key, perms in step['overwrites'].items()}
+            if kind == 'category':
+                created = await guild.create_category(name, overwrites=overwrites, reason=SETUP_REASON)
+            else:
+                create = guild.create_voice_channel if name in VOICE_CHANNELS else guild.create_text_channel
+                created = await create(name, category=resolved.get(step['category']), overwrites=overwrites, reason=SETUP_REASON)
+            resolved[step['key']] = created
+        elif kind == 'overwrite':
+            target = resolved[step['target']]
+            role = resolved[step['role']]
+            overwrite = target.overwrites_for(role)
+            overwrite.update(**step['perms'])
+            await target.set_permissions(role, overwrite=overwrite, reason=SETUP_REASON)
+        elif kind == 'intro':
+            await self.setup_special_channel(resolved[('channel', name)], name)
+        return resolved.get(step['key'])
+
+    async def run_plan(self, guild, plan, progress_embed, edit):
+        """Run a compiled plan wave by wave through the bot's guild executor"""
         created_items = {
             'roles': [],
             'categories': [],
             'channels': [],
             'errors': []
         }
-        
+        resolved = plan['resolved']
+        failed = set()
+        done_calls = 0
+
+        for number, wave in enumerate(plan['waves'], start=1):
+            runnable = []
+            for step in wave:
+                missing = next((dep for dep in step['deps'] if dep in failed), None)
+                if missing:
+                    failed.add(step['key'])
+                    created_items['errors'].append(f"{self.step_label(step)}: skipped, {missing[1]} was not created")
+                else:
+                    runnable.append(step)
+
+            mutations = [
+                Mutation(step, step['bucket'], lambda step=step: self.run_step(guild, step, resolved))
+                for step in runnable
+            ]
+
+            async def progress(done, total):
+                progress_embed.set_field_at(
+                    0, name="Status",
+                    value=f"Step {number}/{len(plan['waves'])}: {done}/{total} changes ({done_calls} of {plan['calls']} API calls finished before this step)",
+                    inline=False
+                )
+                await edit(embed=progress_embed)
+
+            result = await self.bot.guild_executor.run(mutations, progress=progress)
+
+            finished = []
+            for step, value in result['succeeded']:
+                finished.append(self.step_id(step))
+                done_calls += step['calls']
+                if step['kind'] == 'role':
+                    created_items['roles'].append(value.name)
+                elif step['kind'] == 'category':
+                    created_items['categories'].append(value.name)
+                elif step['kind'] == 'channel':
+                    created_items['channels'].append(f"#{value.name}")
+            for step, error in result['failed']:
+                failed.add(step['key'])
+                created_items['errors'].append(f"{self.step_label(step)}: {str(error)}")
+
+            await self.save_progress(guild.id, finished)
+
+        return created_items
+
+    async def run_setup(self, guild, config, progress_embed, edit, completed=()):
+        """Compile the setup plan for a guild, run it and report the result"""
         try:
-            # Update progress
-            progress_embed.add_field(name="Status", value="Creating roles...", inline=False)
-            message = await interaction.edit_original_response(embed=progress_embed)
-            
-            # Create roles
-            role_colors = {
-                'Owner': discord.Color.red(),
-                'Admin': discord.Color.dark_red(),
-                'Moderator': discord.Color.orange(),
-                'Support Team': discord.Color.blue(),
-                'VIP': discord.Color.gold(),
-                'Members': discord.Color.green(),
-                'Bots': discord.Color.light_grey()
-            }
-            
-            for role_name in config.get('roles', []):
-                try:
-                    if not discord.utils.get(guild.roles, name=role_name):
-                        color = role_colors.get(role_name, discord.Color.default())
-                        role = await guild.create_role(
-                            name=role_name,
-                            color=color,
-                            reason="Server setup by Apple Bot"
-                        )
-                        created_items['roles'].append(role.name)
-                except Exception as e:
-                    created_items['errors'].append(f"Role {role_name}: {str(e)}")
-            
-            # Update progress
-            progress_embed.set_field_at(0, name="Status", value="Creating categories...", inline=False)
-            await message.edit(embed=progress_embed)
-            
-            # Create categories
-            for category_name in config.get('categories', []):
-                try:
-                    if not discord.utils.get(guild.categories, name=category_name):
-                        overwrites = self.get_category_permissions(guild, category_name)
-                        category = await guild.create_category(
-                            category_name,
-                            overwrites=overwrites,
-                            reason="Server setup by Apple Bot"
-                        )
-                        created_items['categories'].append(category.name)
-                except Exception as e:
-                    created_items['errors'].append(f"Category {category_name}: {str(e)}")
-            
-            # Update progress
-            progress_embed.set_field_at(0, name="Status", value="Creating channels...", inline=False)
-            await message.edit(embed=progress_embed)
-            
-            # Create channels
-            for category_name, channel_list in config.get('channels', {}).items():
-                category = discord.utils.get(guild.categories, name=category_name)
-                
-                for channel_name in channel_list:
-                    try:
-                        if not discord.utils.get(guild.channels, name=channel_name):
-                            overwrites = self.get_channel_permissions(guild, channel_name, category_name)
-                            
-                            if channel_name in ['General Voice', 'Music Room', 'Study Hall']:
-                                channel = await guild.create_voice_channel(
-                                    channel_name,
-                                    category=category,
-                                    overwrites=overwrites,
-                                    reason="Server setup by Apple Bot"
-                                )
-                            else:
-                                channel = await guild.create_text_channel(
-                                    channel_name,
-                                    category=category,
-                                    overwrites=overwrites,
-                                    reason="Server setup by Apple Bot"
-                                )
-                            
-                            created_items['channels'].append(f"#{channel.name}")
-                            
-                            # Set up special channels
-                            await self.setup_special_channel(channel, channel_name)
-                            
-                    except Exception as e:
-                        created_items['errors'].append(f"Channel {channel_name}: {str(e)}")
-            
+            plan = self.compile_plan(guild, config, completed)
+            progress_embed.add_field(
+                name="Status",
+                value=f"{len(plan['steps'])} changes planned ({plan['calls']} API calls)",
+                inline=False
+            )
+            await edit(embed=progress_embed)
+
+            created_items = await self.run_plan(guild, plan, progress_embed, edit)
+
             # Update database settings
             await self.update_guild_settings(guild, created_items)
-            
+
+            # Keep the run for `!serversetup resume` if anything failed
+            if not created_items['errors']:
+                await self.finish_run(guild.id)
+
             # Final success message
-            await self.send_completion_message(interaction, created_items, progress_embed)
-            
+            await self.send_completion_message(edit, created_items, progress_embed)
+
         except Exception as e:
             logger.error(f"Server setup error: {e}")
             error_embed = discord.Embed(
@@ -598,93 +856,97 @@ class ServerSetup(commands.Cog):
                 description=f"An error occurred during setup: {str(e)}",
                 color=discord.Color.red()
             )
-            await interaction.edit_original_response(embed=error_embed)
-    
-    def get_category_permissions(self, guild, category_name):
-        """Get appropriate permissions for category"""
-        overwrites = {}
-        
-        if category_name == "Staff Only":
-            # Staff only access
-            overwrites[guild.default_role] = discord.PermissionOverwrite(read_messages=False)
-            
-            for role_name in ["Owner", "Admin", "Moderator"]:
-                role = discord.utils.get(guild.roles, name=role_name)
-                if role:
-                    overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-        
-        elif category_name == "Support Tickets":
-            # Ticket system permissions
-            overwrites[guild.default_role] = discord.PermissionOverwrite(read_messages=False)
-            
-            support_role = discord.utils.get(guild.roles, name="Support Team")
-            if support_role:
-                overwrites[support_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-        
-        return overwrites
-    
-    def get_channel_permissions(self, guild, channel_name, category_name):
-        """Get appropriate permissions for specific channels"""
-        overwrites = {}
-        
-        if channel_name == "mod-logs":
-            # Mod logs - staff only
-            overwrites[guild.default_role] = discord.PermissionOverwrite(read_messages=False)
-            
-            for role_name in ["Owner", "Admin", "Moderator"]:
-                role = discord.utils.get(guild.roles, name=role_name)
-                if role:
-                    overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=False)
-        
-        elif channel_name == "announcements":
-            # Announcements - read only for members
-            overwrites[guild.default_role] = discord.PermissionOverwrite(send_messages=False)
-            
-            for role_name in ["Owner", "Admin", "Moderator"]:
-                role = discord.utils.get(guild.roles, name=role_name)
-                if role:
-                    overwrites[role] = discord.PermissionOverwrite(send_messages=True)
-        
-        return overwrites
-    
-    async def setup_special_channel(self, channel, channel_name):
-        """Set up special channel configurations"""
+            await edit(embed=error_embed)
+
+    async def load_run(self, guild_id):
+        """Get the unfinished setup run for a guild, if any"""
+        if not self.bot.db_pool:
+            return None
         try:
-            if channel_name == "counting":
-                embed = discord.Embed(
-                    title="🔢 Counting Channel",
-                    description="Start counting from 1! Each person can only send the next number.\n\nRules:\n• Count in order (1, 2, 3...)\n• One number per person\n• No text, just numbers",
-                    color=discord.Color.blue()
-                )
-                await channel.send(embed=embed)
-                await channel.send("1")
-            
-            elif channel_name == "suggestions":
-                embed = discord.Embed(
-                    title="💡 Suggestions",
-                    description="Share your ideas to improve the server!\n\nUse `/suggest <your idea>` to submit suggestions.",
-                    color=discord.Color.green()
-                )
-                await channel.send(embed=embed)
-            
-            elif channel_name == "general":
-                embed = discord.Embed(
-                    title="👋 Welcome to the Server!",
-                    description="This is the main chat channel. Feel free to introduce yourself and chat with other members!",
-                    color=discord.Color.blue()
-                )
-                await channel.send(embed=embed)
-            
-            elif channel_name == "bot-commands":
-                embed = discord.Embed(
-                    title="🤖 Bot Commands",
-                    description="Use this channel for bot commands to keep other channels clean.\n\nTry `/help` to see all available commands!",
-                    color=discord.Color.purple()
+            async with self.bot.db_pool.acquire() as conn:
+                return await conn.fetchrow("SELECT config, completed FROM server_setup_runs WHERE guild_id = $1", guild_id)
+        except Exception as e:
+            logger.error(f"Database error loading setup run: {e}")
+            return None
+
+    async def start_run(self, guild_id, config):
+        """Record a new setup run so it can be resumed if interrupted"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO server_setup_runs (guild_id, config)
+                    VALUES ($1, $2)
+                    ON CONFLICT (guild_id) DO UPDATE SET
+                        config = EXCLUDED.config,
+                        completed = '{}',
+                        started_at = NOW()
+                """, guild_id, json.dumps(config))
+        except Exception as e:
+            logger.error(f"Database error starting setup run: {e}")
+
+    async def save_progress(self, guild_id, step_ids):
+        """Append finished step IDs to the guild's setup run"""
+        if not self.bot.db_pool or not step_ids:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE server_setup_runs SET completed = completed || $2::TEXT[] WHERE guild_id = $1",
+                    guild_id, step_ids
                 )
-                await channel.send(embed=embed)
-        
         except Exception as e:
-            logger.error(f"Error setting up special channel {channel_name}: {e}")
+            logger.error(f"Database error saving setup progress: {e}")
+
+    async def finish_run(self, guild_id):
+        """Forget a setup run that completed cleanly"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute("DELETE FROM server_setup_runs WHERE guild_id = $1", guild_id)
+        except Exception as e:
+            logger.error(f"Database error finishing setup run: {e}")
+
+    async def setup_special_channel(self, channel, channel_name):
+        """Post the intro message(s) for a special channel
+
+        Errors are left to propagate so the setup step is reported as failed
+        and retried by `!serversetup resume` instead of being marked done.
+        """
+        if channel_name == "counting":
+            embed = discord.Embed(
+                title="🔢 Counting Channel",
+                description="Start counting from 1! Each person can only send the next number.\n\nRules:\n• Count in order (1, 2, 3...)\n• One number per person\n• No text, just numbers",
+                color=discord.Color.blue()
+            )
+            await channel.send(embed=embed)
+            await channel.send("1")
+        
+        elif channel_name == "suggestions":
+            embed = discord.Embed(
+                title="💡 Suggestions",
+                description="Share your ideas to improve the server!\n\nUse `/suggest <your idea>` to submit suggestions.",
+                color=discord.Color.green()
+            )
+            await channel.send(embed=embed)
+        
+        elif channel_name == "general":
+            embed = discord.Embed(
+                title="👋 Welcome to the Server!",
+                description="This is the main chat channel. Feel free to introduce yourself and chat with other members!",
+                color=discord.Color.blue()
+            )
+            await channel.send(embed=embed)
+        
+        elif channel_name == "bot-commands":
+            embed = discord.Embed(
+                title="🤖 Bot Commands",
+                description="Use this channel for bot commands to keep other channels clean.\n\nTry `/help` to see all available commands!",
+                color=discord.Color.purple()
+            )
+            await channel.send(embed=embed)
     
     async def update_guild_settings(self, guild, created_items):
         """Update guild settings in database"""
@@ -712,11 +974,18 @@ class ServerSetup(commands.Cog):
                 general_channel.id if general_channel else None,
                 counting_channel.id if counting_channel else None,
                 True)
+            self.bot.guild_settings.update(
+                guild.id,
+                log_channel=log_channel.id if log_channel else None,
+                general_channel=general_channel.id if general_channel else None,
+                counting_channel=counting_channel.id if counting_channel else None,
+                setup_completed=True
+            )
         
         except Exception as e:
             logger.error(f"Database error updating guild settings: {e}")
     
-    async def send_completion_message(self, interaction, created_items, progress_embed):
+    async def send_completion_message(self, edit, created_items, progress_embed):
         """Send setup completion message"""
         embed = discord.Embed(
             title="✅ Server Setup Complete!",
@@ -749,7 +1018,7 @@ class ServerSetup(commands.Cog):
         if created_items['errors']:
             embed.add_field(
                 name="⚠️ Warnings",
-                value=f"{len(created_items['errors'])} items already existed or had errors",
+                value=f"{len(created_items['errors'])} items had errors - run `!serversetup resume` to retry them",
                 inline=False
             )
         
@@ -761,7 +1030,9 @@ class ServerSetup(commands.Cog):
         
         embed.set_footer(text="Server setup completed by Apple Bot")
         
-        await interaction.edit_original_response(embed=embed)
+        await edit(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(ServerSetup(bot))
\ No newline at end of file
+    cog = ServerSetup(bot)
+    await cog.create_setup_tables()
+    await bot.add_cog(cog)
\ No newline at end of file
@@ -461,44 +461,27 @@ class Settings(commands.Cog):
                     ON CONFLICT (guild_id) DO UPDATE SET
                         {column} = EXCLUDED.{column}
                 """, guild_id, channel_id)
+            self.bot.guild_settings.update(guild_id, **{column: channel_id})
         
         except Exception as e:
             logger.error(f"Error updating channel setting: {e}")
     
     async def get_feature_settings(self, guild_id):
-        """Get feature settings from database"""
-        if not self.bot.db_pool:
-            return {"economy": True}  # Default: economy enabled
-        
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT economy_enabled, leveling_enabled, pets_enabled,
-                           welcome_enabled, automod_enabled, counting_enabled,
-                           suggestions_enabled, tickets_enabled, giveaways_enabled,
-                           music_enabled
-                    FROM guild_settings WHERE guild_id = $1
-                """, guild_id)
-                
-                if not row:
-                    return {"economy": True}  # Default: economy enabled
-                
-                return {
-                    "economy": row["economy_enabled"] if row["economy_enabled"] is not None else True,
-                    "leveling": row["leveling_enabled"] or False,
-                    "pets": row["pets_enabled"] or False,
-                    "welcome": row["welcome_enabled"] or False,
-                    "automod": row["automod_enabled"] or False,
-                    "counting": row["counting_enabled"] or False,
-                    "suggestions": row["suggestions_enabled"] or False,
-                    "tickets": row["tickets_enabled"] or False,
-                    "giveaways": row["giveaways_enabled"] or False,
-                    "music": row["music_enabled"] or False
-                }
-        
-        except Exception as e:
-            logger.error(f"Error getting feature settings: {e}")
-            return {"economy": True}  # Default: economy enabled
+        """Get feature settings from the guild settings cache"""
+        row = self.bot.guild_settings.get(guild_id)
+        
+        return {
+            "economy": row["economy_enabled"] if row["economy_enabled"] is not None else True,
+            "leveling": row["leveling_enabled"] or False,
+            "pets": row["pets_enabled"] or False,
+            "welcome": row["welcome_enabled"] or False,
+            "automod": row["automod_enabled"] or False,
+            "counting": row["counting_enabled"] or False,
+            "suggestions": row["suggestions_enabled"] or False,
+            "tickets": row["tickets_enabled"] or False,
+            "giveaways": row["giveaways_enabled"] or False,
+            "music": row["music_enabled"] or False
+        }
     
     async def update_feature_setting(self, guild_id, feature, enabled):
         """Update feature setting in database"""
@@ -530,6 +513,7 @@ class Settings(commands.Cog):
                     ON CONFLICT (guild_id) DO UPDATE SET
                         {column} = EXCLUDED.{column}
                 """, guild_id, enabled)
+            self.bot.guild_settings.update(guild_id, **{column: enabled})
         
         except Exception as e:
             logger.error(f"Error updating feature setting: {e}")
@@ -563,6 +547,7 @@ class Settings(commands.Cog):
                     ON CONFLICT (guild_id) DO UPDATE SET
                         {column} = EXCLUDED.{column}
                 """, guild_id, role_ids_json)
+            self.bot.guild_settings.update(guild_id, **{column: role_ids_json})
         
         except Exception as e:
             logger.error(f"Error updating role permissions: {e}")
@@ -581,34 +566,20 @@ class Settings(commands.Cog):
                         maintenance_mode = EXCLUDED.maintenance_mode,
                         maintenance_reason = EXCLUDED.maintenance_reason
                 """, guild_id, enabled, reason)
+            self.bot.guild_settings.update(guild_id, maintenance_mode=enabled, maintenance_reason=reason)
         
         except Exception as e:
             logger.error(f"Error updating maintenance mode: {e}")
     
     async def get_maintenance_status(self, guild_id):
-        """Get maintenance status from database"""
-        if not self.bot.db_pool:
-            return {"enabled": False, "reason": "", "started": None}
-        
-        try:
-            async with self.bot.db_pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT maintenance_mode, maintenance_reason, created_at
-                    FROM guild_settings WHERE guild_id = $1
-                """, guild_id)
-                
-                if not row:
-                    return {"enabled": False, "reason": "", "started": None}
-                
-                return {
-                    "enabled": row["maintenance_mode"] or False,
-                    "reason": row["maintenance_reason"] or "",
-                    "started": row["created_at"]
-                }
-        
-        except Exception as e:
-            logger.error(f"Error getting maintenance status: {e}")
-            return {"enabled": False, "reason": "", "started": None}
+        """Get maintenance status from the guild settings cache"""
+        row = self.bot.guild_settings.get(guild_id)
+        
+        return {
+            "enabled": row["maintenance_mode"] or False,
+            "reason": row["maintenance_reason"] or "",
+            "started": row["created_at"]
+        }
 
 async def setup(bot):
     await bot.add_cog(Settings(bot))
\ No newline at end of file
@@ -20,31 +20,31 @@ class SlashLogging(commands.Cog):
         if not interaction.guild or not self.bot.db_pool:
             return
             
-        # Get logging settings
+        # Get logging settings from the shared log settings cache
         try:
-            async with self.bot.db_pool.acquire() as conn:
-                settings = await conn.fetchrow(
-                    "SELECT * FROM log_settings WHERE guild_id = $1",
-                    interaction.guild.id
-                )
-                
-                if not settings or not settings.get('log_commands', True):
-                    return
-                
-                # Log to database
-                await conn.execute('''
-                    INSERT INTO command_usage_logs (guild_id, channel_id, user_id, username, command_name, command_args, command_type, success, error_message)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                ''', interaction.guild.id, interaction.channel.id, interaction.user.id, 
-                     str(interaction.user), interaction.command.name if interaction.command else 'unknown',
-                     str(interaction.data.get('options', [])), 'slash', success, error_message)
-                
-                # Get log channel
-                log_channel_id = settings.get('log_channel_id')
-                if log_channel_id:
-                    log_channel = self.bot.get_channel(log_channel_id)
-                    if log_channel:
-                        await self.send_slash_log_embed(log_channel, interaction, success, error_message)
+            settings = self.bot.log_settings.get(interaction.guild.id)
+            if not settings.get('log_commands', True):
+                return
+            
+            # Log to database through the shared batched log sink
+            self.bot.log_sink.submit('command_usage_logs', {
+                'guild_id': interaction.guild.id,
+                'channel_id': interaction.channel.id,
+                'user_id': interaction.user.id,
+                'username': str(interaction.user),
+                'command_name': interaction.command.name if interaction.command else 'unknown',
+                'command_args': str(interaction.data.get('options', [])),
+                'command_type': 'slash',
+                'success': success,
+                'error_message': error_message
+            })
+            
+            # Get log channel
+            log_channel_id = settings.get('log_channel_id')
+            if log_channel_id:
+                log_channel = self.bot.get_channel(log_channel_id)
+                if log_channel:
+                    await self.send_slash_log_embed(log_channel, interaction, success, error_message)
                         
         except Exception as e:
             self.logger.error(f"Failed to log slash command: {e}")
@@ -102,10 +102,7 @@ class SlashLogging(commands.Cog):
         
         embed.set_footer(text="Apple Bot Logging System")
         
-        try:
-            await log_channel.send(embed=embed)
-        except discord.HTTPException:
-            pass
+        self.bot.log_dispatcher.send(log_channel, embed)
     
     def format_slash_options(self, options):
         """Format slash command options for display"""
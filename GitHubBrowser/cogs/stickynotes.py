@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
 import logging
@@ -7,6 +7,13 @@ from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# A repost waits for this much quiet in the channel...
+STICKY_QUIET_SECONDS = 2
+# ...but never lets the sticky stay buried longer than this
+STICKY_MAX_STALENESS = 10
+# No repost while the sticky is still among this many most recent messages
+STICKY_VISIBLE_MESSAGES = 3
+
 class StickyNotes(commands.Cog):
     """Sticky note system - keeps messages pinned to the bottom of channels"""
     
@@ -16,8 +23,15 @@ class StickyNotes(commands.Cog):
         self.sticky_notes: Dict[int, dict] = {}
         # Track the last message in each channel to avoid infinite loops
         self.last_messages: Dict[int, int] = {}
-        # Initialize database tables
-        self.bot.loop.create_task(self.create_sticky_tables())
+        # Messages posted below each channel's sticky since it was last sent
+        self.messages_since_sticky: Dict[int, int] = {}
+        # One pending repost per channel: task plus first/last trigger times
+        self.repost_tasks: Dict[int, asyncio.Task] = {}
+        self.repost_first_seen: Dict[int, float] = {}
+        self.repost_last_seen: Dict[int, float] = {}
+        # Reposted message IDs waiting to be written: {channel_id: message_id}
+        self.pending_message_ids: Dict[int, int] = {}
+        self.flush_sticky_ids.start()
     
     async def create_sticky_tables(self):
         """Create sticky notes tables in database"""
@@ -52,7 +66,14 @@ class StickyNotes(commands.Cog):
                 logger.info(f"Loaded {len(rows)} sticky notes from database")
         except Exception as e:
             logger.error(f"Database error creating sticky tables: {e}")
-        
+    
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.flush_sticky_ids.cancel()
+        for task in self.repost_tasks.values():
+            task.cancel()
+        await self.write_pending_message_ids()
+    
     @commands.Cog.listener()
     async def on_message(self, message):
         """Handle sticky note reposting when new messages are sent"""
@@ -70,31 +91,68 @@ class StickyNotes(commands.Cog):
         if message.id == self.last_messages.get(channel_id):
             return
             
+        # Every message pushes the sticky further up
+        self.messages_since_sticky[channel_id] = self.messages_since_sticky.get(channel_id, 0) + 1
+        
         # Also check if the message content starts with ! to avoid reposting on commands
         if message.content.startswith('!'):
             return
+        
+        # Still visible near the bottom - nothing to do yet
+        if self.messages_since_sticky[channel_id] < STICKY_VISIBLE_MESSAGES:
+            return
+        
+        # Coalesce bursts into a single pending repost per channel
+        now = asyncio.get_running_loop().time()
+        self.repost_last_seen[channel_id] = now
+        task = self.repost_tasks.get(channel_id)
+        if task is None or task.done():
+            self.repost_first_seen[channel_id] = now
+            self.repost_tasks[channel_id] = asyncio.get_running_loop().create_task(self.repost_when_quiet(message.channel))
+    
+    async def repost_when_quiet(self, channel):
+        """Wait for the channel to go quiet (or the staleness deadline), then repost once"""
+        channel_id = channel.id
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                deadline = min(
+                    self.repost_last_seen[channel_id] + STICKY_QUIET_SECONDS,
+                    self.repost_first_seen[channel_id] + STICKY_MAX_STALENESS
+                )
+                delay = deadline - loop.time()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
             
-        # Wait a moment to avoid rate limiting and let other messages settle
-        await asyncio.sleep(2)
+            await self.repost_sticky(channel)
+        finally:
+            if self.repost_tasks.get(channel_id) is asyncio.current_task():
+                del self.repost_tasks[channel_id]
+    
+    async def repost_sticky(self, channel):
+        """Delete the old sticky by ID and send it again at the bottom"""
+        channel_id = channel.id
+        sticky_data = self.sticky_notes.get(channel_id)
+        if not sticky_data:
+            return
         
         try:
-            # Verify the channel still exists and we have permission
-            if not message.channel.permissions_for(message.guild.me).send_messages:
+            # Verify we still have permission
+            if not channel.permissions_for(channel.guild.me).send_messages:
                 return
-                
-            # Delete the old sticky note
-            sticky_data = self.sticky_notes[channel_id]
+            
+            # Delete the old sticky note without fetching it first
             if sticky_data.get('message_id'):
                 try:
-                    old_message = await message.channel.fetch_message(sticky_data['message_id'])
-                    await old_message.delete()
+                    await channel.get_partial_message(sticky_data['message_id']).delete()
                 except discord.NotFound:
                     pass  # Message already deleted
                 except discord.Forbidden:
                     logger.warning(f"No permission to delete old sticky note in channel {channel_id}")
                 except Exception as e:
                     logger.error(f"Error deleting old sticky note: {e}")
-                    
+            
             # Send the new sticky note
             embed = discord.Embed(
                 title="📌 Sticky Note",
@@ -108,15 +166,14 @@ class StickyNotes(commands.Cog):
                 embed.set_footer(text=f"Sticky note by {author.display_name}", icon_url=author.avatar.url if author.avatar else None)
             else:
                 embed.set_footer(text="Sticky note")
-                
-            new_sticky = await message.channel.send(embed=embed)
             
-            # Update stored data
-            self.sticky_notes[channel_id]['message_id'] = new_sticky.id
-            self.last_messages[channel_id] = new_sticky.id
+            new_sticky = await channel.send(embed=embed)
             
-            # Update database
-            await self.update_sticky_in_db(channel_id, new_sticky.id)
+            # Update stored data; the database write is batched
+            sticky_data['message_id'] = new_sticky.id
+            self.last_messages[channel_id] = new_sticky.id
+            self.messages_since_sticky[channel_id] = 0
+            self.pending_message_ids[channel_id] = new_sticky.id
             
             logger.debug(f"Reposted sticky note in channel {channel_id}")
             
@@ -125,17 +182,41 @@ class StickyNotes(commands.Cog):
         except Exception as e:
             logger.error(f"Error reposting sticky note in channel {channel_id}: {e}")
     
-    async def update_sticky_in_db(self, channel_id: int, message_id: int):
-        """Update sticky note message ID in database"""
-        if not self.bot.db_pool:
+    def reset_sticky_state(self, channel_id: int):
+        """Drop any pending repost and message ID write after a sticky is replaced or removed"""
+        task = self.repost_tasks.pop(channel_id, None)
+        if task:
+            task.cancel()
+        self.pending_message_ids.pop(channel_id, None)
+        self.messages_since_sticky[channel_id] = 0
+    
+    async def write_pending_message_ids(self):
+        """Write every reposted sticky message ID in one statement"""
+        if not self.pending_message_ids or not self.bot.db_pool:
             return
+        pending, self.pending_message_ids = self.pending_message_ids, {}
         try:
             async with self.bot.db_pool.acquire() as conn:
                 await conn.execute("""
-                    UPDATE sticky_notes SET message_id = $1 WHERE channel_id = $2
-                """, message_id, channel_id)
+                    UPDATE sticky_notes s SET message_id = v.message_id
+                    FROM unnest($1::BIGINT[], $2::BIGINT[]) AS v(channel_id, message_id)
+                    WHERE s.channel_id = v.channel_id
+                """, list(pending), list(pending.values()))
         except Exception as e:
-            logger.error(f"Database error updating sticky note: {e}")
+            logger.error(f"Database error updating sticky notes: {e}")
+            # Keep newer reposts made while this write was running
+            for channel_id, message_id in pending.items():
+                self.pending_message_ids.setdefault(channel_id, message_id)
+    
+    @tasks.loop(seconds=5)
+    async def flush_sticky_ids(self):
+        """Periodically persist reposted sticky message IDs"""
+        await self.write_pending_message_ids()
+    
+    @flush_sticky_ids.before_loop
+    async def before_flush_sticky_ids(self):
+        """Wait for bot to be ready before starting task"""
+        await self.bot.wait_until_ready()
     
     async def show_sticky_commands(self, ctx):
         """Display all available sticky note commands"""
@@ -229,8 +310,7 @@ class StickyNotes(commands.Cog):
             old_sticky_id = self.sticky_notes[channel_id].get('message_id')
             if old_sticky_id:
                 try:
-                    old_message = await ctx.channel.fetch_message(old_sticky_id)
-                    await old_message.delete()
+                    await ctx.channel.get_partial_message(old_sticky_id).delete()
                 except discord.NotFound:
                     pass  # Already deleted
                 except discord.Forbidden:
@@ -255,6 +335,7 @@ class StickyNotes(commands.Cog):
                 'author_id': ctx.author.id
             }
             self.last_messages[channel_id] = sticky_message.id
+            self.reset_sticky_state(channel_id)
             
             # Save to database
             await self.save_sticky_to_db(channel_id, ctx.guild.id, message, sticky_message.id, ctx.author.id)
@@ -321,8 +402,7 @@ class StickyNotes(commands.Cog):
         sticky_data = self.sticky_notes[channel_id]
         if sticky_data.get('message_id'):
             try:
-                sticky_message = await ctx.channel.fetch_message(sticky_data['message_id'])
-                await sticky_message.delete()
+                await ctx.channel.get_partial_message(sticky_data['message_id']).delete()
             except discord.NotFound:
                 pass  # Already deleted
             except discord.Forbidden:
@@ -330,6 +410,8 @@ class StickyNotes(commands.Cog):
                 return
         
         # Remove from storage
+        self.reset_sticky_state(channel_id)
+        self.messages_since_sticky.pop(channel_id, None)
         del self.sticky_notes[channel_id]
         if channel_id in self.last_messages:
             del self.last_messages[channel_id]
@@ -405,8 +487,7 @@ class StickyNotes(commands.Cog):
             old_sticky_id = self.sticky_notes[channel_id].get('message_id')
             if old_sticky_id:
                 try:
-                    old_message = await interaction.channel.fetch_message(old_sticky_id)
-                    await old_message.delete()
+                    await interaction.channel.get_partial_message(old_sticky_id).delete()
                 except discord.NotFound:
                     pass
                 except discord.Forbidden:
@@ -431,6 +512,7 @@ class StickyNotes(commands.Cog):
                 'author_id': interaction.user.id
             }
             self.last_messages[channel_id] = sticky_message.id
+            self.reset_sticky_state(channel_id)
             
             # Save to database
             await self.save_sticky_to_db(channel_id, interaction.guild.id, message, sticky_message.id, interaction.user.id)
@@ -493,4 +575,6 @@ class StickyNotes(commands.Cog):
         await ctx.send(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(StickyNotes(bot))
\ No newline at end of file
+    cog = StickyNotes(bot)
+    await cog.create_sticky_tables()
+    await bot.add_cog(cog)
\ No newline at end of file
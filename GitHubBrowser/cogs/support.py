@@ -5,6 +5,7 @@ import asyncio
 import logging
 from datetime import datetime
 import json
+from transcripts import build_transcript, history_entries, logged_entries
 
 logger = logging.getLogger(__name__)
 
@@ -203,51 +204,26 @@ class TicketDashboard(discord.ui.View):
         await interaction.response.defer(ephemeral=True)
         
         channel = interaction.channel
-        messages = []
-        
-        async for message in channel.history(limit=None, oldest_first=True):
-            if not message.author.bot or message.embeds or message.attachments:
-                timestamp = message.created_at.strftime("%Y-%m-%d %H:%M:%S UTC")
-                content = message.content if message.content else "[No text content]"
-                
-                # Handle embeds
-                if message.embeds:
-                    for embed in message.embeds:
-                        content += f"\n[EMBED: {embed.title or 'No title'}]"
-                
-                # Handle attachments
-                if message.attachments:
-                    for attachment in message.attachments:
-                        content += f"\n[ATTACHMENT: {attachment.filename}]"
-                
-                messages.append(f"[{timestamp}] {message.author}: {content}")
-        
-        # Create transcript content
-        transcript_content = f"# Support Ticket Transcript\n"
-        transcript_content += f"**Channel:** #{channel.name}\n"
-        transcript_content += f"**Created:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
-        transcript_content += f"**Messages:** {len(messages)}\n\n"
-        transcript_content += "---\n\n"
-        transcript_content += "\n".join(messages)
-        
-        # Create file
-        import io
-        transcript_file = discord.File(
-            io.StringIO(transcript_content),
-            filename=f"transcript-{channel.name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.txt"
-        )
-        
-        # Send to user
-        await interaction.followup.send(
-            "📄 Here's your ticket transcript:",
-            file=transcript_file,
-            ephemeral=True
-        )
-        
-        # Also send to moderation log channel if it exists
         support_cog = interaction.client.get_cog('Support')
-        if support_cog:
-            await support_cog._send_transcript_to_log(interaction.guild, channel, transcript_content)
+        if not support_cog:
+            await interaction.followup.send("❌ Support system unavailable.", ephemeral=True)
+            return
+        
+        # Rendered once, then attached for the user and the log channel
+        transcript = await support_cog.build_ticket_transcript(channel, "Transcript requested")
+        try:
+            batches = transcript.attachments(interaction.guild.filesize_limit)
+            for index, files in enumerate(batches):
+                await interaction.followup.send(
+                    "📄 Here's your ticket transcript:" if index == 0 else "📄 Transcript (continued):",
+                    files=files,
+                    ephemeral=True
+                )
+            
+            # Also send to moderation log channel if it exists
+            await support_cog._send_transcript_to_log(interaction.guild, channel, transcript)
+        finally:
+            transcript.close()
     
     def _has_permission(self, interaction):
         """Check if user has permission to manage ticket"""
@@ -489,43 +465,34 @@ class Support(commands.Cog):
             logger.error(f"Database error getting ticket stats: {e}")
             await interaction.response.send_message("❌ Error retrieving ticket statistics.", ephemeral=True)
     
+    async def build_ticket_transcript(self, channel, action):
+        """Stream a ticket channel's history into a rendered transcript"""
+        header = {
+            'Channel': f"#{channel.name}",
+            'Action': action,
+            'Generated': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        }
+        # Prefer the message log when this guild records messages; fall back to API history
+        settings = self.bot.log_settings.get(channel.guild.id)
+        if self.bot.db_pool and settings.get('log_messages', True):
+            entries = logged_entries(self.bot, channel)
+        else:
+            entries = history_entries(channel)
+        return await build_transcript(channel.name, header, entries)
+    
     async def _generate_and_log_transcript(self, channel, guild, action_type):
         """Generate transcript and send to moderation log channel"""
         try:
-            # Generate transcript content
-            messages = []
-            async for message in channel.history(limit=None, oldest_first=True):
-                if not message.author.bot or message.embeds or message.attachments:
-                    timestamp = message.created_at.strftime("%Y-%m-%d %H:%M:%S UTC")
-                    content = message.content if message.content else "[No text content]"
-                    
-                    # Handle embeds
-                    if message.embeds:
-                        for embed in message.embeds:
-                            content += f"\n[EMBED: {embed.title or 'No title'}]"
-                    
-                    # Handle attachments
-                    if message.attachments:
-                        for attachment in message.attachments:
-                            content += f"\n[ATTACHMENT: {attachment.filename}]"
-                    
-                    messages.append(f"[{timestamp}] {message.author}: {content}")
-            
-            # Create transcript content
-            transcript_content = f"# Support Ticket Transcript\n"
-            transcript_content += f"**Channel:** #{channel.name}\n"
-            transcript_content += f"**Action:** Ticket {action_type}\n"
-            transcript_content += f"**Generated:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
-            transcript_content += f"**Messages:** {len(messages)}\n\n"
-            transcript_content += "---\n\n"
-            transcript_content += "\n".join(messages)
-            
-            await self._send_transcript_to_log(guild, channel, transcript_content)
+            transcript = await self.build_ticket_transcript(channel, f"Ticket {action_type}")
+            try:
+                await self._send_transcript_to_log(guild, channel, transcript)
+            finally:
+                transcript.close()
             
         except Exception as e:
             logger.error(f"Error generating transcript for log: {e}")
     
-    async def _send_transcript_to_log(self, guild, ticket_channel, transcript_content):
+    async def _send_transcript_to_log(self, guild, ticket_channel, transcript):
         """Send transcript to moderation log channel"""
         try:
             # Find moderation log channel
@@ -538,29 +505,15 @@ class Support(commands.Cog):
                 if log_channel:
                     break
             
-            # Try to get from database if available
-            if not log_channel and self.bot.db_pool:
-                try:
-                    async with self.bot.db_pool.acquire() as conn:
-                        log_channel_id = await conn.fetchval(
-                            "SELECT log_channel FROM guild_settings WHERE guild_id = $1",
-                            guild.id
-                        )
-                        if log_channel_id:
-                            log_channel = guild.get_channel(log_channel_id)
-                except Exception as e:
-                    logger.error(f"Database error getting log channel: {e}")
+            # Fall back to the configured log channel from guild settings
+            if not log_channel:
+                log_channel_id = self.bot.guild_settings.get_value(guild.id, 'log_channel')
+                if log_channel_id:
+                    log_channel = guild.get_channel(log_channel_id)
             
             if not log_channel:
                 return  # No log channel found
             
-            # Create transcript file
-            import io
-            transcript_file = discord.File(
-                io.StringIO(transcript_content),
-                filename=f"transcript-{ticket_channel.name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.txt"
-            )
-            
             # Create log embed
             embed = discord.Embed(
                 title="🎫 Ticket Transcript",
@@ -571,11 +524,15 @@ class Support(commands.Cog):
             
             embed.add_field(name="Channel", value=f"#{ticket_channel.name}", inline=True)
             embed.add_field(name="Category", value=ticket_channel.category.name if ticket_channel.category else "None", inline=True)
-            embed.add_field(name="Messages", value=str(transcript_content.count('\n[2')), inline=True)
+            embed.add_field(name="Messages", value=str(transcript.message_count), inline=True)
             
             embed.set_footer(text="Automatic ticket transcript")
             
-            await log_channel.send(embed=embed, file=transcript_file)
+            # Large transcripts are gzipped and split across messages to fit the upload limit
+            batches = transcript.attachments(guild.filesize_limit)
+            await log_channel.send(embed=embed, files=batches[0] if batches else None)
+            for files in batches[1:]:
+                await log_channel.send(files=files)
             
         except Exception as e:
             logger.error(f"Error sending transcript to log channel: {e}")
@@ -2,14 +2,36 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Reminders due within this many seconds are held in memory; later ones stay in the database
+REMINDER_WINDOW_SECONDS = 3600
+
+EPOCH = datetime(1970, 1, 1)
+
 class Utility(commands.Cog):
     """Core utility functionality"""
     
     def __init__(self, bot):
         self.bot = bot
+        # Due reminders min-heap: (remind_at epoch, id, row)
+        self.reminder_heap = []
+        self.scheduled_reminders = set()
+        # Reminders due before this epoch time are loaded into the heap
+        self.reminder_window_end = 0
+        self.reminder_wakeup = asyncio.Event()
+        # IDs for reminders kept in memory only when there is no database
+        self.memory_reminder_ids = itertools.count(-1, -1)
+        self.reminder_task = asyncio.get_running_loop().create_task(self.run_reminders())
+    
+    async def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.reminder_task.cancel()
     
     async def create_utility_tables(self):
         """Create utility tables in database"""
@@ -27,6 +49,148 @@ class Utility(commands.Cog):
                 """)
         except Exception as e:
             logger.error(f"Database error in utility: {e}")
+        
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                # Timers are stored as reminders that edit their original message
+                await conn.execute("ALTER TABLE reminders ADD COLUMN IF NOT EXISTS kind VARCHAR(20) DEFAULT 'reminder'")
+                await conn.execute("ALTER TABLE reminders ADD COLUMN IF NOT EXISTS message_id BIGINT")
+                await conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_remind_at ON reminders (remind_at)")
+        except Exception as e:
+            logger.error(f"Database error creating reminder columns: {e}")
+    
+    async def schedule_reminder(self, user_id, channel_id, message, seconds, kind='reminder', message_id=None):
+        """Store a reminder and schedule it; returns the epoch time it fires"""
+        remind_at = time.time() + seconds
+        row = {
+            'user_id': user_id,
+            'channel_id': channel_id,
+            'message': message,
+            'kind': kind,
+            'message_id': message_id
+        }
+        
+        if self.bot.db_pool:
+            async with self.bot.db_pool.acquire() as conn:
+                row['id'] = await conn.fetchval("""
+                    INSERT INTO reminders (user_id, channel_id, message, remind_at, kind, message_id)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    RETURNING id
+                """, user_id, channel_id, message, datetime.utcfromtimestamp(remind_at), kind, message_id)
+        else:
+            row['id'] = next(self.memory_reminder_ids)
+        
+        # Later reminders are picked up when their window loads
+        if remind_at <= self.reminder_window_end or not self.bot.db_pool:
+            self.push_reminder(remind_at, row)
+        return remind_at
+    
+    def push_reminder(self, remind_at, row):
+        """Add a reminder to the heap and wake the sleeper if it is now the earliest"""
+        if row['id'] in self.scheduled_reminders:
+            return
+        self.scheduled_reminders.add(row['id'])
+        heapq.heappush(self.reminder_heap, (remind_at, row['id'], row))
+        if self.reminder_heap[0][1] == row['id']:
+            self.reminder_wakeup.set()
+    
+    async def load_reminder_window(self):
+        """Bulk-load every stored reminder due before the end of the next window"""
+        window_end = time.time() + REMINDER_WINDOW_SECONDS
+        # Moved up before querying, so reminders created while the query runs are pushed
+        # by schedule_reminder; anything also returned here is skipped as a duplicate
+        previous_end, self.reminder_window_end = self.reminder_window_end, window_end
+        if self.bot.db_pool:
+            try:
+                async with self.bot.db_pool.acquire() as conn:
+                    rows = await conn.fetch("""
+                        SELECT id, user_id, channel_id, message, remind_at, kind, message_id
+                        FROM reminders WHERE remind_at <= $1
+                    """, datetime.utcfromtimestamp(window_end))
+            except Exception:
+                self.reminder_window_end = previous_end
+                raise
+            for row in rows:
+                self.push_reminder((row['remind_at'] - EPOCH).total_seconds(), dict(row))
+    
+    async def run_reminders(self):
+        """Single sleeper that wakes for the next due reminder"""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                now = time.time()
+                if now >= self.reminder_window_end:
+                    await self.load_reminder_window()
+                
+                due = []
+                while self.reminder_heap and self.reminder_heap[0][0] <= now:
+                    due.append(heapq.heappop(self.reminder_heap))
+                if due:
+                    await self.deliver_reminders(due)
+                    continue
+                
+                next_at = self.reminder_window_end
+                if self.reminder_heap:
+                    next_at = min(next_at, self.reminder_heap[0][0])
+                self.reminder_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.reminder_wakeup.wait(), timeout=max(0, next_at - now))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in reminder scheduler: {e}")
+                await asyncio.sleep(5)
+    
+    async def deliver_reminders(self, due):
+        """Claim due (remind_at, id, row) heap entries in one statement, then send them concurrently"""
+        ids = [reminder_id for _, reminder_id, _ in due]
+        self.scheduled_reminders.difference_update(ids)
+        rows = [row for _, _, row in due]
+        
+        stored = [reminder_id for reminder_id in ids if reminder_id > 0]
+        if stored and self.bot.db_pool:
+            try:
+                async with self.bot.db_pool.acquire() as conn:
+                    claimed = await conn.fetch("DELETE FROM reminders WHERE id = ANY($1::INT[]) RETURNING id", stored)
+            except Exception:
+                # Back on the heap so the scheduler retries them rather than the next window load
+                for remind_at, _, row in due:
+                    self.push_reminder(remind_at, row)
+                raise
+            claimed = {row['id'] for row in claimed}
+            rows = [row for row in rows if row['id'] < 0 or row['id'] in claimed]
+        
+        await asyncio.gather(*(self.send_reminder(row) for row in rows))
+    
+    async def send_reminder(self, row):
+        """Send a single due reminder or finish a timer"""
+        channel = self.bot.get_channel(row['channel_id'])
+        if channel is None:
+            return
+        try:
+            if row['kind'] == 'timer':
+                embed = discord.Embed(
+                    title="⏰ Time's Up!",
+                    description=f"<@{row['user_id']}>, your timer has finished!",
+                    color=0xff0000
+                )
+                try:
+                    await channel.get_partial_message(row['message_id']).edit(embed=embed)
+                    return
+                except discord.HTTPException:
+                    pass
+                await channel.send(embed=embed)
+            else:
+                embed = discord.Embed(
+                    title="⏰ Reminder",
+                    description=f"<@{row['user_id']}>, you asked me to remind you about: {row['message']}",
+                    color=0xffff00
+                )
+                await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to deliver reminder {row['id']}: {e}")
 
     @commands.command(name="calculator")
     async def calculator(self, ctx, *, expression: str):
@@ -148,27 +312,19 @@ class Utility(commands.Cog):
                 await ctx.send("❌ Reminder cannot be longer than 7 days!")
                 return
             
+            remind_at = await self.schedule_reminder(ctx.author.id, ctx.channel.id, reminder, seconds)
+            
             embed = discord.Embed(
                 title="⏰ Reminder Set",
                 description=f"I'll remind you about: {reminder}",
                 color=0x00ff00
             )
-            embed.add_field(name="Time", value=f"{amount}{unit}", inline=True)
+            embed.add_field(name="Time", value=f"{amount}{unit} (<t:{int(remind_at)}:R>)", inline=True)
             
             await ctx.send(embed=embed)
             
-            # Wait and send reminder
-            await asyncio.sleep(seconds)
-            
-            reminder_embed = discord.Embed(
-                title="⏰ Reminder",
-                description=f"{ctx.author.mention}, you asked me to remind you about: {reminder}",
-                color=0xffff00
-            )
-            
-            await ctx.send(embed=reminder_embed)
-            
         except Exception as e:
+            logger.error(f"Error setting reminder: {e}")
             await ctx.send("❌ Error setting reminder!")
     
     @commands.command(name="timer")
@@ -196,36 +352,17 @@ class Utility(commands.Cog):
                 description=f"Timer set for {amount}{unit}",
                 color=0x00ff00
             )
+            # Discord renders the countdown client-side; the scheduler edits the message when it ends
+            embed.add_field(name="Ends", value=f"<t:{int(time.time() + seconds)}:R>", inline=True)
             
             message = await ctx.send(embed=embed)
-            
-            # Update every 10 seconds for timers > 30 seconds
-            if seconds > 30:
-                while seconds > 0:
-                    if seconds <= 10:
-                        break
-                    await asyncio.sleep(10)
-                    seconds -= 10
-                    
-                    embed = discord.Embed(
-                        title="⏱️ Timer Running",
-                        description=f"Time remaining: {seconds}s",
-                        color=0xffff00
-                    )
-                    await message.edit(embed=embed)
-            
-            # Final countdown
-            await asyncio.sleep(seconds)
-            
-            embed = discord.Embed(
-                title="⏰ Time's Up!",
-                description=f"{ctx.author.mention}, your timer has finished!",
-                color=0xff0000
+            await self.schedule_reminder(
+                ctx.author.id, ctx.channel.id, f"Timer ({amount}{unit})", seconds,
+                kind='timer', message_id=message.id
             )
             
-            await message.edit(embed=embed)
-            
         except Exception as e:
+            logger.error(f"Error starting timer: {e}")
             await ctx.send("❌ Error starting timer!")
     
     @commands.command(name="qr")
@@ -318,4 +455,6 @@ class Utility(commands.Cog):
         await ctx.send(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(Utility(bot))
\ No newline at end of file
+    cog = Utility(bot)
+    await cog.create_utility_tables()
+    await bot.add_cog(cog)
\ No newline at end of file
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Buckets long enough to be worth surviving a restart; everything else is memory-only
+PERSISTENT_BUCKETS = {'daily', 'work'}
+
+UPSERT_COOLDOWNS = '''
+    INSERT INTO cooldowns (bucket, scope_id, user_id, expires_at)
+    SELECT * FROM unnest($1::VARCHAR[], $2::BIGINT[], $3::BIGINT[], $4::TIMESTAMP[])
+    ON CONFLICT (bucket, scope_id, user_id) DO UPDATE SET expires_at = EXCLUDED.expires_at
+'''
+
+DELETE_COOLDOWNS = '''
+    DELETE FROM cooldowns
+    WHERE (bucket, scope_id, user_id) IN (
+        SELECT * FROM unnest($1::VARCHAR[], $2::BIGINT[], $3::BIGINT[])
+    )
+'''
+
+class CooldownService:
+    """Process-wide cooldown tracker shared by every cog
+
+    Cooldowns are keyed by (bucket, scope_id, user_id), where scope_id is a
+    guild ID or 0 for global cooldowns. Checks are a single dict lookup;
+    expired entries are evicted from a min-heap of expiry times. Buckets in
+    PERSISTENT_BUCKETS are written to the cooldowns table in batches and
+    reloaded on startup.
+    """
+
+    def __init__(self, bot, flush_interval=5.0):
+        self.bot = bot
+        self.flush_interval = flush_interval
+        # Active cooldowns: {(bucket, scope_id, user_id): expires_at (epoch seconds)}
+        self._expires = {}
+        # Expiry min-heap of (expires_at, key); entries are skipped if superseded
+        self._heap = []
+        # Persistent keys changed since the last flush: {key: expires_at or None to delete}
+        self._dirty = {}
+        self._task = None
+        self._closing = False
+        self._wakeup = asyncio.Event()
+
+    async def load(self):
+        """Create the cooldowns table and load unexpired persistent cooldowns"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute('''
+                    CREATE TABLE IF NOT EXISTS cooldowns (
+                        bucket VARCHAR(50) NOT NULL,
+                        scope_id BIGINT NOT NULL,
+                        user_id BIGINT NOT NULL,
+                        expires_at TIMESTAMP NOT NULL,
+                        PRIMARY KEY (bucket, scope_id, user_id)
+                    )
+                ''')
+                await conn.execute("DELETE FROM cooldowns WHERE expires_at <= NOW() AT TIME ZONE 'UTC'")
+                rows = await conn.fetch("SELECT bucket, scope_id, user_id, expires_at FROM cooldowns")
+
+            for row in rows:
+                expires_at = row['expires_at'].replace(tzinfo=None) - datetime(1970, 1, 1)
+                self._set((row['bucket'], row['scope_id'], row['user_id']), expires_at.total_seconds())
+
+            logger.info(f"Loaded {len(rows)} persistent cooldowns")
+        except Exception as e:
+            logger.error(f"Failed to load cooldowns: {e}")
+
+    def start(self):
+        """Start the background flush task for persistent cooldowns"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._wakeup.clear()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def remaining(self, bucket, scope_id, user_id):
+        """Seconds left on a cooldown, or 0 if it is not active"""
+        expires_at = self._expires.get((bucket, scope_id, user_id))
+        if expires_at is None:
+            return 0
+        return max(0.0, expires_at - time.time())
+
+    def acquire(self, bucket, scope_id, user_id, seconds):
+        """Start a cooldown if none is active; returns False if still cooling down"""
+        self._evict()
+        if self.remaining(bucket, scope_id, user_id):
+            return False
+        self.set_until(bucket, scope_id, user_id, time.time() + seconds)
+        return True
+
+    def set_until(self, bucket, scope_id, user_id, expires_at):
+        """Force a cooldown to end at an epoch timestamp"""
+        key = (bucket, scope_id, user_id)
+        self._set(key, expires_at)
+        if bucket in PERSISTENT_BUCKETS:
+            self._dirty[key] = expires_at
+
+    def reset(self, bucket, scope_id, user_id):
+        """Clear a cooldown"""
+        key = (bucket, scope_id, user_id)
+        if self._expires.pop(key, None) is not None and bucket in PERSISTENT_BUCKETS:
+            self._dirty[key] = None
+
+    def __len__(self):
+        return len(self._expires)
+
+    def _set(self, key, expires_at):
+        self._expires[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+
+    def _evict(self):
+        """Drop every cooldown that has expired"""
+        now = time.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+
+    async def flush(self):
+        """Write changed persistent cooldowns to the database"""
+        if not self._dirty or not self.bot.db_pool:
+            return
+        dirty, self._dirty = self._dirty, {}
+
+        upserts = [(key, expires_at) for key, expires_at in dirty.items() if expires_at is not None]
+        deletes = [key for key, expires_at in dirty.items() if expires_at is None]
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                if upserts:
+                    await conn.execute(
+                        UPSERT_COOLDOWNS,
+                        [key[0] for key, _ in upserts],
+                        [key[1] for key, _ in upserts],
+                        [key[2] for key, _ in upserts],
+                        [datetime.utcfromtimestamp(expires_at) for _, expires_at in upserts]
+                    )
+                if deletes:
+                    await conn.execute(
+                        DELETE_COOLDOWNS,
+                        [key[0] for key in deletes],
+                        [key[1] for key in deletes],
+                        [key[2] for key in deletes]
+                    )
+        except Exception as e:
+            logger.error(f"Failed to persist {len(dirty)} cooldowns: {e}")
+            # Keep newer changes made while this flush was running
+            for key, expires_at in dirty.items():
+                self._dirty.setdefault(key, expires_at)
+
+    async def close(self):
+        """Stop the flush task and persist anything still pending"""
+        # Stopped rather than cancelled so a flush in progress finishes instead of losing its batch
+        self._closing = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Cooldown task failed during shutdown: {e}")
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        """Flush persistent cooldowns and evict expired ones on a timer"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._closing:
+                break
+            self._evict()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Cooldown flush error: {e}")
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+UPSERT_SESSIONS = '''
+    INSERT INTO game_sessions (kind, session_key, state, updated_at)
+    SELECT $1, key, state, NOW() AT TIME ZONE 'UTC' FROM unnest($2::TEXT[], $3::TEXT[]) AS s(key, state)
+    ON CONFLICT (kind, session_key) DO UPDATE SET state = EXCLUDED.state, updated_at = EXCLUDED.updated_at
+'''
+
+# Tic-tac-toe winning lines as board indexes
+WINNING_LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+
+class HangmanGame:
+    """Hangman state; guessed letters are a 26-bit mask"""
+
+    __slots__ = ('word', 'guessed_mask', 'wrong_guesses', 'max_wrong')
+
+    def __init__(self, word, guessed_mask=0, wrong_guesses=0, max_wrong=6):
+        self.word = word
+        self.guessed_mask = guessed_mask
+        self.wrong_guesses = wrong_guesses
+        self.max_wrong = max_wrong
+
+    def has_guessed(self, letter):
+        return bool(self.guessed_mask >> (ord(letter) - 65) & 1)
+
+    def guess(self, letter):
+        """Record an uppercase letter guess"""
+        self.guessed_mask |= 1 << (ord(letter) - 65)
+        if letter not in self.word:
+            self.wrong_guesses += 1
+
+    @property
+    def guessed(self):
+        """Guessed letters in alphabetical order"""
+        return [chr(65 + bit) for bit in range(26) if self.guessed_mask >> bit & 1]
+
+    @property
+    def solved(self):
+        return all(self.has_guessed(letter) for letter in self.word)
+
+    def to_dict(self):
+        return {'word': self.word, 'guessed_mask': self.guessed_mask, 'wrong_guesses': self.wrong_guesses, 'max_wrong': self.max_wrong}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+class TicTacToeGame:
+    """Tic-tac-toe state on a 9-byte board (0 empty, 1 X, 2 O)"""
+
+    __slots__ = ('channel_id', 'players', 'turn', 'board', 'session')
+
+    SYMBOLS = " XO"
+
+    def __init__(self, channel_id, players, turn=0, board=None):
+        self.channel_id = channel_id
+        # (X player ID, O player ID)
+        self.players = tuple(players)
+        self.turn = turn
+        self.board = bytearray(board or 9)
+        # Input router session, reopened after a restart
+        self.session = None
+
+    @property
+    def current_player(self):
+        return self.players[self.turn]
+
+    def symbol_for(self, user_id):
+        return self.SYMBOLS[self.players.index(user_id) + 1]
+
+    def place(self, cell):
+        """Mark a cell (0-8) for the current player and pass the turn; False if taken"""
+        if self.board[cell]:
+            return False
+        self.board[cell] = self.turn + 1
+        self.turn = 1 - self.turn
+        return True
+
+    def winner(self):
+        """'X', 'O', 'draw' or None while the game is still going"""
+        board = self.board
+        for a, b, c in WINNING_LINES:
+            if board[a] and board[a] == board[b] == board[c]:
+                return self.SYMBOLS[board[a]]
+        if all(board):
+            return "draw"
+        return None
+
+    def to_dict(self):
+        return {'channel_id': self.channel_id, 'players': list(self.players), 'turn': self.turn, 'board': self.board.hex()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['channel_id'], data['players'], data['turn'], bytes.fromhex(data['board']))
+
+class TriviaSession:
+    """An open trivia question in a channel"""
+
+    __slots__ = ('answer', 'options', 'asker', 'message_id')
+
+    def __init__(self, answer, options, asker, message_id):
+        self.answer = answer
+        self.options = options
+        self.asker = asker
+        self.message_id = message_id
+
+class GameSessionStore:
+    """Bounded store of in-progress games of one kind
+
+    Sessions are kept in least-recently-used order. Sessions idle for
+    longer than ``ttl`` seconds are dropped, and the oldest are evicted
+    when there are more than ``max_size``. Stores with ``persist`` set
+    snapshot changed sessions to the game_sessions table on flush() and
+    reload them on startup, so games survive a redeploy.
+    """
+
+    def __init__(self, bot, kind, state_type=None, max_size=10000, ttl=1800, persist=False, on_evict=None):
+        self.bot = bot
+        self.kind = kind
+        self.state_type = state_type
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persist = persist
+        self.on_evict = on_evict
+        # {key: (state, last_used monotonic time)}, least recently used first
+        self._items = OrderedDict()
+        # Keys changed or removed since the last flush
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def items(self):
+        return [(key, state) for key, (state, _) in self._items.items()]
+
+    def get(self, key, default=None):
+        """Get a session and mark it as active"""
+        item = self._items.get(key)
+        if item is None:
+            return default
+        state, last_used = item
+        now = time.monotonic()
+        if now - last_used > self.ttl:
+            self._evict(key)
+            return default
+        self._items[key] = (state, now)
+        self._items.move_to_end(key)
+        return state
+
+    def put(self, key, state):
+        """Add or update a session; call again after changing a session's state"""
+        self._items[key] = (state, time.monotonic())
+        self._items.move_to_end(key)
+        if self.persist:
+            self._dirty.add(key)
+        self.expire()
+        while len(self._items) > self.max_size:
+            self._evict(next(iter(self._items)))
+
+    def pop(self, key, default=None):
+        """Remove a finished session"""
+        item = self._items.pop(key, None)
+        if item is None:
+            return default
+        if self.persist:
+            self._dirty.add(key)
+        return item[0]
+
+    def expire(self):
+        """Drop every session that has been idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl
+        while self._items:
+            key, (_, last_used) = next(iter(self._items.items()))
+            if last_used > cutoff:
+                break
+            self._evict(key)
+
+    def _evict(self, key):
+        state = self.pop(key)
+        if self.on_evict and state is not None:
+            try:
+                self.on_evict(key, state)
+            except Exception as e:
+                logger.error(f"Error evicting {self.kind} session {key}: {e}")
+
+    async def load(self):
+        """Create the snapshot table and restore sessions still inside their TTL"""
+        if not self.persist or not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                await conn.execute('''
+                    CREATE TABLE IF NOT EXISTS game_sessions (
+                        kind VARCHAR(20) NOT NULL,
+                        session_key TEXT NOT NULL,
+                        state TEXT NOT NULL,
+                        updated_at TIMESTAMP NOT NULL,
+                        PRIMARY KEY (kind, session_key)
+                    )
+                ''')
+                await conn.execute(
+                    "DELETE FROM game_sessions WHERE kind = $1 AND updated_at < NOW() AT TIME ZONE 'UTC' - make_interval(secs => $2)",
+                    self.kind, self.ttl
+                )
+                rows = await conn.fetch('''
+                    SELECT session_key, state, EXTRACT(EPOCH FROM NOW() AT TIME ZONE 'UTC' - updated_at) AS age
+                    FROM game_sessions WHERE kind = $1
+                    ORDER BY updated_at
+                ''', self.kind)
+
+            now = time.monotonic()
+            for row in rows:
+                state = self.state_type.from_dict(json.loads(row['state']))
+                self._items[json.loads(row['session_key'])] = (state, now - float(row['age']))
+            logger.info(f"Restored {len(rows)} {self.kind} sessions")
+        except Exception as e:
+            logger.error(f"Failed to restore {self.kind} sessions: {e}")
+
+    async def flush(self):
+        """Snapshot changed sessions and delete finished ones"""
+        if not self._dirty or not self.bot.db_pool:
+            return
+        dirty, self._dirty = self._dirty, set()
+
+        upserts = [(key, self._items[key][0]) for key in dirty if key in self._items]
+        deletes = [json.dumps(key) for key in dirty if key not in self._items]
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                if upserts:
+                    await conn.execute(
+                        UPSERT_SESSIONS,
+                        self.kind,
+                        [json.dumps(key) for key, _ in upserts],
+                        [json.dumps(state.to_dict()) for _, state in upserts]
+                    )
+                if deletes:
+                    await conn.execute(
+                        "DELETE FROM game_sessions WHERE kind = $1 AND session_key = ANY($2::TEXT[])",
+                        self.kind, deletes
+                    )
+        except asyncio.CancelledError:
+            # Cancelled mid-write (e.g. the snapshot loop on unload); the writes are idempotent,
+            # so the next flush can safely repeat them
+            self._dirty |= dirty
+            raise
+        except Exception as e:
+            logger.error(f"Failed to snapshot {len(dirty)} {self.kind} sessions: {e}")
+            self._dirty |= dirty
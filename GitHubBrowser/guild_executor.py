@@ -0,0 +1,96 @@
+import discord
+import asyncio
+import logging
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# One guild API call: a label for reports, the rate-limit bucket it falls in, and a coroutine factory
+Mutation = namedtuple('Mutation', ['label', 'bucket', 'run'])
+
+class GuildMutationExecutor:
+    """Bot-wide executor for bulk guild API calls (permission edits, channel/role creation)
+
+    Mutations run with bounded concurrency. Calls in the same rate-limit
+    bucket (e.g. the same channel's permissions route) run one at a time,
+    different buckets run in parallel, and a shared token bucket keeps the
+    whole bot under Discord's global request rate. discord.py still handles
+    any 429 that slips through.
+    """
+
+    def __init__(self, concurrency=8, rate=40, per=1.0):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.per = per
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # {bucket: [lock, mutations holding or waiting for it]}
+        self._buckets = {}
+        self._tokens = float(rate)
+        self._last_refill = time.monotonic()
+        self.stats = {'completed': 0, 'failed': 0}
+
+    async def _acquire_token(self):
+        """Wait for a slot in the global request budget"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last_refill) * self.rate / self.per)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+
+    async def _run_one(self, mutation):
+        bucket = self._buckets.setdefault(mutation.bucket, [asyncio.Lock(), 0])
+        bucket[1] += 1
+        try:
+            # Queue on the bucket first so calls waiting behind their bucket don't hold concurrency slots
+            async with bucket[0], self._semaphore:
+                await self._acquire_token()
+                return await mutation.run()
+        finally:
+            # The lock goes once nothing holds or waits for it, including other run() calls
+            bucket[1] -= 1
+            if not bucket[1]:
+                del self._buckets[mutation.bucket]
+
+    async def run(self, mutations, progress=None, progress_interval=2.0):
+        """Run every mutation and return {'succeeded': [(label, result)], 'failed': [(label, error)]}
+
+        ``progress`` is an optional coroutine called as progress(done, total)
+        at most every ``progress_interval`` seconds while work is running.
+        """
+        mutations = list(mutations)
+        result = {'succeeded': [], 'failed': []}
+        done = 0
+        last_report = time.monotonic()
+
+        async def report(force=False):
+            nonlocal last_report
+            if progress is None:
+                return
+            now = time.monotonic()
+            if not force and now - last_report < progress_interval:
+                return
+            last_report = now
+            try:
+                await progress(done, len(mutations))
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to report mutation progress: {e}")
+
+        async def worker(mutation):
+            nonlocal done
+            try:
+                value = await self._run_one(mutation)
+                result['succeeded'].append((mutation.label, value))
+                self.stats['completed'] += 1
+            except Exception as e:
+                result['failed'].append((mutation.label, e))
+                self.stats['failed'] += 1
+            done += 1
+            await report()
+
+        await asyncio.gather(*(worker(mutation) for mutation in mutations))
+        await report(force=True)
+        return result
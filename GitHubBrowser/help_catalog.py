@@ -0,0 +1,343 @@
+import discord
+import logging
+import time
+
+from fuzzywuzzy import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+# Commands per category page
+PAGE_SIZE = 10
+
+# Fuzzy matches scoring below this (0-100) are not suggested
+FUZZY_CUTOFF = 70
+
+# Catalog category for each cog; commands of unlisted cogs fall back to the help categories
+COG_CATEGORIES = {
+    'Help': "🆘 Help & Info",
+    'Support': "🆘 Help & Info",
+    'Moderation': "🔨 Moderation",
+    'Economy': "💰 Economy",
+    'Pets': "🐾 Pet System",
+    'Fun': "🎲 Fun & Games",
+    'Utility': "🛠️ Utility Tools",
+    'StickyNotes': "📌 Sticky Notes",
+    'Leveling': "📈 Leveling & XP",
+    'Analytics': "📊 Analytics",
+    'Community': "👥 Community",
+    'Management': "⚙️ Server Management",
+    'Settings': "⚙️ Server Management",
+    'ServerSetup': "⚙️ Server Management",
+    'Admin': "⚙️ Server Management",
+    'Giveaways': "🎁 Events & Giveaways",
+    'Welcome': "👋 Welcome System",
+    'Invites': "🔗 Invite Tracking",
+    'Logging': "📝 Logging System",
+    'SlashLogging': "📝 Logging System",
+    'Applications': "📋 Applications",
+    'Affiliates': "🤝 Affiliates",
+    'Suggestions': "💡 Suggestions",
+    'Leaderboards': "🏆 Leaderboards",
+    'Notifications': "🔔 Notifications",
+    'Security': "🛡️ Security",
+    'Automation': "🤖 Automation",
+}
+OTHER_CATEGORY = "📦 Other"
+
+def plain_name(category):
+    """Category name without its emoji, e.g. "Fun & Games\""""
+    return " ".join(word for word in category.split() if any(char.isalnum() for char in word))
+
+def normalize_query(text):
+    """Lowercase a query and drop a leading command prefix"""
+    return " ".join(text.lower().lstrip("!/").split())
+
+class HelpEntry:
+    """One registered command as shown in help"""
+
+    __slots__ = ('key', 'aliases', 'description', 'signature', 'category', 'prefix', 'slash')
+
+    def __init__(self, key, category, description):
+        self.key = key
+        self.aliases = []
+        self.description = description or "No description available"
+        self.signature = ""
+        self.category = category
+        # Whether the command can be run as !key and/or /key
+        self.prefix = False
+        self.slash = False
+
+    @property
+    def usage(self):
+        if self.prefix:
+            return f"!{self.key} {self.signature}".rstrip()
+        return f"/{self.key}"
+
+class PrefixTrie:
+    """Maps every prefix of the indexed terms to their targets, shortest term first"""
+
+    def __init__(self):
+        # Node: [children {char: node}, [(term, target), ...]]
+        self._root = [{}, []]
+
+    def insert(self, term, target):
+        node = self._root
+        for char in term:
+            node = node[0].setdefault(char, [{}, []])
+            node[1].append((term, target))
+
+    def finish(self):
+        """Order each node's matches once so lookups are a walk plus a slice"""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node[1].sort(key=lambda match: (len(match[0]), match[0]))
+            stack.extend(node[0].values())
+
+    def search(self, prefix, limit):
+        node = self._root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return []
+        targets = []
+        for _, target in node[1]:
+            if target not in targets:
+                targets.append(target)
+                if len(targets) >= limit:
+                    break
+        return targets
+
+class HelpCatalog:
+    """Help pages and search index built from the registered command tree
+
+    Prefix and application commands are walked once, grouped into the help
+    categories and rendered into embeds up front, so help commands only pick
+    a prebuilt page. Searches go through a prefix trie of command names,
+    aliases and category words, falling back to fuzzy matching for typos.
+    The catalog rebuilds itself only when a cog is loaded, unloaded or
+    reloaded, or a command is registered outside a cog.
+    """
+
+    def __init__(self, command_categories):
+        # {category name: {"commands": [...], "description": str}} from the Help cog
+        self.command_categories = command_categories
+        self._signature = None
+        self.entries = {}
+        self.category_entries = {}
+        self.category_pages = {}
+        self.command_embeds = {}
+        self.overview_pages = []
+        self.summary = None
+        self.prefix_count = 0
+        self.slash_count = 0
+        # {normalized term: [target, ...]}; a target is ('category', name) or ('command', key)
+        self._terms = {}
+        self._trie = PrefixTrie()
+
+    def refresh(self, bot):
+        """Rebuild if cogs were loaded, unloaded or reloaded since the last build"""
+        # Object ids can be reused by a reloaded cog, so key on the bot's cog generation instead
+        signature = (bot.cog_generation, len(bot.all_commands), len(bot.tree.get_commands()))
+        if signature != self._signature:
+            self.build(bot)
+            self._signature = signature
+        return self
+
+    def build(self, bot):
+        started = time.perf_counter()
+        listed = {}
+        for category, data in self.command_categories.items():
+            for name in data["commands"]:
+                listed.setdefault(name, category)
+
+        def category_for(name, cog_name):
+            return COG_CATEGORIES.get(cog_name) or listed.get(name) or OTHER_CATEGORY
+
+        entries = {}
+        prefix_count = 0
+        for command in bot.walk_commands():
+            if command.hidden:
+                continue
+            key = command.qualified_name
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = HelpEntry(key, category_for(command.name, command.cog_name), command.short_doc)
+            entry.prefix = True
+            entry.aliases = list(command.aliases)
+            entry.signature = command.signature
+            prefix_count += 1
+
+        slash_count = 0
+        for command in bot.tree.walk_commands():
+            if isinstance(command, discord.app_commands.Group):
+                continue
+            key = command.qualified_name
+            entry = entries.get(key)
+            if entry is None:
+                cog = getattr(command, 'binding', None)
+                cog_name = cog.qualified_name if cog is not None else None
+                entry = entries[key] = HelpEntry(key, category_for(command.name, cog_name), command.description)
+            entry.slash = True
+            slash_count += 1
+
+        category_entries = {category: [] for category in self.command_categories}
+        for entry in sorted(entries.values(), key=lambda entry: entry.key):
+            category_entries.setdefault(entry.category, []).append(entry)
+        category_entries = {category: members for category, members in category_entries.items() if members}
+
+        self.entries = entries
+        self.category_entries = category_entries
+        self.prefix_count = prefix_count
+        self.slash_count = slash_count
+        self.category_pages = {category: self._render_category(category, members) for category, members in category_entries.items()}
+        self.command_embeds = {key: self._render_command(entry) for key, entry in entries.items()}
+        self.overview_pages = self._render_overview()
+        self.summary = self._render_summary()
+        self._build_index()
+        logger.info(
+            f"Built help catalog: {len(entries)} commands in {len(category_entries)} categories "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def description_for(self, category):
+        data = self.command_categories.get(category)
+        return data["description"] if data else "Other commands"
+
+    def _render_category(self, category, members):
+        pages = []
+        chunks = [members[i:i + PAGE_SIZE] for i in range(0, len(members), PAGE_SIZE)]
+        for number, chunk in enumerate(chunks, 1):
+            embed = discord.Embed(
+                title=category,
+                description=f"{self.description_for(category)}\n\n**Available Commands ({len(members)}):**",
+                color=0x7289da
+            )
+            for entry in chunk:
+                embed.add_field(name=f"`{entry.usage}`", value=entry.description[:1024], inline=False)
+            embed.set_footer(text=f"Page {number}/{len(chunks)} • Use !guide <command> for details")
+            pages.append(embed)
+        return pages
+
+    def _render_command(self, entry):
+        embed = discord.Embed(
+            title=f"Command: {entry.key}",
+            description=entry.description,
+            color=0xff9900
+        )
+        embed.add_field(name="Category", value=entry.category, inline=True)
+        embed.add_field(name="Usage", value=f"`{entry.usage}`", inline=True)
+        if entry.prefix and entry.slash:
+            embed.add_field(name="Slash Command", value=f"`/{entry.key}`", inline=True)
+        if entry.aliases:
+            embed.add_field(name="Aliases", value=", ".join(f"`{alias}`" for alias in entry.aliases), inline=False)
+        return embed
+
+    def _render_overview(self):
+        # Embeds hold at most 25 fields
+        categories = list(self.category_entries.items())
+        chunks = [categories[i:i + 24] for i in range(0, len(categories), 24)] or [[]]
+        pages = []
+        for number, chunk in enumerate(chunks, 1):
+            embed = discord.Embed(
+                title="🍎 Apple Bot - Complete Command Guide",
+                description=(
+                    f"Your comprehensive Discord companion with {len(categories)} command categories.\n\n"
+                    "• `!guide <category>` - View commands in a category\n"
+                    "• `!guide <command>` - Details for one command\n"
+                    "• `/help` - Search categories and commands"
+                ),
+                color=0x00ff00
+            )
+            for category, members in chunk:
+                embed.add_field(
+                    name=f"{category} ({len(members)})",
+                    value=f"{self.description_for(category)}\n`!guide {plain_name(category).split()[0].lower()}`",
+                    inline=True
+                )
+            embed.set_footer(text=f"Total: {len(self.entries)} commands across {len(categories)} categories | Prefix: ! | Page {number}/{len(chunks)}")
+            pages.append(embed)
+        return pages
+
+    def _render_summary(self):
+        embed = discord.Embed(
+            title="📊 Apple Bot Command Summary",
+            description="\n".join(f"**{category}** - {len(members)} commands" for category, members in self.category_entries.items()),
+            color=0x00ff00
+        )
+        embed.add_field(name="⚡ Prefix Commands", value=f"{self.prefix_count} commands", inline=True)
+        embed.add_field(name="⚡ Slash Commands", value=f"{self.slash_count} commands", inline=True)
+        embed.add_field(name="📈 Total Commands", value=f"**{len(self.entries)} commands**", inline=True)
+        embed.add_field(
+            name="🎯 Command Types",
+            value="• **Prefix Commands**: Use `!command` (example: `!balance`)\n• **Slash Commands**: Use `/command` (example: `/balance`)\n• **Hybrid Support**: Both styles available",
+            inline=False
+        )
+        embed.set_footer(text="Use !guide <category> to explore specific command groups")
+        return embed
+
+    def _build_index(self):
+        terms = {}
+
+        def add(term, target):
+            term = normalize_query(term)
+            if term:
+                targets = terms.setdefault(term, [])
+                if target not in targets:
+                    targets.append(target)
+
+        for category in self.category_entries:
+            target = ('category', category)
+            plain = plain_name(category)
+            add(category, target)
+            add(plain, target)
+            for word in plain.split():
+                if len(word) > 2:
+                    add(word, target)
+        for key, entry in self.entries.items():
+            target = ('command', key)
+            for name in [key, *entry.aliases]:
+                add(name, target)
+                add(name.replace('_', ' '), target)
+                add(name.replace('_', '').replace('-', ''), target)
+
+        trie = PrefixTrie()
+        for term, targets in terms.items():
+            for target in targets:
+                trie.insert(term, target)
+        trie.finish()
+        self._terms = terms
+        self._trie = trie
+
+    def resolve(self, query):
+        """The category or command a query names exactly, or None"""
+        targets = self._terms.get(normalize_query(query))
+        return targets[0] if targets else None
+
+    def search(self, query, limit=25):
+        """Targets for a partial or misspelled query: prefix matches first, then fuzzy matches"""
+        query = normalize_query(query)
+        if not query:
+            return [('category', category) for category in self.category_entries][:limit]
+        results = self._trie.search(query, limit)
+        if len(results) < limit:
+            for term, _ in process.extractBests(query, list(self._terms), scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF, limit=limit):
+                for target in self._terms[term]:
+                    if target not in results:
+                        results.append(target)
+        return results[:limit]
+
+    def label(self, target):
+        """Short display text for a search result"""
+        kind, name = target
+        if kind == 'category':
+            return f"{name} ({len(self.category_entries[name])} commands)"
+        entry = self.entries[name]
+        return f"{entry.usage} - {entry.description}"
+
+    def pages_for(self, target):
+        """Prebuilt embeds for a category or command"""
+        kind, name = target
+        if kind == 'category':
+            return self.category_pages[name]
+        return [self.command_embeds[name]]
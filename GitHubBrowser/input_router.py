@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InputSession:
+    """A long-lived interactive session (e.g. a board game) bound to one channel and some users"""
+
+    __slots__ = ('router', 'keys', 'handler', 'timeout', 'on_timeout', 'timer')
+
+    def __init__(self, router, keys, handler, timeout, on_timeout):
+        self.router = router
+        self.keys = keys
+        self.handler = handler
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.timer = None
+
+    def touch(self):
+        """Restart the inactivity timeout"""
+        if self.timer:
+            self.timer.cancel()
+        if self.timeout:
+            self.timer = asyncio.get_running_loop().call_later(self.timeout, self.router._expire, self)
+
+    def close(self):
+        self.router.close(self)
+
+class InputRouter:
+    """Routes user messages to interactive commands waiting for input
+
+    Waiters and sessions are indexed by (channel_id, user_id), with user_id
+    None meaning "anyone in the channel", so routing a message is two dict
+    lookups however many games are running. Timeouts are timer handles owned
+    by the router rather than one wait_for listener per game.
+    """
+
+    def __init__(self):
+        # One-shot waiters: {(channel_id, user_id): [(future, check), ...]}
+        self._waiters = {}
+        # Long-lived sessions: {(channel_id, user_id): InputSession}
+        self._sessions = {}
+
+    def __len__(self):
+        return sum(len(waiters) for waiters in self._waiters.values()) + len(set(self._sessions.values()))
+
+    async def wait(self, channel_id, user_id=None, timeout=None, check=None):
+        """Wait for the next message in a channel (from one user, or anyone if user_id is None)
+
+        Raises asyncio.TimeoutError like Client.wait_for when nothing
+        matching ``check`` arrives in time.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (channel_id, user_id)
+        entry = (future, check)
+        self._waiters.setdefault(key, []).append(entry)
+        timer = loop.call_later(timeout, self._time_out, future) if timeout else None
+        try:
+            return await future
+        finally:
+            if timer:
+                timer.cancel()
+            waiters = self._waiters.get(key)
+            if waiters and entry in waiters:
+                waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[key]
+
+    def _time_out(self, future):
+        if not future.done():
+            future.set_exception(asyncio.TimeoutError())
+
+    def open(self, channel_id, user_ids, handler, timeout=None, on_timeout=None):
+        """Bind handler(message) to messages from these users in a channel
+
+        Returns the session, or None if one of the users already has a
+        session in that channel. The session closes itself after ``timeout``
+        seconds without a routed message and then awaits on_timeout().
+        """
+        keys = [(channel_id, user_id) for user_id in user_ids]
+        if any(key in self._sessions for key in keys):
+            return None
+        session = InputSession(self, keys, handler, timeout, on_timeout)
+        for key in keys:
+            self._sessions[key] = session
+        session.touch()
+        return session
+
+    def close(self, session):
+        """Stop routing messages to a session"""
+        if session.timer:
+            session.timer.cancel()
+            session.timer = None
+        for key in session.keys:
+            if self._sessions.get(key) is session:
+                del self._sessions[key]
+
+    def _expire(self, session):
+        self.close(session)
+        if session.on_timeout:
+            asyncio.get_running_loop().create_task(self._run(session.on_timeout()))
+
+    async def _run(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"Input session handler error: {e}")
+
+    async def dispatch(self, message):
+        """Deliver a message to whatever is waiting on its channel and author"""
+        if message.author.bot:
+            return
+        channel_id = message.channel.id
+        for key in ((channel_id, message.author.id), (channel_id, None)):
+            waiters = self._waiters.get(key)
+            if waiters:
+                for future, check in list(waiters):
+                    if future.done():
+                        continue
+                    try:
+                        matched = check is None or check(message)
+                    except Exception as e:
+                        future.set_exception(e)
+                        continue
+                    if matched:
+                        future.set_result(message)
+
+            session = self._sessions.get(key)
+            if session:
+                session.touch()
+                await self._run(session.handler(message))
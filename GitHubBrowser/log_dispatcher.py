@@ -0,0 +1,150 @@
+import discord
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+class LogDispatcher:
+    """Per-log-channel embed dispatcher
+
+    Log embeds are queued per channel and sent by one worker per channel,
+    packing up to 10 embeds into each message. A token bucket per channel
+    keeps sends under Discord's per-channel rate limit; when a channel falls
+    too far behind, the backlog is collapsed into compact digest embeds.
+    """
+
+    def __init__(self, bot, rate=5, per=5.0, digest_threshold=50, digest_lines=25):
+        self.bot = bot
+        self.rate = rate
+        self.per = per
+        self.digest_threshold = digest_threshold
+        self.digest_lines = digest_lines
+        # Queued embeds: {channel_id: deque[(enqueued_at, embed)]}
+        self._queues = {}
+        # Token buckets: {channel_id: [tokens, last_refill]}
+        self._buckets = {}
+        self._workers = {}
+        self._channels = {}
+        self.stats = {'queued': 0, 'messages_sent': 0, 'embeds_sent': 0, 'digested': 0, 'dropped': 0}
+
+    def send(self, channel, embed: discord.Embed):
+        """Queue an embed for a log channel"""
+        queue = self._queues.setdefault(channel.id, deque())
+        queue.append((time.monotonic(), embed))
+        self._channels[channel.id] = channel
+        self.stats['queued'] += 1
+
+        worker = self._workers.get(channel.id)
+        if worker is None or worker.done():
+            self._workers[channel.id] = asyncio.get_running_loop().create_task(self._run(channel.id))
+
+    def depth(self, channel_id=None):
+        """Embeds waiting to be sent for one channel, or across all channels"""
+        if channel_id is not None:
+            return len(self._queues.get(channel_id, ()))
+        return sum(len(queue) for queue in self._queues.values())
+
+    def lag(self, channel_id=None):
+        """Seconds the oldest queued embed has been waiting"""
+        if channel_id is not None:
+            queues = [self._queues.get(channel_id, ())]
+        else:
+            queues = self._queues.values()
+        oldest = [queue[0][0] for queue in queues if queue]
+        return time.monotonic() - min(oldest) if oldest else 0.0
+
+    async def close(self):
+        """Stop every channel worker"""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+
+    async def _acquire(self, channel_id):
+        """Wait for a send token in this channel's bucket"""
+        bucket = self._buckets.setdefault(channel_id, [float(self.rate), time.monotonic()])
+        while True:
+            now = time.monotonic()
+            bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate / self.per)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            await asyncio.sleep((1 - bucket[0]) * self.per / self.rate)
+
+    def _take_batch(self, queue):
+        """Pop as many queued embeds as fit in one message"""
+        batch = []
+        size = 0
+        while queue and len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            embed_size = len(queue[0][1])
+            if batch and size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            batch.append(queue.popleft()[1])
+            size += embed_size
+        return batch
+
+    def _take_digest(self, queue):
+        """Collapse the whole backlog into compact digest embeds"""
+        entries = [queue.popleft() for _ in range(len(queue))]
+        self.stats['digested'] += len(entries)
+
+        counts = {}
+        lines = []
+        for _, embed in entries:
+            title = embed.title or "Log Event"
+            counts[title] = counts.get(title, 0) + 1
+            stamp = embed.timestamp.strftime('%H:%M:%S') if embed.timestamp else "--:--:--"
+            detail = (embed.description or "")[:80]
+            lines.append(f"`{stamp}` **{title}** {detail}")
+
+        summary = "\n".join(f"{title}: **{count}**" for title, count in counts.items())
+        digests = []
+        for start in range(0, len(lines), self.digest_lines):
+            chunk = lines[start:start + self.digest_lines]
+            embed = discord.Embed(
+                title=f"📋 Log Digest ({start + 1}-{start + len(chunk)} of {len(lines)})",
+                description="\n".join(chunk)[:4000],
+                color=0x95a5a6
+            )
+            if start == 0:
+                embed.add_field(name="Summary", value=summary[:1000], inline=False)
+            embed.set_footer(text="Apple Bot Logging System • digest mode (log channel backlogged)")
+            digests.append(embed)
+        return deque((time.monotonic(), embed) for embed in digests)
+
+    async def _run(self, channel_id):
+        """Drain one channel's queue under its rate limit"""
+        queue = self._queues[channel_id]
+        while queue:
+            await self._acquire(channel_id)
+
+            if len(queue) > self.digest_threshold:
+                digests = self._take_digest(queue)
+                batch = self._take_batch(digests)
+                # Any digest embeds that did not fit go back to the front of the queue
+                queue.extendleft(reversed(digests))
+            else:
+                batch = self._take_batch(queue)
+
+            channel = self._channels.get(channel_id)
+            try:
+                await channel.send(embeds=batch)
+                self.stats['messages_sent'] += 1
+                self.stats['embeds_sent'] += len(batch)
+            except (discord.Forbidden, discord.NotFound):
+                # Log channel is gone or inaccessible - drop its backlog
+                self.stats['dropped'] += len(batch) + len(queue)
+                queue.clear()
+            except discord.HTTPException as e:
+                self.stats['dropped'] += len(batch)
+                logger.warning(f"Failed to send log batch to channel {channel_id}: {e}")
+
+        self._queues.pop(channel_id, None)
+        self._channels.pop(channel_id, None)
+        self._workers.pop(channel_id, None)
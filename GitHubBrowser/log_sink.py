@@ -0,0 +1,197 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Column order for each log table the sink writes to
+LOG_TABLE_COLUMNS = {
+    'message_logs': (
+        'message_id', 'guild_id', 'channel_id', 'user_id', 'username',
+        'content', 'attachments', 'message_type', 'timestamp', 'previous_message_id'
+    ),
+    'command_usage_logs': (
+        'guild_id', 'channel_id', 'user_id', 'username', 'command_name',
+        'command_args', 'command_type', 'success', 'error_message'
+    ),
+    'activity_logs': (
+        'guild_id', 'user_id', 'username', 'activity_type', 'description', 'metadata'
+    )
+}
+
+# message_logs rows can be replayed (e.g. gateway resumes), so they keep the conflict guard
+MESSAGE_LOGS_INSERT = '''
+    INSERT INTO message_logs (message_id, guild_id, channel_id, user_id, username, content, attachments, message_type, timestamp, previous_message_id)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    ON CONFLICT (message_id) DO NOTHING
+'''
+
+# Edits and deletes are coalesced into one UPDATE each per flush
+MESSAGE_EDITS_UPDATE = '''
+    UPDATE message_logs SET edited = TRUE, content = e.content
+    FROM unnest($1::BIGINT[], $2::TEXT[]) AS e(message_id, content)
+    WHERE message_logs.message_id = e.message_id
+'''
+MESSAGE_DELETES_UPDATE = "UPDATE message_logs SET deleted = TRUE WHERE message_id = ANY($1::BIGINT[])"
+
+def strip_nul(value):
+    """Drop NUL characters, which Postgres rejects in TEXT columns"""
+    if isinstance(value, str) and '\x00' in value:
+        return value.replace('\x00', '')
+    return value
+
+class LogSink:
+    """Bounded, batched writer for the logging tables
+
+    Rows are buffered in memory and flushed every ``max_batch`` rows or
+    ``flush_interval`` seconds, whichever comes first. When ``max_pending``
+    rows are already waiting, new rows are dropped and counted instead of
+    blocking the event listeners.
+    """
+
+    def __init__(self, bot, max_batch=500, flush_interval=1.0, max_pending=20000):
+        self.bot = bot
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._buffers = {table: [] for table in LOG_TABLE_COLUMNS}
+        # Latest content of edited messages: {message_id: content}
+        self._edits = {}
+        self._deletes = set()
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._closing = False
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0}
+
+    def start(self):
+        """Start the background flush task"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, table: str, data: dict) -> bool:
+        """Queue a row for the given table; returns False if it was dropped"""
+        if not self.bot.db_pool or self._closing:
+            return False
+
+        if self._pending >= self.max_pending:
+            self.stats['dropped'] += 1
+            if self.stats['dropped'] % 1000 == 1:
+                logger.warning(f"Log sink full - dropped {self.stats['dropped']} rows so far")
+            return False
+
+        columns = LOG_TABLE_COLUMNS[table]
+        self._buffers[table].append(tuple(strip_nul(data[column]) for column in columns))
+        self._pending += 1
+        self.stats['queued'] += 1
+
+        if len(self._buffers[table]) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    def mark_edited(self, message_id: int, content: str):
+        """Queue a message_logs row to be flagged as edited with its new content"""
+        if not self.bot.db_pool or self._closing:
+            return
+        self._edits[message_id] = strip_nul(content)
+        if len(self._edits) >= self.max_batch:
+            self._wakeup.set()
+
+    def mark_deleted(self, *message_ids: int):
+        """Queue one or more message_logs rows to be flagged as deleted"""
+        if not self.bot.db_pool or self._closing:
+            return
+        self._deletes.update(message_ids)
+        if len(self._deletes) >= self.max_batch:
+            self._wakeup.set()
+
+    @property
+    def pending(self):
+        """Rows waiting to be written"""
+        return self._pending
+
+    async def flush(self):
+        """Write every buffered row to the database"""
+        async with self._flush_lock:
+            batches = {}
+            for table, rows in self._buffers.items():
+                if rows:
+                    batches[table] = rows
+                    self._buffers[table] = []
+            edits, self._edits = self._edits, {}
+            deletes, self._deletes = list(self._deletes), set()
+            if not batches and not edits and not deletes:
+                return
+
+            self._pending -= sum(len(rows) for rows in batches.values())
+
+            try:
+                async with self.bot.db_pool.acquire() as conn:
+                    for table, rows in batches.items():
+                        await self._write(conn, table, rows)
+
+                    # Updates go after the inserts so rows logged in this batch are updated too
+                    if edits:
+                        try:
+                            await conn.execute(MESSAGE_EDITS_UPDATE, list(edits), list(edits.values()))
+                        except Exception as e:
+                            logger.error(f"Failed to update {len(edits)} edited messages: {e}")
+                    if deletes:
+                        try:
+                            await conn.execute(MESSAGE_DELETES_UPDATE, deletes)
+                        except Exception as e:
+                            logger.error(f"Failed to flag {len(deletes)} messages as deleted: {e}")
+            except Exception as e:
+                self.stats['failed'] += sum(len(rows) for rows in batches.values())
+                logger.error(f"Failed to acquire connection for log flush: {e}")
+
+    async def _write(self, conn, table, rows):
+        """Write a batch, splitting it on failure so one bad row only loses itself
+
+        Both executemany and COPY are all-or-nothing, so a failed batch is
+        retried in halves until the rows that cannot be written are isolated.
+        """
+        try:
+            if table == 'message_logs':
+                await conn.executemany(MESSAGE_LOGS_INSERT, rows)
+            else:
+                await conn.copy_records_to_table(
+                    table, records=rows, columns=list(LOG_TABLE_COLUMNS[table])
+                )
+            self.stats['written'] += len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                self.stats['failed'] += 1
+                logger.error(f"Failed to write a row to {table}: {e}")
+                return
+            logger.debug(f"Failed to flush {len(rows)} rows to {table}, retrying in smaller batches: {e}")
+            middle = len(rows) // 2
+            await self._write(conn, table, rows[:middle])
+            await self._write(conn, table, rows[middle:])
+
+    async def close(self):
+        """Stop the flush task and drain anything still buffered"""
+        self._closing = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Log sink task failed during shutdown: {e}")
+            self._task = None
+        if self.bot.db_pool:
+            await self.flush()
+
+    async def _run(self):
+        """Flush on a timer, or early when a batch fills up"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Log sink flush error: {e}")
@@ -4,9 +4,16 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from dotenv import load_dotenv
 from datetime import datetime
 import pytz
+from settings_cache import GuildSettingsCache, LOG_SETTINGS_DEFAULTS
+from log_sink import LogSink
+from log_dispatcher import LogDispatcher
+from cooldowns import CooldownService
+from guild_executor import GuildMutationExecutor
+from input_router import InputRouter
 
 # Load environment variables
 load_dotenv()
@@ -52,9 +59,23 @@ class AppleBot(commands.Bot):
         )
         self.db_pool = None
         self.default_prefix = '!'
+        self.guild_settings = GuildSettingsCache(self)
+        self.log_settings = GuildSettingsCache(self, table='log_settings', defaults=LOG_SETTINGS_DEFAULTS)
+        self.log_sink = LogSink(self)
+        self.log_dispatcher = LogDispatcher(self)
+        self.cooldowns = CooldownService(self)
+        # Shared so bulk permission/channel edits from every command stay under one rate budget
+        self.guild_executor = GuildMutationExecutor()
+        self.input_router = InputRouter()
         # Set bot timezone to Eastern Standard Time
         self.timezone = pytz.timezone('US/Eastern')
         self.start_time = self.get_current_time()
+        # Startup timing: {extension: seconds to load, or None if it failed}, and seconds until first ready
+        self.boot_started = time.perf_counter()
+        self.cog_load_times = {}
+        self.ready_after = None
+        # Bumped whenever a cog is added or removed, so caches built from the command tree know to rebuild
+        self.cog_generation = 0
     
     def get_current_time(self):
         """Get current time in bot's timezone (Eastern - automatically switches EST/EDT)"""
@@ -70,19 +91,17 @@ class AppleBot(commands.Bot):
         if not message.guild:
             return self.default_prefix
         
-        # Get guild prefix from database if available
-        if self.db_pool:
-            try:
-                async with self.db_pool.acquire() as conn:
-                    result = await conn.fetchval(
-                        "SELECT prefix FROM guild_settings WHERE guild_id = $1",
-                        message.guild.id
-                    )
-                    return result if result else self.default_prefix
-            except:
-                pass
-        
-        return self.default_prefix
+        # Served from the in-memory settings cache - no database round trip per message
+        return self.guild_settings.get_value(message.guild.id, 'prefix', self.default_prefix)
+    
+    async def add_cog(self, cog, **kwargs):
+        await super().add_cog(cog, **kwargs)
+        self.cog_generation += 1
+    
+    async def remove_cog(self, name, **kwargs):
+        removed = await super().remove_cog(name, **kwargs)
+        self.cog_generation += 1
+        return removed
     
     async def setup_hook(self):
         """Called when bot is starting up"""
@@ -91,6 +110,20 @@ class AppleBot(commands.Bot):
         # Initialize database
         await self.init_database()
         
+        # Warm the guild settings cache before any messages arrive
+        await self.guild_settings.load()
+        
+        # Restore long cooldowns (daily/work) that must survive restarts
+        await self.cooldowns.load()
+        
+        # Start the batched writers for message/command/activity logs and cooldowns
+        if self.db_pool:
+            self.log_sink.start()
+            self.cooldowns.start()
+        
+        # Route replies to games and prompts waiting for input
+        self.add_listener(self.input_router.dispatch, 'on_message')
+        
         # Load all cogs (some may have reduced functionality without database)
         await self.load_cogs()
         
@@ -103,6 +136,15 @@ class AppleBot(commands.Bot):
         
         logger.info("Apple Bot setup complete")
     
+    async def close(self):
+        """Drain buffered logs and cooldowns before shutting down"""
+        await self.log_sink.close()
+        await self.cooldowns.close()
+        await self.log_dispatcher.close()
+        await super().close()
+        if self.db_pool:
+            await self.db_pool.close()
+    
     async def init_database(self):
         """Initialize database connection and tables"""
         try:
@@ -264,44 +306,70 @@ class AppleBot(commands.Bot):
             
         logger.info("Database tables created successfully")
     
+    async def load_cog(self, cog):
+        """Load one extension and return how long it took, or None if it failed"""
+        started = time.perf_counter()
+        try:
+            await self.load_extension(cog)
+        except Exception as e:
+            logger.error(f"Failed to load {cog}: {e}")
+            return None
+        return time.perf_counter() - started
+    
     async def load_cogs(self):
-        """Load all cog modules"""
-        cogs = [
-            'cogs.help',
-            'cogs.moderation',
-            'cogs.economy',
-            'cogs.pets',
-            'cogs.fun',
-            'cogs.utility',
-            'cogs.leveling',
-            'cogs.analytics',
-            'cogs.community',
-            'cogs.management',
-            'cogs.welcome',
-            'cogs.giveaways',
-            'cogs.invites',
-            'cogs.logging',
-            'cogs.slash_logging',
-            'cogs.applications',
-            'cogs.affiliates',
-            'cogs.suggestions',
-            'cogs.leaderboards',
-            'cogs.notifications',
-            'cogs.security',
-            'cogs.automation',
-            'cogs.stickynotes',
-            'cogs.support',
-            'cogs.serversetup',
-            'cogs.settings',
-            'cogs.admin'
+        """Load all cog modules phase by phase and log how long each took"""
+        # Cogs in one phase initialize concurrently, so a cog whose setup() touches
+        # tables another cog creates must be in a later phase than that cog
+        phases = [
+            [
+                'cogs.help',
+                'cogs.moderation',
+                'cogs.economy',
+                'cogs.pets',
+                'cogs.fun',
+                'cogs.utility',
+                'cogs.leveling',
+                'cogs.analytics',
+                'cogs.community',
+                'cogs.management',
+                'cogs.welcome',
+                'cogs.giveaways',
+                'cogs.invites',
+                'cogs.logging',
+                'cogs.slash_logging',
+                'cogs.applications',
+                'cogs.affiliates',
+                'cogs.suggestions',
+                'cogs.notifications',
+                'cogs.security',
+                'cogs.automation',
+                'cogs.stickynotes',
+                'cogs.support',
+                'cogs.serversetup',
+                'cogs.settings',
+                'cogs.admin'
+            ],
+            # Indexes the economy table created by cogs.economy
+            ['cogs.leaderboards']
         ]
         
-        for cog in cogs:
-            try:
-                await self.load_extension(cog)
-                logger.info(f"Loaded {cog}")
-            except Exception as e:
-                logger.error(f"Failed to load {cog}: {e}")
+        # load_extension runs each module's code synchronously before its first await, so
+        # imports still happen one at a time; the table creation and cache loading in each
+        # cog's setup()/cog_load then overlap, bounded by the database pool size
+        started = time.perf_counter()
+        report = []
+        for number, cogs in enumerate(phases, 1):
+            phase_started = time.perf_counter()
+            timings = await asyncio.gather(*(self.load_cog(cog) for cog in cogs))
+            self.cog_load_times.update(zip(cogs, timings))
+            report.append(f"  phase {number}: {len(cogs)} cogs in {time.perf_counter() - phase_started:.2f}s")
+        elapsed = time.perf_counter() - started
+        
+        loaded = [seconds for seconds in self.cog_load_times.values() if seconds is not None]
+        report.insert(0, f"Loaded {len(loaded)}/{len(self.cog_load_times)} cogs in {elapsed:.2f}s ({sum(loaded):.2f}s of cog time)")
+        for cog, seconds in sorted(self.cog_load_times.items(), key=lambda item: -(item[1] or 0)):
+            report.append(f"  {cog:<22} {'failed' if seconds is None else f'{seconds:.3f}s'}")
+        logger.info("\n".join(report))
     
     async def on_ready(self):
         """Called when bot is ready"""
@@ -317,6 +385,11 @@ class AppleBot(commands.Bot):
             logger.info(f'Bot ID: {self.user.id}')
         logger.info(f'Connected to {len(self.guilds)} guilds')
         
+        # Cold-start time after a deploy; on_ready also fires after reconnects
+        if self.ready_after is None:
+            self.ready_after = time.perf_counter() - self.boot_started
+            logger.info(f"Ready {self.ready_after:.2f}s after startup")
+        
         # Set bot status
         await self.change_presence(
             activity=discord.Activity(
@@ -337,9 +410,15 @@ class AppleBot(commands.Bot):
                         "INSERT INTO guild_settings (guild_id) VALUES ($1) ON CONFLICT DO NOTHING",
                         guild.id
                     )
+                await self.guild_settings.refresh(guild.id)
             except Exception as e:
                 logger.error(f"Failed to initialize guild settings: {e}")
     
+    async def on_guild_remove(self, guild):
+        """Handle bot leaving a guild"""
+        self.guild_settings.discard(guild.id)
+        self.log_settings.discard(guild.id)
+    
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
         if isinstance(error, commands.CommandNotFound):
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import random
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from math import gcd
+
+from fuzzywuzzy import fuzz
+
+logger = logging.getLogger(__name__)
+
+# JSON Lines corpus: {"category", "difficulty", "question", "answer", optional "aliases" and "options"}
+QUESTION_BANK_PATH = os.getenv('QUESTION_BANK_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'questions.jsonl'))
+
+# Typed answers at least this similar (0-100) to an accepted answer count as correct
+FUZZY_MATCH_THRESHOLD = 85
+
+# Channels whose no-repeat order is remembered; the least recently used are forgotten past this
+MAX_TRACKED_CHANNELS = 10000
+
+ARTICLES = re.compile(r'^(the|a|an) ')
+NON_WORD = re.compile(r'[^\w\s]')
+SPACES = re.compile(r'\s+')
+
+def normalize_answer(text):
+    """Lowercase, strip accents, punctuation and a leading article"""
+    text = unicodedata.normalize('NFKD', text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    text = SPACES.sub(' ', NON_WORD.sub(' ', text)).strip()
+    return ARTICLES.sub('', text)
+
+class Question:
+    """One question read from the bank, with its accepted answers normalized up front"""
+
+    __slots__ = ('question', 'answer', 'options', 'category', 'difficulty', 'accepted')
+
+    def __init__(self, data):
+        self.question = data['question']
+        self.answer = data['answer']
+        self.options = data.get('options') or []
+        self.category = data.get('category', 'general')
+        self.difficulty = data.get('difficulty', 'easy')
+        self.accepted = {normalize_answer(answer) for answer in [self.answer, *data.get('aliases', [])]}
+
+    @property
+    def correct_option(self):
+        """1-based number of the correct option, or None for open questions"""
+        for number, option in enumerate(self.options, 1):
+            if normalize_answer(option) in self.accepted:
+                return number
+        return None
+
+    def matches(self, text):
+        """Whether a typed answer is correct; numeric answers must match exactly"""
+        guess = normalize_answer(text)
+        if not guess:
+            return False
+        if guess in self.accepted:
+            return True
+        if guess.isdigit():
+            return False
+        return any(
+            not answer.isdigit() and len(answer) >= 4 and fuzz.ratio(guess, answer) >= FUZZY_MATCH_THRESHOLD
+            for answer in self.accepted
+        )
+
+class QuestionBank:
+    """Lazily indexed question corpus with per-channel no-repeat sampling
+
+    The corpus is memory-mapped and scanned once into an array of line
+    offsets plus one array of line numbers per (category, difficulty,
+    multiple choice) bucket. Questions are only parsed when drawn. Each
+    channel walks its pool in a random affine permutation, so no question
+    repeats until the whole pool has been asked, using three integers of
+    state per channel and pool.
+    """
+
+    def __init__(self, path=QUESTION_BANK_PATH, max_channels=MAX_TRACKED_CHANNELS):
+        self.path = path
+        self.max_channels = max_channels
+        self._file = None
+        self._map = None
+        # Start offset of each question's line
+        self._offsets = array('Q')
+        # {(category, difficulty, has_options): array of line numbers}
+        self._buckets = {}
+        # Merged line numbers for each pool that has been asked for
+        self._pools = {}
+        # {(channel_id, pool_key): [step, start, position]}, least recently used first
+        self._orders = OrderedDict()
+        self._load_lock = asyncio.Lock()
+        self.loaded = False
+
+    async def load(self):
+        """Build the index on first use without blocking the event loop"""
+        if self.loaded:
+            return
+        async with self._load_lock:
+            if not self.loaded:
+                await asyncio.to_thread(self._build_index)
+                self.loaded = True
+
+    def _build_index(self):
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError as e:
+            logger.error(f"Question bank not available at {self.path}: {e}")
+            return
+        if os.fstat(self._file.fileno()).st_size == 0:
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offsets = array('Q')
+        buckets = {}
+        skipped = 0
+        position = 0
+        size = len(self._map)
+        while position < size:
+            end = self._map.find(b'\n', position)
+            if end == -1:
+                end = size
+            line = self._map[position:end]
+            if line.strip():
+                try:
+                    data = json.loads(line)
+                    key = (data.get('category', 'general').lower(), data.get('difficulty', 'easy').lower(), bool(data.get('options')))
+                    buckets.setdefault(key, array('I')).append(len(offsets))
+                    offsets.append(position)
+                except (ValueError, AttributeError):
+                    skipped += 1
+            position = end + 1
+
+        self._offsets = offsets
+        self._buckets = buckets
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed lines in {self.path}")
+        logger.info(f"Indexed {len(offsets)} questions in {len(buckets)} buckets from {self.path}")
+
+    def __len__(self):
+        return len(self._offsets)
+
+    @property
+    def categories(self):
+        return sorted({category for category, _, _ in self._buckets})
+
+    @property
+    def difficulties(self):
+        return sorted({difficulty for _, difficulty, _ in self._buckets})
+
+    def _read(self, line_number):
+        start = self._offsets[line_number]
+        end = self._map.find(b'\n', start)
+        return Question(json.loads(self._map[start:end if end != -1 else len(self._map)]))
+
+    def _pool(self, category, difficulty, choices):
+        key = (category, difficulty, choices)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = array('I')
+            for (bucket_category, bucket_difficulty, has_options), lines in self._buckets.items():
+                if category and bucket_category != category:
+                    continue
+                if difficulty and bucket_difficulty != difficulty:
+                    continue
+                if choices and not has_options:
+                    continue
+                pool.extend(lines)
+            self._pools[key] = pool
+        return key, pool
+
+    def _new_order(self, size):
+        """A random full-period affine permutation of range(size): [step, start, position]"""
+        step = random.randrange(1, size) if size > 1 else 1
+        while gcd(step, size) != 1:
+            step = random.randrange(1, size)
+        return [step, random.randrange(size), 0]
+
+    async def draw(self, channel_id, category=None, difficulty=None, choices=False):
+        """Next question for a channel that it has not seen this cycle, or None if the pool is empty
+
+        ``choices`` limits the draw to multiple choice questions.
+        """
+        await self.load()
+        key, pool = self._pool(category, difficulty, choices)
+        size = len(pool)
+        if not size:
+            return None
+
+        order_key = (channel_id, key)
+        order = self._orders.get(order_key)
+        if order is None or order[2] >= size:
+            order = self._new_order(size)
+            self._orders[order_key] = order
+            while len(self._orders) > self.max_channels:
+                self._orders.popitem(last=False)
+        self._orders.move_to_end(order_key)
+
+        step, start, position = order
+        order[2] += 1
+        return self._read(pool[(start + step * position) % size])
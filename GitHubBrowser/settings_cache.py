@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Column defaults mirroring the guild_settings table in main.py
+GUILD_SETTINGS_DEFAULTS = {
+    'prefix': '!',
+    'welcome_channel': None,
+    'log_channel': None,
+    'counting_channel': None,
+    'general_channel': None,
+    'suggestions_channel': None,
+    'bot_commands_channel': None,
+    'economy_channel': None,
+    'support_category': None,
+    'announcements_channel': None,
+    'autorole': None,
+    'setup_completed': False,
+    'economy_enabled': True,
+    'leveling_enabled': False,
+    'pets_enabled': False,
+    'welcome_enabled': False,
+    'automod_enabled': False,
+    'counting_enabled': False,
+    'suggestions_enabled': False,
+    'tickets_enabled': False,
+    'giveaways_enabled': False,
+    'music_enabled': False,
+    'maintenance_mode': False,
+    'maintenance_reason': None,
+    'admin_roles': None,
+    'moderator_roles': None,
+    'support_roles': None,
+    'dj_roles': None,
+    'economy_manager_roles': None,
+    'event_manager_roles': None,
+    'created_at': None
+}
+
+# Column defaults mirroring the log_settings table in cogs/logging.py
+LOG_SETTINGS_DEFAULTS = {
+    'log_channel_id': None,
+    'log_messages': True,
+    'log_commands': True,
+    'log_joins_leaves': True,
+    'log_edits_deletes': True,
+    'log_voice_activity': True,
+    'log_role_changes': True
+}
+
+class GuildSettingsCache:
+    """Process-wide in-memory cache of per-guild settings rows
+
+    Defaults to the guild_settings table; the same cache also backs
+    log_settings (see ``table`` and ``defaults``).
+    """
+
+    def __init__(self, bot, ttl=300, table='guild_settings', defaults=None):
+        self.bot = bot
+        self.ttl = ttl
+        self.table = table
+        self.defaults = defaults if defaults is not None else GUILD_SETTINGS_DEFAULTS
+        # Cached rows: {guild_id: {column: value}}
+        self._rows = {}
+        # Monotonic time each row was last loaded or written
+        self._loaded_at = {}
+        # Guilds with a background refresh already in flight
+        self._refreshing = set()
+
+    async def load(self):
+        """Load every settings row into memory"""
+        if not self.bot.db_pool:
+            return
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                rows = await conn.fetch(f"SELECT * FROM {self.table}")
+
+            now = time.monotonic()
+            for row in rows:
+                self._rows[row['guild_id']] = {**self.defaults, **dict(row)}
+                self._loaded_at[row['guild_id']] = now
+
+            logger.info(f"Loaded {len(rows)} {self.table} rows into cache")
+        except Exception as e:
+            logger.error(f"Failed to load {self.table} cache: {e}")
+
+    def get(self, guild_id):
+        """Get cached settings for a guild without touching the database
+
+        Stale or unknown entries are served as-is (or as defaults) and
+        refreshed in the background.
+        """
+        row = self._rows.get(guild_id)
+        # Never-loaded guilds have no timestamp; monotonic time can be smaller than the TTL on a fresh host
+        loaded_at = self._loaded_at.get(guild_id)
+
+        if self.bot.db_pool and (loaded_at is None or time.monotonic() - loaded_at > self.ttl):
+            self._schedule_refresh(guild_id)
+
+        return row if row is not None else self.defaults
+
+    def get_value(self, guild_id, column, default=None):
+        """Get a single cached column, falling back to default when unset"""
+        value = self.get(guild_id).get(column)
+        return default if value is None else value
+
+    async def refresh(self, guild_id):
+        """Reload a single guild's settings from the database"""
+        if not self.bot.db_pool:
+            return self.get(guild_id)
+        try:
+            async with self.bot.db_pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"SELECT * FROM {self.table} WHERE guild_id = $1",
+                    guild_id
+                )
+
+            # Cache missing rows as defaults so unknown guilds are not re-queried per message
+            self._rows[guild_id] = {**self.defaults, **(dict(row) if row else {'guild_id': guild_id})}
+            self._loaded_at[guild_id] = time.monotonic()
+        except Exception as e:
+            logger.error(f"Failed to refresh {self.table} for {guild_id}: {e}")
+            # Back off until the next TTL window instead of retrying on every read
+            self._loaded_at[guild_id] = time.monotonic()
+
+        return self.get(guild_id)
+
+    def update(self, guild_id, **values):
+        """Write-through update after a successful settings write"""
+        row = self._rows.get(guild_id)
+        if row is None:
+            row = {**self.defaults, 'guild_id': guild_id}
+            self._rows[guild_id] = row
+        row.update(values)
+        self._loaded_at[guild_id] = time.monotonic()
+
+    def invalidate(self, guild_id=None):
+        """Mark one guild (or every guild) stale so the next read refreshes it"""
+        if guild_id is None:
+            self._loaded_at.clear()
+        else:
+            self._loaded_at.pop(guild_id, None)
+
+    def discard(self, guild_id):
+        """Drop a guild from the cache entirely"""
+        self._rows.pop(guild_id, None)
+        self._loaded_at.pop(guild_id, None)
+
+    def _schedule_refresh(self, guild_id):
+        """Start a single background refresh for a guild"""
+        if guild_id in self._refreshing:
+            return
+        self._refreshing.add(guild_id)
+
+        async def runner():
+            try:
+                await self.refresh(guild_id)
+            finally:
+                self._refreshing.discard(guild_id)
+
+        asyncio.get_running_loop().create_task(runner())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the trivia question bank indexes a JSON Lines corpus,
+draws without repeats and checks typed answers
+"""
+
+import asyncio
+import difflib
+import json
+import os
+import sys
+import tempfile
+import types
+
+# The fuzzy answer path only needs fuzz.ratio; stand in for fuzzywuzzy when it isn't installed
+if 'fuzzywuzzy' not in sys.modules:
+    try:
+        import fuzzywuzzy
+    except ImportError:
+        fuzz = types.SimpleNamespace(ratio=lambda a, b: round(difflib.SequenceMatcher(None, a, b).ratio() * 100))
+        sys.modules['fuzzywuzzy'] = types.SimpleNamespace(fuzz=fuzz)
+
+from question_bank import Question, QuestionBank, normalize_answer
+
+QUESTIONS = [
+    {'category': 'Science', 'difficulty': 'easy', 'question': 'Chemical symbol for gold?', 'answer': 'Au'},
+    {'category': 'science', 'difficulty': 'easy', 'question': 'Closest planet to the sun?', 'answer': 'Mercury'},
+    {'category': 'science', 'difficulty': 'hard', 'question': 'Atomic number of carbon?', 'answer': '6'},
+    {'category': 'science', 'difficulty': 'easy', 'question': 'Largest planet?', 'answer': 'Jupiter',
+     'options': ['Mars', 'Jupiter', 'Venus', 'Earth']},
+    {'category': 'history', 'difficulty': 'easy', 'question': 'First US president?', 'answer': 'George Washington',
+     'aliases': ['Washington']},
+    {'category': 'history', 'difficulty': 'hard', 'question': 'Year the Berlin Wall fell?', 'answer': '1989',
+     'options': ['1987', '1989', '1991']},
+]
+
+def write_corpus():
+    """Temporary corpus with the questions plus blank and malformed lines"""
+    lines = [json.dumps(question) for question in QUESTIONS]
+    lines.insert(2, '{"category": "broken", "question": ')
+    lines.insert(4, '')
+    lines.insert(5, '["not", "an", "object"]')
+    handle = tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8')
+    with handle:
+        handle.write("\n".join(lines))
+    return handle.name
+
+def test_question_bank():
+    """Test indexing, no-repeat draws and pool filtering"""
+
+    async def run():
+        path = write_corpus()
+        try:
+            bank = QuestionBank(path)
+            await bank.load()
+
+            # Malformed and blank lines are skipped, categories are case-insensitive
+            assert len(bank) == len(QUESTIONS)
+            assert bank.categories == ['history', 'science']
+            assert bank.difficulties == ['easy', 'hard']
+            print("   ✓ Malformed lines skipped")
+
+            # A channel sees every question once before any repeats
+            for _ in range(3):
+                drawn = [(await bank.draw(1)).question for _ in range(len(QUESTIONS))]
+                assert sorted(drawn) == sorted(question['question'] for question in QUESTIONS)
+            other = await bank.draw(2)
+            assert other is not None
+            print("   ✓ No repeats within a cycle")
+
+            # Pools filter by category, difficulty and multiple choice
+            drawn = {(await bank.draw(1, category='science', difficulty='easy')).question for _ in range(3)}
+            assert drawn == {'Chemical symbol for gold?', 'Closest planet to the sun?', 'Largest planet?'}
+            for _ in range(4):
+                question = await bank.draw(1, choices=True)
+                assert question.options
+                assert question.options[question.correct_option - 1] == question.answer
+            assert (await bank.draw(1, category='history', difficulty='hard', choices=True)).answer == '1989'
+            print("   ✓ Category, difficulty and choices filtering")
+
+            # Empty pools and missing files give no question
+            assert await bank.draw(1, category='sports') is None
+            assert await bank.draw(1, category='history', difficulty='medium') is None
+            missing = QuestionBank(path + '.missing')
+            assert await missing.draw(1) is None
+            print("   ✓ Empty pool returns None")
+        finally:
+            os.remove(path)
+
+    print("❓ Testing Question Bank")
+    asyncio.run(run())
+    print("🚀 Question bank is fully operational!")
+
+def test_answer_matching():
+    """Test answer normalization, aliases and the fuzzy fallback"""
+    print("✏️ Testing Answer Matching")
+
+    assert normalize_answer("  The Éiffel   Tower! ") == "eiffel tower"
+    president = Question(QUESTIONS[4])
+    assert president.matches("george washington")
+    assert president.matches("Washington.")
+    assert president.matches("the George Washington")
+    assert not president.matches("")
+    assert not president.matches("Lincoln")
+    print("   ✓ Case, punctuation, articles and aliases")
+
+    accented = Question({'question': 'Capital of Colombia?', 'answer': 'Bogotá'})
+    assert accented.matches("bogota")
+    print("   ✓ Accents ignored")
+
+    carbon = Question(QUESTIONS[2])
+    assert carbon.matches("6")
+    assert not carbon.matches("7")
+    year = Question(QUESTIONS[5])
+    assert year.matches("1989")
+    assert not year.matches("1988")
+    assert year.correct_option == 2
+    print("   ✓ Numeric answers must match exactly")
+
+    planet = Question(QUESTIONS[1])
+    assert planet.matches("Mercurry")
+    assert not planet.matches("Mars")
+    gold = Question(QUESTIONS[0])
+    assert not gold.matches("Ag")
+    print("   ✓ Close misspellings accepted, short answers exact only")
+    print("🚀 Answer matching is fully operational!")
+
+if __name__ == "__main__":
+    try:
+        test_question_bank()
+        test_answer_matching()
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
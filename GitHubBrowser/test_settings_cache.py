@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the in-memory guild settings cache serves prefixes
+and feature flags without database round trips
+"""
+
+import asyncio
+from settings_cache import GuildSettingsCache
+
+class FakeConnection:
+    """Minimal asyncpg connection stand-in that counts queries"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def fetch(self, query, *args):
+        self.queries += 1
+        return list(self.rows.values())
+
+    async def fetchrow(self, query, *args):
+        self.queries += 1
+        return self.rows.get(args[0])
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class Context:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Context()
+
+class FakeBot:
+    def __init__(self, pool):
+        self.db_pool = pool
+
+def test_settings_cache():
+    """Test load, lookup, write-through and invalidation"""
+
+    async def run():
+        conn = FakeConnection({
+            1: {'guild_id': 1, 'prefix': '?', 'economy_enabled': False}
+        })
+        cache = GuildSettingsCache(FakeBot(FakePool(conn)), ttl=60)
+
+        await cache.load()
+        assert conn.queries == 1
+
+        # Cached lookups never hit the database
+        for _ in range(100):
+            assert cache.get_value(1, 'prefix', '!') == '?'
+            assert cache.get_value(1, 'economy_enabled', True) is False
+        assert conn.queries == 1
+        print("   ✓ Prefix and economy flag served from cache")
+
+        # Write-through updates are visible immediately
+        cache.update(1, prefix='$')
+        assert cache.get_value(1, 'prefix', '!') == '$'
+        print("   ✓ Write-through update visible")
+
+        # Unknown guilds get defaults and a single background refresh
+        assert cache.get_value(2, 'prefix', '!') == '!'
+        assert cache.get_value(2, 'prefix', '!') == '!'
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert conn.queries == 2
+        print("   ✓ Unknown guild refreshed once in the background")
+
+        # Invalidation keeps serving the last value while refreshing
+        conn.rows[1] = {'guild_id': 1, 'prefix': '>'}
+        cache.invalidate(1)
+        assert cache.get_value(1, 'prefix', '!') == '$'
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert cache.get_value(1, 'prefix', '!') == '>'
+        print("   ✓ Invalidation triggers refresh")
+
+    print("🗄️ Testing Guild Settings Cache")
+    asyncio.run(run())
+    print("🚀 Guild settings cache is fully operational!")
+
+if __name__ == "__main__":
+    try:
+        test_settings_cache()
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
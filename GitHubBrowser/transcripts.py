@@ -0,0 +1,296 @@
+import discord
+import gzip
+import html
+import io
+import json
+import logging
+import tempfile
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Discord accepts at most this many attachments per message
+MAX_FILES_PER_MESSAGE = 10
+
+# Rendered output spills from memory to disk past this size
+SPOOL_SIZE = 1024 * 1024
+
+HTML_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ background: #313338; color: #dbdee1; font-family: "gg sans", "Helvetica Neue", Arial, sans-serif; margin: 0; padding: 24px; }}
+header {{ border-bottom: 1px solid #4e5058; margin-bottom: 16px; padding-bottom: 12px; }}
+header h1 {{ color: #f2f3f5; font-size: 20px; margin: 0 0 8px; }}
+header div {{ color: #b5bac1; font-size: 13px; }}
+.msg {{ padding: 6px 0; border-bottom: 1px solid #3f4147; }}
+.meta {{ color: #949ba4; font-size: 12px; }}
+.author {{ color: #f2f3f5; font-weight: 600; margin-right: 8px; }}
+.content {{ white-space: pre-wrap; word-wrap: break-word; margin-top: 2px; }}
+.extra {{ color: #00a8fc; font-size: 13px; }}
+.flag {{ color: #f0b232; font-size: 11px; margin-left: 6px; }}
+.deleted .content {{ color: #949ba4; text-decoration: line-through; }}
+footer {{ color: #949ba4; font-size: 12px; margin-top: 16px; }}
+</style></head><body>
+"""
+
+def entry_from_message(message):
+    """Normalize a discord.Message into a transcript entry, or None if it is skipped"""
+    if message.author.bot and not message.embeds and not message.attachments:
+        return None
+    return {
+        'created_at': message.created_at,
+        'author': str(message.author),
+        'content': message.content,
+        'embeds': [embed.title or 'No title' for embed in message.embeds],
+        'attachments': [(attachment.filename, attachment.url) for attachment in message.attachments],
+        'edited': message.edited_at is not None,
+        'deleted': False
+    }
+
+async def history_entries(channel, after=None, before=None):
+    """Stream transcript entries from the channel history API, oldest first"""
+    async for message in channel.history(limit=None, oldest_first=True, after=after, before=before):
+        entry = entry_from_message(message)
+        if entry:
+            yield entry
+
+# Messages per channel.history request
+HISTORY_PAGE_SIZE = 100
+
+# Logged rows read per query while streaming a transcript
+LOG_PAGE_SIZE = 500
+
+# A logged row whose previous_message_id is not the row before it marks a gap
+CHAIN_SQL = """
+    SELECT COUNT(*) AS logged,
+           COUNT(*) FILTER (WHERE logged_before IS NOT NULL AND previous_message_id IS DISTINCT FROM logged_before) AS gaps,
+           MIN(message_id) AS first_id,
+           MAX(message_id) AS last_id
+    FROM (
+        SELECT message_id, previous_message_id, lag(message_id) OVER (ORDER BY message_id) AS logged_before
+        FROM message_logs WHERE channel_id = $1
+    ) AS chain
+"""
+
+LOG_PAGE_SQL = """
+    SELECT message_id, previous_message_id, username, content, attachments, edited, deleted
+    FROM message_logs
+    WHERE channel_id = $1 AND message_id > $2
+    ORDER BY message_id
+    LIMIT $3
+"""
+
+def entry_from_log(row):
+    """Normalize a message_logs row into a transcript entry"""
+    attachments = json.loads(row['attachments']) if row['attachments'] else []
+    return {
+        # Exact for every row, including ones logged when timestamp was the insert time
+        'created_at': discord.utils.snowflake_time(row['message_id']),
+        'author': row['username'],
+        'content': row['content'],
+        'embeds': [],
+        'attachments': [(attachment['filename'], attachment['url']) for attachment in attachments],
+        'edited': row['edited'],
+        'deleted': row['deleted']
+    }
+
+async def logged_entries(bot, channel):
+    """Stream transcript entries from message_logs, using the API for anything not logged
+
+    Every logged row records the message seen just before it in the
+    channel, whoever sent it. Where that is not the previous logged row,
+    something is missing from the log (bot messages, downtime, dropped
+    rows, logging switched off) and that stretch is read from the API, as
+    is everything before the first and after the last logged row. When
+    the gaps would cost more requests than reading the whole channel, the
+    channel history is used instead. Logged rows are read in pages so no
+    connection is held while the API is queried.
+    """
+    # Anything still buffered for message_logs belongs in this transcript
+    await bot.log_sink.flush()
+
+    async with bot.db_pool.acquire() as conn:
+        chain = await conn.fetchrow(CHAIN_SQL, channel.id)
+
+    if not chain['logged'] or chain['gaps'] > chain['logged'] // HISTORY_PAGE_SIZE + 1:
+        async for entry in history_entries(channel):
+            yield entry
+        return
+
+    async for entry in history_entries(channel, before=discord.Object(id=chain['first_id'])):
+        yield entry
+
+    last_id = None
+    while True:
+        async with bot.db_pool.acquire() as conn:
+            rows = await conn.fetch(LOG_PAGE_SQL, channel.id, last_id or 0, LOG_PAGE_SIZE)
+        for row in rows:
+            if last_id is not None and row['previous_message_id'] != last_id:
+                async for entry in history_entries(channel, after=discord.Object(id=last_id), before=discord.Object(id=row['message_id'])):
+                    yield entry
+            yield entry_from_log(row)
+            last_id = row['message_id']
+        if len(rows) < LOG_PAGE_SIZE:
+            break
+
+    async for entry in history_entries(channel, after=discord.Object(id=last_id)):
+        yield entry
+
+class Transcript:
+    """A ticket transcript rendered once to text, gzip and HTML
+
+    Entries are written straight to spooled temporary files as they
+    arrive, so memory stays flat however long the ticket is. The same
+    rendered files can be attached any number of times.
+    """
+
+    def __init__(self, channel_name, header):
+        self.channel_name = channel_name
+        self.stamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+        self.message_count = 0
+        self._text = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._gzip_raw = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._gzip = gzip.GzipFile(filename=f"{self.filename}.txt", mode='wb', fileobj=self._gzip_raw)
+        self._html = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._parts = {}
+
+        lines = ["# Support Ticket Transcript"]
+        lines += [f"**{key}:** {value}" for key, value in header.items()]
+        self._write_text("\n".join(lines) + "\n\n---\n\n")
+
+        self._html.write(HTML_HEAD.format(title=html.escape(f"Transcript - #{channel_name}")).encode())
+        meta = "".join(f"<div>{html.escape(key)}: {html.escape(str(value))}</div>" for key, value in header.items())
+        self._html.write(f"<header><h1>Support Ticket Transcript</h1>{meta}</header>\n".encode())
+
+    @property
+    def filename(self):
+        return f"transcript-{self.channel_name}-{self.stamp}"
+
+    def _write_text(self, text):
+        data = text.encode()
+        self._text.write(data)
+        self._gzip.write(data)
+
+    def add(self, entry):
+        """Append one entry to every output format"""
+        timestamp = entry['created_at'].strftime("%Y-%m-%d %H:%M:%S UTC")
+        content = entry['content'] or "[No text content]"
+        flags = []
+        if entry.get('edited'):
+            flags.append("edited")
+        if entry.get('deleted'):
+            flags.append("deleted")
+
+        extra = [f"[EMBED: {title}]" for title in entry['embeds']]
+        extra += [f"[ATTACHMENT: {filename}]" for filename, _ in entry['attachments']]
+        suffix = f" ({', '.join(flags)})" if flags else ""
+        self._write_text("\n".join([f"[{timestamp}] {entry['author']}{suffix}: {content}"] + extra) + "\n")
+
+        parts = [
+            f'<div class="msg{" deleted" if entry.get("deleted") else ""}">',
+            f'<span class="author">{html.escape(entry["author"])}</span>',
+            f'<span class="meta">{timestamp}</span>'
+        ]
+        parts += [f'<span class="flag">{flag}</span>' for flag in flags]
+        parts.append(f'<div class="content">{html.escape(content)}</div>')
+        parts += [f'<div class="extra">📎 Embed: {html.escape(title)}</div>' for title in entry['embeds']]
+        parts += [
+            f'<div class="extra">📎 <a href="{html.escape(url, quote=True)}">{html.escape(filename)}</a></div>'
+            for filename, url in entry['attachments']
+        ]
+        parts.append("</div>\n")
+        self._html.write("".join(parts).encode())
+        self.message_count += 1
+
+    def finish(self):
+        """Write the trailers and close the compressed stream"""
+        self._write_text(f"\n---\n**Messages:** {self.message_count}\n")
+        self._gzip.close()
+        self._html.write(f"<footer>{self.message_count} messages</footer></body></html>\n".encode())
+
+    def _size(self, fp):
+        fp.seek(0, io.SEEK_END)
+        return fp.tell()
+
+    def _split(self, fp, name, limit):
+        """Split an oversized file into numbered parts that each fit the upload limit"""
+        if name not in self._parts:
+            parts = []
+            fp.seek(0)
+            index = 1
+            while True:
+                part = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+                copied = 0
+                while copied < limit:
+                    chunk = fp.read(min(64 * 1024, limit - copied))
+                    if not chunk:
+                        break
+                    part.write(chunk)
+                    copied += len(chunk)
+                if not copied:
+                    part.close()
+                    break
+                parts.append((part, f"{name}.{index:03d}"))
+                index += 1
+            self._parts[name] = parts
+        return self._parts[name]
+
+    def files(self, limit):
+        """Choose which rendered outputs to attach under an upload limit
+
+        The plain text is preferred, falling back to gzip, and the gzip is
+        split into parts if even that is too large. HTML is attached when it
+        fits. Returns a list of (file object, filename, size).
+        """
+        chosen = []
+        text_size = self._size(self._text)
+        if text_size <= limit:
+            chosen.append((self._text, f"{self.filename}.txt", text_size))
+        else:
+            gzip_size = self._size(self._gzip_raw)
+            if gzip_size <= limit:
+                chosen.append((self._gzip_raw, f"{self.filename}.txt.gz", gzip_size))
+            else:
+                for part, name in self._split(self._gzip_raw, f"{self.filename}.txt.gz", limit):
+                    chosen.append((part, name, self._size(part)))
+
+        html_size = self._size(self._html)
+        if html_size <= limit:
+            chosen.append((self._html, f"{self.filename}.html", html_size))
+        return chosen
+
+    def attachments(self, limit):
+        """Fresh discord.File batches, one list per message, each within the upload limit"""
+        batches = []
+        batch, batch_size = [], 0
+        for fp, name, size in self.files(limit):
+            if batch and (batch_size + size > limit or len(batch) >= MAX_FILES_PER_MESSAGE):
+                batches.append(batch)
+                batch, batch_size = [], 0
+            fp.seek(0)
+            batch.append(discord.File(fp, filename=name))
+            batch_size += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def close(self):
+        """Release the rendered files"""
+        for fp in (self._text, self._gzip_raw, self._html):
+            fp.close()
+        for parts in self._parts.values():
+            for part, _ in parts:
+                part.close()
+        self._parts.clear()
+
+async def build_transcript(channel_name, header, entries):
+    """Render an async stream of entries into a Transcript"""
+    transcript = Transcript(channel_name, header)
+    try:
+        async for entry in entries:
+            transcript.add(entry)
+        transcript.finish()
+    except Exception:
+        transcript.close()
+        raise
+    return transcript